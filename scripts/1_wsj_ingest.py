@@ -2,13 +2,16 @@
 """
 Phase 1 · Step 1 · RSS Ingest — WSJ RSS Feed Ingestion Pipeline.
 
-Fetches all 6 WSJ RSS feeds, saves to Supabase with deduplication,
+Fetches all 6 WSJ RSS feeds concurrently, saves to Supabase with deduplication,
 and exports unprocessed items to JSONL for the ML pipeline.
 
 Usage:
-    # Ingest all feeds to Supabase
+    # Ingest all feeds to Supabase (conditional GET — unchanged feeds are skipped)
     python scripts/wsj_ingest.py
 
+    # Ingest, forcing a full download of every feed
+    python scripts/wsj_ingest.py --no-cache
+
     # Export unprocessed items to JSONL
     python scripts/wsj_ingest.py --export
 
@@ -16,16 +19,17 @@ Environment:
     SUPABASE_URL - Supabase project URL
     SUPABASE_SERVICE_ROLE_KEY - Service role key for DB access
 """
+import asyncio
 import hashlib
 import json
 import os
 import sys
-import time
+import tempfile
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from urllib.parse import urlparse, urlunparse
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
@@ -34,7 +38,8 @@ import httpx
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
-from utils.slug import generate_slug
+from lib.rss_stream import iter_rss_items
+from utils.slug import generate_slug, generate_unique_slug
 
 # Load environment variables from .env.local
 load_dotenv(Path(__file__).parent.parent / '.env.local')
@@ -52,8 +57,19 @@ WSJ_FEEDS = [
     {'name': 'ECONOMY', 'url': 'https://feeds.content.dowjones.io/public/rss/socialeconomyfeed'},
 ]
 
-# Rate limit: seconds between feed fetches
-FETCH_DELAY = 0.5
+# Rows per bulk lookup/upsert (keeps PostgREST `in.(...)` URLs under length limits)
+INGEST_BATCH_SIZE = 100
+
+# Export: columns read by export_to_jsonl, keyset page size, default row cap
+EXPORT_COLUMNS = (
+    'id, title, description, link, published_at, feed_name, creator, subcategory, '
+    'extracted_entities, extracted_keywords, extracted_tickers, llm_search_queries'
+)
+EXPORT_PAGE_SIZE = 500
+EXPORT_LIMIT = 500
+
+# Per-feed ETag/Last-Modified validators for conditional GETs (unchanged feeds → 304)
+FEED_CACHE_PATH = Path(__file__).parent / 'output' / 'wsj_feed_cache.json'
 
 # Merge separate BUSINESS and MARKETS feeds into a single category
 CATEGORY_MERGE = {'BUSINESS': 'BUSINESS_MARKETS', 'MARKETS': 'BUSINESS_MARKETS'}
@@ -122,11 +138,6 @@ def parse_rss_date(date_str: str) -> Optional[str]:
         return None
 
 
-def safe_text(el) -> str:
-    """Safely extract text from XML element."""
-    return (el.text or "").strip() if el is not None else ""
-
-
 # URL path → feed_name mapping (overrides RSS feed_name when URL is more specific)
 URL_CATEGORY_MAP = {
     'tech': 'TECH',
@@ -178,107 +189,178 @@ def extract_category_from_url(link: str) -> tuple[Optional[str], Optional[str]]:
         return None, None
 
 
-def parse_wsj_rss(xml_text: str, feed_name: str, feed_url: str) -> list[WsjItem]:
-    """Parse WSJ RSS XML into WsjItem objects."""
+def parse_wsj_rss(xml_text: str | bytes, feed_name: str, feed_url: str) -> list[WsjItem]:
+    """Parse WSJ RSS XML into WsjItem objects.
+
+    Streams items via iter_rss_items (SKIP_URL_PATHS items are dropped while
+    parsing). On malformed XML, items parsed before the error are kept.
+    """
+    items = []
     try:
-        root = ET.fromstring(xml_text)
+        for rss_item in iter_rss_items(xml_text, skip_url_paths=SKIP_URL_PATHS):
+            item = _build_wsj_item(rss_item, feed_name, feed_url)
+            if item is not None:
+                items.append(item)
     except ET.ParseError as e:
         print(f"  [ERROR] XML parse error: {e}")
-        return []
 
-    # Dublin Core namespace for dc:creator
-    namespaces = {'dc': 'http://purl.org/dc/elements/1.1/'}
+    return items
 
-    items = []
-    for item in root.findall('.//item'):
-        title = safe_text(item.find('title'))
-        link = safe_text(item.find('link'))
 
-        if not title or not link:
-            continue
+def _build_wsj_item(rss_item: dict[str, str], feed_name: str, feed_url: str) -> Optional[WsjItem]:
+    """Apply skip filters and build a WsjItem from one streamed RSS item."""
+    title = rss_item.get('title', '')
+    link = rss_item.get('link', '')
 
-        # Skip opinion articles (cross-posted from Opinion feed)
-        if title.startswith('Opinion |'):
-            continue
-
-        # Skip roundup/digest posts (no real article content)
-        if 'Roundup: Market Talk' in title:
-            continue
-        if title.lower().startswith('news quiz'):
-            continue
+    if not title or not link:
+        return None
 
-        # Skip low-value categories (poor crawl success rates)
-        if any(cat in link for cat in SKIP_URL_PATHS):
-            continue
+    # Skip opinion articles (cross-posted from Opinion feed)
+    if title.startswith('Opinion |'):
+        return None
 
-        # Extract category/subcategory from URL (more accurate than RSS feed_name)
-        url_category, subcategory = extract_category_from_url(link)
-        item_feed_name = url_category if url_category else feed_name
-        # Fallback: use feed_name as subcategory when URL doesn't provide one
-        if subcategory is None:
-            subcategory = item_feed_name.lower().replace('_', '-')
-
-        # Extract dc:creator (author)
-        creator_el = item.find('dc:creator', namespaces)
-        creator = safe_text(creator_el) if creator_el is not None else None
-
-        items.append(WsjItem(
-            feed_name=item_feed_name,
-            feed_url=feed_url,
-            title=title,
-            description=safe_text(item.find('description')),
-            link=link,
-            creator=creator,
-            url_hash=generate_url_hash(link),
-            published_at=parse_rss_date(safe_text(item.find('pubDate'))),
-            subcategory=subcategory,
-        ))
+    # Skip roundup/digest posts (no real article content)
+    if 'Roundup: Market Talk' in title:
+        return None
+    if title.lower().startswith('news quiz'):
+        return None
 
-    return items
+    # Extract category/subcategory from URL (more accurate than RSS feed_name)
+    url_category, subcategory = extract_category_from_url(link)
+    item_feed_name = url_category if url_category else feed_name
+    # Fallback: use feed_name as subcategory when URL doesn't provide one
+    if subcategory is None:
+        subcategory = item_feed_name.lower().replace('_', '-')
+
+    return WsjItem(
+        feed_name=item_feed_name,
+        feed_url=feed_url,
+        title=title,
+        description=rss_item.get('description', ''),
+        link=link,
+        creator=rss_item.get('creator'),
+        url_hash=generate_url_hash(link),
+        published_at=parse_rss_date(rss_item.get('pubDate', '')),
+        subcategory=subcategory,
+    )
 
 
 # ============================================================
 # Feed Fetching
 # ============================================================
 
-def fetch_wsj_feed(client: httpx.Client, feed: dict) -> tuple[list[WsjItem], Optional[str]]:
-    """Fetch a single WSJ RSS feed. Returns (items, error_message)."""
+def load_feed_cache(path: Path = FEED_CACHE_PATH) -> dict[str, dict]:
+    """Load per-feed conditional-GET validators (ETag / Last-Modified)."""
+    if not path.exists():
+        return {}
     try:
-        response = client.get(feed['url'], timeout=10.0)
+        with open(path) as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_feed_cache(cache: dict[str, dict], path: Path = FEED_CACHE_PATH) -> None:
+    """Persist feed validators atomically (tmp file + rename)."""
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+async def fetch_wsj_feed(
+    client: httpx.AsyncClient, feed: dict, feed_cache: Optional[dict[str, dict]] = None,
+) -> tuple[list[WsjItem], Optional[str], bool]:
+    """Fetch a single WSJ RSS feed with a conditional GET.
+
+    Sends If-None-Match / If-Modified-Since from feed_cache and updates it
+    in place with the new validators on a 200 response.
+
+    Returns:
+        (items, error_message, not_modified). A 304 returns ([], None, True)
+        without parsing.
+    """
+    headers = {}
+    cached = (feed_cache or {}).get(feed['url'], {})
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = await client.get(feed['url'], headers=headers, timeout=10.0)
+        if response.status_code == 304:
+            return [], None, True
         response.raise_for_status()
-        items = parse_wsj_rss(response.text, feed['name'], feed['url'])
-        return items, None
+        items = parse_wsj_rss(response.content, feed['name'], feed['url'])
+
+        if feed_cache is not None:
+            validators = {
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+            }
+            if any(validators.values()):
+                feed_cache[feed['url']] = validators
+            else:
+                feed_cache.pop(feed['url'], None)
+        return items, None, False
     except httpx.HTTPStatusError as e:
-        return [], f"HTTP {e.response.status_code}"
+        return [], f"HTTP {e.response.status_code}", False
     except httpx.RequestError as e:
-        return [], str(e)
+        return [], str(e) or type(e).__name__, False
     except Exception as e:
-        return [], str(e)
+        return [], str(e), False
 
 
-def fetch_all_wsj_feeds() -> tuple[list[WsjItem], list[str]]:
-    """Fetch all WSJ RSS feeds. Returns (all_items, errors)."""
-    all_items = []
-    errors = []
-
-    with httpx.Client(
-        headers={'User-Agent': 'FinanceBriefBot/1.0 (contact@araverus.com)'}
+async def _fetch_all_wsj_feeds_async(
+    feed_cache: Optional[dict[str, dict]],
+) -> list[tuple[list[WsjItem], Optional[str], bool]]:
+    """Fetch every feed concurrently over one shared (HTTP/2 when available) client."""
+    async with httpx.AsyncClient(
+        headers={'User-Agent': 'FinanceBriefBot/1.0 (contact@araverus.com)'},
+        http2=_http2_available(),
     ) as client:
-        for i, feed in enumerate(WSJ_FEEDS):
-            print(f"  [{i+1}/{len(WSJ_FEEDS)}] Fetching {feed['name']}...", end=' ')
+        return await asyncio.gather(
+            *(fetch_wsj_feed(client, feed, feed_cache) for feed in WSJ_FEEDS)
+        )
 
-            items, error = fetch_wsj_feed(client, feed)
 
-            if error:
-                print(f"ERROR: {error}")
-                errors.append(f"[{feed['name']}] {error}")
-            else:
-                print(f"{len(items)} items")
-                all_items.extend(items)
+def fetch_all_wsj_feeds(
+    feed_cache: Optional[dict[str, dict]] = None,
+) -> tuple[list[WsjItem], list[str]]:
+    """Fetch all WSJ RSS feeds concurrently. Returns (all_items, errors).
 
-            # Rate limit
-            if i < len(WSJ_FEEDS) - 1:
-                time.sleep(FETCH_DELAY)
+    Args:
+        feed_cache: ETag/Last-Modified validators keyed by feed URL (see
+            load_feed_cache). Mutated in place; the caller persists it once
+            the items are safely stored. None disables conditional requests.
+    """
+    all_items = []
+    errors = []
+
+    results = asyncio.run(_fetch_all_wsj_feeds_async(feed_cache))
+
+    for i, (feed, (items, error, not_modified)) in enumerate(zip(WSJ_FEEDS, results)):
+        print(f"  [{i+1}/{len(WSJ_FEEDS)}] {feed['name']}...", end=' ')
+        if error:
+            print(f"ERROR: {error}")
+            errors.append(f"[{feed['name']}] {error}")
+        elif not_modified:
+            print("not modified (304)")
+        else:
+            print(f"{len(items)} items")
+            all_items.extend(items)
 
     return all_items, errors
 
@@ -316,7 +398,6 @@ def insert_wsj_item(supabase: Client, item: WsjItem) -> bool:
         if '23505' in error_str or 'duplicate' in error_str.lower():
             # If slug collision, retry with date suffix
             if 'slug' in error_str.lower() and item.published_at:
-                from utils.slug import generate_unique_slug
                 slug = generate_unique_slug(item.title, item.published_at, set())
                 try:
                     supabase.table('wsj_items').insert(
@@ -329,6 +410,146 @@ def insert_wsj_item(supabase: Client, item: WsjItem) -> bool:
         raise
 
 
+def fetch_existing_keys(supabase: Client, items: list[WsjItem]) -> tuple[set[str], set[str]]:
+    """Look up url_hash and slug values already in wsj_items for a batch.
+
+    One query per INGEST_BATCH_SIZE items, matching either the item's
+    url_hash or one of its slug candidates (base slug and date-suffixed slug).
+
+    Returns:
+        (existing_url_hashes, taken_slugs)
+    """
+    existing_hashes: set[str] = set()
+    taken_slugs: set[str] = set()
+
+    for i in range(0, len(items), INGEST_BATCH_SIZE):
+        batch = items[i:i + INGEST_BATCH_SIZE]
+        slug_candidates = set()
+        for item in batch:
+            base = generate_slug(item.title) or 'untitled'
+            slug_candidates.add(base)
+            slug_candidates.add(generate_unique_slug(item.title, item.published_at, {base}))
+
+        hash_list = ','.join(item.url_hash for item in batch)
+        slug_list = ','.join(f'"{slug}"' for slug in sorted(slug_candidates))
+        response = supabase.table('wsj_items') \
+            .select('url_hash, slug') \
+            .or_(f'url_hash.in.({hash_list}),slug.in.({slug_list})') \
+            .execute()
+        for row in response.data or []:
+            existing_hashes.add(row['url_hash'])
+            if row.get('slug'):
+                taken_slugs.add(row['slug'])
+
+    return existing_hashes, taken_slugs
+
+
+def bulk_insert_wsj_items(
+    supabase: Client, items: list[WsjItem]
+) -> tuple[set[str], set[str], list[str]]:
+    """Insert WSJ items in chunked upserts instead of one round trip per row.
+
+    Existing url_hashes and slugs are fetched up front, slug collisions are
+    resolved in memory with generate_unique_slug, and new rows are written
+    with upsert(on_conflict='url_hash', ignore_duplicates=True). If a chunk
+    still fails (e.g. a slug inserted by a concurrent run), that chunk falls
+    back to insert_wsj_item() row by row.
+
+    Returns:
+        (inserted_url_hashes, failed_url_hashes, errors)
+    """
+    existing_hashes, taken_slugs = fetch_existing_keys(supabase, items)
+
+    rows = []
+    by_hash: dict[str, WsjItem] = {}
+    for item in items:
+        if item.url_hash in existing_hashes or item.url_hash in by_hash:
+            continue
+        slug = generate_unique_slug(item.title, item.published_at, taken_slugs)
+        taken_slugs.add(slug)
+        by_hash[item.url_hash] = item
+        rows.append(_build_insert_row(item, slug))
+
+    inserted: set[str] = set()
+    failed: set[str] = set()
+    errors: list[str] = []
+
+    for i in range(0, len(rows), INGEST_BATCH_SIZE):
+        chunk = rows[i:i + INGEST_BATCH_SIZE]
+        try:
+            response = supabase.table('wsj_items') \
+                .upsert(chunk, on_conflict='url_hash', ignore_duplicates=True) \
+                .execute()
+            inserted.update(row['url_hash'] for row in response.data or [])
+        except Exception as e:
+            print(f"  [WARN] Bulk upsert failed ({e}), retrying {len(chunk)} rows individually")
+            for row in chunk:
+                try:
+                    if insert_wsj_item(supabase, by_hash[row['url_hash']]):
+                        inserted.add(row['url_hash'])
+                except Exception as row_error:
+                    failed.add(row['url_hash'])
+                    errors.append(f"Insert error: {row_error}")
+
+    return inserted, failed, errors
+
+
+def iter_wsj_items_keyset(
+    supabase: Client,
+    unsearched_only: bool = True,
+    since: Optional[str] = None,
+    limit: Optional[int] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[dict]:
+    """Stream wsj_items newest-first with keyset pagination on (published_at, id).
+
+    Each page resumes strictly after the last (published_at, id) seen, so
+    deep pages cost the same as the first (no OFFSET scan) and only one page
+    is held in memory. Rows with NULL published_at sort last.
+
+    Args:
+        unsearched_only: Only rows with searched = false
+        since: ISO timestamp lower bound on published_at
+        limit: Max rows to yield (None = no cap)
+        page_size: Rows per PostgREST request
+    """
+    yielded = 0
+    cursor: Optional[tuple[Optional[str], str]] = None
+
+    while limit is None or yielded < limit:
+        size = page_size if limit is None else min(page_size, limit - yielded)
+        query = supabase.table('wsj_items').select(EXPORT_COLUMNS)
+        if unsearched_only:
+            query = query.eq('searched', False)
+        if since:
+            query = query.gte('published_at', since)
+        if cursor:
+            last_published, last_id = cursor
+            if last_published is None:
+                query = query.is_('published_at', 'null').lt('id', last_id)
+            else:
+                query = query.or_(
+                    f'published_at.lt."{last_published}",'
+                    f'and(published_at.eq."{last_published}",id.lt.{last_id}),'
+                    f'published_at.is.null'
+                )
+
+        response = query \
+            .order('published_at', desc=True, nullsfirst=False) \
+            .order('id', desc=True) \
+            .limit(size) \
+            .execute()
+        rows = response.data or []
+
+        for row in rows:
+            yield row
+        yielded += len(rows)
+
+        if len(rows) < size:
+            break
+        cursor = (rows[-1].get('published_at'), rows[-1]['id'])
+
+
 def get_unsearched_items(supabase: Client, limit: int = 500) -> list[dict]:
     """Get WSJ items that need Google search.
 
@@ -338,39 +559,49 @@ def get_unsearched_items(supabase: Client, limit: int = 500) -> list[dict]:
     Items with searched=true are already in wsj_crawl_results
     and only need crawling (use --from-db for that).
     """
-    response = supabase.table('wsj_items') \
-        .select('*') \
-        .eq('searched', False) \
-        .order('published_at', desc=True) \
-        .limit(limit) \
-        .execute()
-    return response.data or []
+    return list(iter_wsj_items_keyset(supabase, unsearched_only=True, limit=limit))
 
 
 # ============================================================
 # Export / Import
 # ============================================================
 
-def export_to_jsonl(items: list[dict], output_path: Path) -> None:
-    """Export items to JSONL file."""
-    with open(output_path, 'w') as f:
-        for item in items:
-            # Format for pipeline compatibility
-            export_item = {
-                'id': item['id'],
-                'title': item['title'],
-                'description': item['description'],
-                'link': item['link'],
-                'pubDate': item['published_at'],
-                'feed_name': item['feed_name'],
-                'creator': item['creator'],
-                'subcategory': item.get('subcategory'),
-                'extracted_entities': item.get('extracted_entities'),
-                'extracted_keywords': item.get('extracted_keywords'),
-                'extracted_tickers': item.get('extracted_tickers'),
-                'llm_search_queries': item.get('llm_search_queries'),
-            }
-            f.write(json.dumps(export_item, ensure_ascii=False) + '\n')
+def export_to_jsonl(items: Iterable[dict], output_path: Path) -> dict[str, int]:
+    """Stream items to a JSONL file. Returns per-feed counts.
+
+    Rows are written as they arrive, into a tmp file that replaces
+    output_path only if at least one row was exported — an empty or failed
+    export leaves the previous file untouched.
+    """
+    by_feed: dict[str, int] = {}
+    fd, tmp_path = tempfile.mkstemp(suffix='.jsonl', prefix='.export_', dir=output_path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for item in items:
+                # Format for pipeline compatibility
+                export_item = {
+                    'id': item['id'],
+                    'title': item['title'],
+                    'description': item['description'],
+                    'link': item['link'],
+                    'pubDate': item['published_at'],
+                    'feed_name': item['feed_name'],
+                    'creator': item['creator'],
+                    'subcategory': item.get('subcategory'),
+                    'extracted_entities': item.get('extracted_entities'),
+                    'extracted_keywords': item.get('extracted_keywords'),
+                    'extracted_tickers': item.get('extracted_tickers'),
+                    'llm_search_queries': item.get('llm_search_queries'),
+                }
+                f.write(json.dumps(export_item, ensure_ascii=False) + '\n')
+                by_feed[item['feed_name']] = by_feed.get(item['feed_name'], 0) + 1
+        if by_feed:
+            os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    return by_feed
 
 
 # ============================================================
@@ -402,18 +633,29 @@ def dedup_by_title(items: list[WsjItem]) -> list[WsjItem]:
     return list(seen_titles.values())
 
 
-def cmd_ingest() -> None:
-    """Ingest all WSJ feeds to Supabase."""
+def cmd_ingest(use_cache: bool = True, bulk: bool = True) -> None:
+    """Ingest all WSJ feeds to Supabase.
+
+    Args:
+        use_cache: Send conditional GETs using cached ETag/Last-Modified so
+            unchanged feeds return 304 and are skipped.
+        bulk: Write rows with chunked upserts (bulk_insert_wsj_items) instead
+            of one insert_wsj_item() round trip per item.
+    """
     print("=" * 60)
     print("WSJ RSS Feed Ingestion")
     print("=" * 60)
 
     # Fetch all feeds
     print("\n[1/4] Fetching RSS feeds...")
-    items, fetch_errors = fetch_all_wsj_feeds()
+    feed_cache = load_feed_cache() if use_cache else None
+    items, fetch_errors = fetch_all_wsj_feeds(feed_cache)
     print(f"\nTotal items fetched: {len(items)}")
 
     if not items:
+        # Nothing to store, so the validators from successful fetches are safe to keep
+        if feed_cache is not None:
+            save_feed_cache(feed_cache)
         print("No items to insert.")
         return
 
@@ -437,25 +679,41 @@ def cmd_ingest() -> None:
     print("\n[4/4] Inserting to Supabase...")
     supabase = get_supabase_client()
 
-    inserted = 0
-    skipped = 0
     errors = list(fetch_errors)
     by_feed: dict[str, dict] = {}
-
     for item in items:
-        feed = item.feed_name
-        if feed not in by_feed:
-            by_feed[feed] = {'fetched': 0, 'inserted': 0}
-        by_feed[feed]['fetched'] += 1
+        by_feed.setdefault(item.feed_name, {'fetched': 0, 'inserted': 0})['fetched'] += 1
 
+    if bulk:
         try:
-            if insert_wsj_item(supabase, item):
-                inserted += 1
-                by_feed[feed]['inserted'] += 1
-            else:
-                skipped += 1
+            inserted_hashes, failed_hashes, insert_errors = bulk_insert_wsj_items(supabase, items)
         except Exception as e:
-            errors.append(f"Insert error: {e}")
+            # Existing-key lookup failed — nothing was written
+            inserted_hashes, failed_hashes = set(), {item.url_hash for item in items}
+            insert_errors = [f"Bulk lookup error: {e}"]
+        errors.extend(insert_errors)
+        for item in items:
+            if item.url_hash in inserted_hashes:
+                by_feed[item.feed_name]['inserted'] += 1
+        inserted = len(inserted_hashes)
+        skipped = len(items) - inserted - len(failed_hashes)
+    else:
+        inserted = 0
+        skipped = 0
+        for item in items:
+            try:
+                if insert_wsj_item(supabase, item):
+                    inserted += 1
+                    by_feed[item.feed_name]['inserted'] += 1
+                else:
+                    skipped += 1
+            except Exception as e:
+                errors.append(f"Insert error: {e}")
+
+    # Only remember validators once items are stored — a failed insert must
+    # not turn the next run into a 304 that hides the same items.
+    if feed_cache is not None and len(errors) == len(fetch_errors):
+        save_feed_cache(feed_cache)
 
     # Summary
     print("\n" + "=" * 60)
@@ -476,12 +734,19 @@ def cmd_ingest() -> None:
 
 
 
-def cmd_export(output_path: Optional[Path] = None, export_all: bool = False) -> None:
+def cmd_export(
+    output_path: Optional[Path] = None,
+    export_all: bool = False,
+    limit: Optional[int] = EXPORT_LIMIT,
+) -> None:
     """Export WSJ items to JSONL for Google News search.
 
+    Streams keyset-paginated pages straight to the file (constant memory).
+
     Args:
         output_path: Custom output path (default: output/wsj_items.jsonl)
         export_all: If True, export all recent items regardless of searched status
+        limit: Max items to export (None = no cap)
     """
     print("=" * 60)
     print(f"Export WSJ Items {'(all recent)' if export_all else '(unsearched only)'}")
@@ -489,37 +754,25 @@ def cmd_export(output_path: Optional[Path] = None, export_all: bool = False) ->
 
     supabase = get_supabase_client()
 
+    # Default output path
+    if output_path is None:
+        output_path = Path(__file__).parent / 'output' / 'wsj_items.jsonl'
+    output_path.parent.mkdir(exist_ok=True)
+
     if export_all:
         # Export all items from last 2 days, ignoring searched flag
         cutoff = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
-        response = supabase.table('wsj_items') \
-            .select('*') \
-            .gte('published_at', cutoff) \
-            .order('published_at', desc=True) \
-            .limit(500) \
-            .execute()
-        items = response.data or []
+        rows = iter_wsj_items_keyset(supabase, unsearched_only=False, since=cutoff, limit=limit)
     else:
-        items = get_unsearched_items(supabase)
+        rows = iter_wsj_items_keyset(supabase, unsearched_only=True, limit=limit)
 
-    if not items:
+    by_feed = export_to_jsonl(rows, output_path)
+
+    if not by_feed:
         print("No items to export.")
         return
 
-    # Default output path
-    if output_path is None:
-        output_path = Path(__file__).parent / 'output' / 'wsj_items.jsonl'
-
-    output_path.parent.mkdir(exist_ok=True)
-    export_to_jsonl(items, output_path)
-
-    print(f"Exported {len(items)} items to: {output_path}")
-
-    # Show feed breakdown
-    by_feed = {}
-    for item in items:
-        feed = item['feed_name']
-        by_feed[feed] = by_feed.get(feed, 0) + 1
+    print(f"Exported {sum(by_feed.values())} items to: {output_path}")
 
     print("\nBy feed:")
     for feed, count in sorted(by_feed.items()):
@@ -530,15 +783,22 @@ def cmd_export(output_path: Optional[Path] = None, export_all: bool = False) ->
 # CLI Entry Point
 # ============================================================
 
+def print_usage() -> None:
+    print(__doc__)
+    print("\nCommands:")
+    print("  (default)                Ingest all WSJ feeds to Supabase")
+    print("  --no-cache               Ingest without conditional GET (ignore ETag cache)")
+    print("  --per-row                Ingest with one insert per item (legacy, slower)")
+    print("  --export [PATH]          Export unsearched items to JSONL")
+    print("  --export --all [PATH]    Export all recent items (bypass searched flag)")
+    print(f"  --export --limit N       Cap exported items (default {EXPORT_LIMIT}, 0 = no cap)")
+
+
 def main():
     args = sys.argv[1:]
 
     if args and args[0] == '--help':
-        print(__doc__)
-        print("\nCommands:")
-        print("  (default)                Ingest all WSJ feeds to Supabase")
-        print("  --export [PATH]          Export unsearched items to JSONL")
-        print("  --export --all [PATH]    Export all recent items (bypass searched flag)")
+        print_usage()
         return
 
     if not args:
@@ -548,10 +808,20 @@ def main():
     if args[0] == '--export':
         export_all = '--all' in args
         remaining = [a for a in args[1:] if a != '--all']
+        limit: Optional[int] = EXPORT_LIMIT
+        if '--limit' in remaining:
+            idx = remaining.index('--limit')
+            value = remaining[idx + 1] if idx + 1 < len(remaining) else ''
+            if not value.isdigit():
+                print(f"Error: --limit needs a non-negative integer (got {value or 'nothing'})\n")
+                print_usage()
+                sys.exit(1)
+            limit = int(value) or None
+            del remaining[idx:idx + 2]
         output_path = Path(remaining[0]) if remaining else None
-        cmd_export(output_path, export_all=export_all)
+        cmd_export(output_path, export_all=export_all, limit=limit)
     else:
-        cmd_ingest()
+        cmd_ingest(use_cache='--no-cache' not in args, bulk='--per-row' not in args)
 
 
 if __name__ == "__main__":
@@ -10,10 +10,14 @@ Usage:
     python scripts/wsj_preprocess.py --limit 10   # N items only
     python scripts/wsj_preprocess.py --dry-run    # no DB writes
     python scripts/wsj_preprocess.py --backfill   # include searched items
+    python scripts/wsj_preprocess.py --batch-size 1   # one request per item
+    python scripts/wsj_preprocess.py --backfill --limit 5000 --workers 8 --rpm 600
 """
 import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -30,6 +34,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 from domain_utils import require_supabase_client
 from lib.cost_utils import print_cost_line
 from lib.llm_analysis import get_gemini_client
+from lib.llm_cache import generate_content_cached, print_llm_cache_stats
+from lib.rate_limit import TokenBucket
 
 # ============================================================
 # Types
@@ -67,6 +73,85 @@ Rules for search_queries:
 - Do NOT add date filters"""
 
 
+BATCH_PROMPT_TEMPLATE = """For EACH WSJ item below, extract metadata for finding free coverage of the same news.
+
+Items (JSON):
+{items_json}
+
+Return ONLY a valid JSON array with exactly one object per item, in any order:
+[
+  {{
+    "index": <the item's index>,
+    "entities": ["company/person/org names, max 5"],
+    "keywords": ["3-5 search terms capturing the specific event"],
+    "tickers": ["stock symbols if identifiable"],
+    "search_queries": ["2-3 optimized Google News search queries, 5-10 words each"]
+  }}
+]
+
+Rules for search_queries:
+- Find free articles covering the same news event
+- Use entity names + key event terms
+- Vary phrasing across queries for coverage
+- Do NOT include source names (WSJ, Bloomberg, etc.)
+- Do NOT add date filters"""
+
+# Items per batched Gemini request (1 = one request per item)
+DEFAULT_BATCH_SIZE = 10
+
+# Concurrent Gemini requests and requests-per-minute budget
+DEFAULT_WORKERS = 4
+DEFAULT_RPM = 120
+
+# Results buffered before a bulk DB write
+FLUSH_SIZE = 100
+
+# Output budget per item in a batched request (single-item calls use 512)
+BATCH_OUTPUT_TOKENS_PER_ITEM = 400
+
+# Wait before retrying a batched request that raised (429, timeout, ...)
+BATCH_RETRY_BACKOFF = 10.0
+
+
+# Gemini request limiter (set by main from --rpm; None = unlimited)
+_rate_limiter: Optional[TokenBucket] = None
+
+
+def _generate(client, prompt: str, max_output_tokens: int):
+    """Call Gemini Flash-Lite in JSON mode, waiting on the shared rate limiter
+    (cache hits don't wait)."""
+    from google.genai import types
+    return generate_content_cached(
+        client,
+        model="gemini-2.5-flash-lite",
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            temperature=0.1,
+            max_output_tokens=max_output_tokens,
+        ),
+        before_call=_rate_limiter.acquire if _rate_limiter is not None else None,
+    )
+
+
+def _result_from_dict(data: dict) -> PreprocessResult:
+    """Build a PreprocessResult from one parsed JSON object (capped list sizes)."""
+    return PreprocessResult(
+        entities=data.get("entities", [])[:5],
+        keywords=data.get("keywords", [])[:5],
+        tickers=data.get("tickers", [])[:5],
+        search_queries=data.get("search_queries", [])[:3],
+    )
+
+
+def _usage_tokens(response) -> tuple[int, int]:
+    """Return (input_tokens, output_tokens) from a Gemini response."""
+    usage = response.usage_metadata
+    in_tok = usage.prompt_token_count or 0 if usage else 0
+    out_tok = usage.candidates_token_count or 0 if usage else 0
+    return in_tok, out_tok
+
+
 def preprocess_item(
     title: str, description: str
 ) -> tuple[Optional[PreprocessResult], int, int]:
@@ -83,30 +168,13 @@ def preprocess_item(
     prompt = PROMPT_TEMPLATE.format(title=title, description=description or "")
 
     try:
-        from google.genai import types
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.1,
-                max_output_tokens=512,
-            ),
-        )
+        response = _generate(client, prompt, max_output_tokens=512)
 
         raw = response.text.strip()
         data = json.loads(raw)
+        in_tok, out_tok = _usage_tokens(response)
 
-        usage = response.usage_metadata
-        in_tok = usage.prompt_token_count or 0 if usage else 0
-        out_tok = usage.candidates_token_count or 0 if usage else 0
-
-        return PreprocessResult(
-            entities=data.get("entities", [])[:5],
-            keywords=data.get("keywords", [])[:5],
-            tickers=data.get("tickers", [])[:5],
-            search_queries=data.get("search_queries", [])[:3],
-        ), in_tok, out_tok
+        return _result_from_dict(data), in_tok, out_tok
     except json.JSONDecodeError as e:
         print(f"  [WARN] JSON parse error: {e}")
         return None, 0, 0
@@ -115,6 +183,105 @@ def preprocess_item(
         return None, 0, 0
 
 
+def _parse_batch_response(raw: str, count: int) -> dict[int, PreprocessResult]:
+    """Map a batched JSON-array response back to item indexes.
+
+    Entries with a missing/out-of-range index or malformed fields are dropped
+    so the caller can retry those items individually.
+    """
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        # Some responses wrap the array: {"items": [...]}
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+
+    results: dict[int, PreprocessResult] = {}
+    for entry in data if isinstance(data, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get("index"))
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= idx < count or idx in results:
+            continue
+        if not all(isinstance(entry.get(k, []), list) for k in ("entities", "keywords", "tickers", "search_queries")):
+            continue
+        if not entry.get("search_queries"):
+            continue
+        results[idx] = _result_from_dict(entry)
+    return results
+
+
+def preprocess_batch(
+    items: list[dict],
+) -> tuple[list[Optional[PreprocessResult]], int, int, int]:
+    """Preprocess several WSJ items with one Gemini request.
+
+    Packs titles + descriptions into a JSON-array prompt, maps results back by
+    index, and retries any item whose part of the response is missing or
+    unparseable with preprocess_item(). A request that raises (429, timeout)
+    is retried once after BATCH_RETRY_BACKOFF; if that fails too the whole
+    batch is returned as failed rather than fanned out into single calls.
+
+    Args:
+        items: Dicts with 'title' and optional 'description'
+
+    Returns:
+        (results aligned with items, input_tokens, output_tokens, api_calls)
+    """
+    if len(items) == 1:
+        result, in_tok, out_tok = preprocess_item(items[0]['title'], items[0].get('description') or '')
+        return [result], in_tok, out_tok, 1
+
+    client = get_gemini_client()
+    if client is None:
+        print("  [ERROR] No Gemini API key configured")
+        return [None] * len(items), 0, 0, 0
+
+    payload = [
+        {"index": i, "title": item['title'], "description": item.get('description') or ''}
+        for i, item in enumerate(items)
+    ]
+    prompt = BATCH_PROMPT_TEMPLATE.format(items_json=json.dumps(payload, ensure_ascii=False, indent=1))
+
+    calls = 0
+    response = None
+    while response is None:
+        calls += 1
+        try:
+            response = _generate(client, prompt, max_output_tokens=BATCH_OUTPUT_TOKENS_PER_ITEM * len(items))
+        except Exception as e:
+            if calls > 1:
+                print(f"  [WARN] Gemini API error (batch of {len(items)}): {e}, giving up on batch")
+                return [None] * len(items), 0, 0, calls
+            print(f"  [WARN] Gemini API error (batch of {len(items)}): {e}, "
+                  f"retrying in {BATCH_RETRY_BACKOFF:.0f}s")
+            time.sleep(BATCH_RETRY_BACKOFF)
+
+    total_in, total_out = _usage_tokens(response)
+    parsed: dict[int, PreprocessResult] = {}
+    try:
+        parsed = _parse_batch_response(response.text.strip(), len(items))
+    except json.JSONDecodeError as e:
+        print(f"  [WARN] Batch JSON parse error: {e}")
+
+    results: list[Optional[PreprocessResult]] = []
+    missing = len(items) - len(parsed)
+    if missing:
+        print(f"  [WARN] {missing}/{len(items)} items missing from batch response, retrying individually")
+    for i, item in enumerate(items):
+        if i in parsed:
+            results.append(parsed[i])
+            continue
+        result, in_tok, out_tok = preprocess_item(item['title'], item.get('description') or '')
+        total_in += in_tok
+        total_out += out_tok
+        calls += 1
+        results.append(result)
+
+    return results, total_in, total_out, calls
+
+
 # ============================================================
 # Database Operations
 # ============================================================
@@ -122,18 +289,29 @@ def preprocess_item(
 def get_items_to_preprocess(
     supabase: Client, backfill: bool = False, limit: int = 200
 ) -> list[dict]:
-    """Get WSJ items needing preprocessing."""
-    query = supabase.table('wsj_items') \
-        .select('id, title, description') \
-        .is_('preprocessed_at', 'null') \
-        .order('published_at', desc=True) \
-        .limit(limit)
+    """Get WSJ items needing preprocessing (paged past the 1000-row API cap)."""
+    items: list[dict] = []
+    page_size = 1000
+
+    while len(items) < limit:
+        start = len(items)
+        end = min(limit, start + page_size) - 1
+        query = supabase.table('wsj_items') \
+            .select('id, title, description') \
+            .is_('preprocessed_at', 'null') \
+            .order('published_at', desc=True) \
+            .order('id') \
+            .range(start, end)
+
+        if not backfill:
+            query = query.eq('searched', False)
 
-    if not backfill:
-        query = query.eq('searched', False)
+        batch = query.execute().data or []
+        items.extend(batch)
+        if len(batch) < end - start + 1:
+            break
 
-    response = query.execute()
-    return response.data or []
+    return items
 
 
 def save_preprocess_result(
@@ -149,6 +327,49 @@ def save_preprocess_result(
     }).eq('id', item_id).execute()
 
 
+def _preprocess_row(item_id: str, result: PreprocessResult, preprocessed_at: str) -> dict:
+    """Row payload for bulk_save_preprocess (migration 015)."""
+    return {
+        'id': item_id,
+        'extracted_entities': result.entities,
+        'extracted_keywords': result.keywords,
+        'extracted_tickers': result.tickers,
+        'llm_search_queries': result.search_queries,
+        'preprocessed_at': preprocessed_at,
+    }
+
+
+def save_preprocess_results(
+    supabase: Client, results: list[tuple[str, PreprocessResult]]
+) -> int:
+    """Bulk-save (item_id, result) pairs. Returns rows written.
+
+    Uses the bulk_save_preprocess RPC (one round trip per FLUSH_SIZE rows);
+    falls back to per-row save_preprocess_result() if the RPC is unavailable.
+    """
+    if not results:
+        return 0
+
+    now = datetime.now(timezone.utc).isoformat()
+    written = 0
+    for i in range(0, len(results), FLUSH_SIZE):
+        chunk = results[i:i + FLUSH_SIZE]
+        try:
+            response = supabase.rpc('bulk_save_preprocess', {
+                'items': [_preprocess_row(item_id, result, now) for item_id, result in chunk],
+            }).execute()
+            written += response.data if isinstance(response.data, int) else len(chunk)
+        except Exception as e:
+            print(f"  [WARN] bulk_save_preprocess failed ({e}), saving {len(chunk)} rows individually")
+            for item_id, result in chunk:
+                try:
+                    save_preprocess_result(supabase, item_id, result)
+                    written += 1
+                except Exception as row_error:
+                    print(f"  [WARN] Save failed for {item_id}: {row_error}")
+    return written
+
+
 # ============================================================
 # Main
 # ============================================================
@@ -158,6 +379,12 @@ def main():
     parser.add_argument('--limit', type=int, default=200, help='Max items to process')
     parser.add_argument('--dry-run', action='store_true', help='Print results without DB writes')
     parser.add_argument('--backfill', action='store_true', help='Include already-searched items')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Items per Gemini request (1 = one request per item)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Concurrent Gemini requests (1 = serial)')
+    parser.add_argument('--rpm', type=int, default=DEFAULT_RPM,
+                        help='Max Gemini requests per minute (0 = unlimited)')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -175,32 +402,55 @@ def main():
     if args.dry_run:
         print("(dry-run mode — no DB writes)\n")
 
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate=args.rpm, per=60.0) if args.rpm > 0 else None
+
     success = 0
     failed = 0
+    saved = 0
+    api_calls = 0
     total_input_tokens = 0
     total_output_tokens = 0
-
-    for i, item in enumerate(items):
-        title = item['title']
-        desc = item.get('description') or ''
-        print(f"\n[{i+1}/{len(items)}] {title[:80]}")
-
-        result, in_tok, out_tok = preprocess_item(title, desc)
-        total_input_tokens += in_tok
-        total_output_tokens += out_tok
-
-        if result is None:
-            failed += 1
-            continue
-
-        success += 1
-        print(f"  entities: {result.entities}")
-        print(f"  keywords: {result.keywords}")
-        print(f"  tickers: {result.tickers}")
-        print(f"  queries: {result.search_queries}")
-
-        if not args.dry_run:
-            save_preprocess_result(supabase, item['id'], result)
+    batch_size = max(1, args.batch_size)
+    workers = max(1, args.workers)
+    pending: list[tuple[str, PreprocessResult]] = []
+
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    print(f"Batches: {len(batches)} × {batch_size} | workers={workers} | rpm={args.rpm or 'unlimited'}")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(preprocess_batch, batch): batch for batch in batches}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            batch = futures[future]
+            results, in_tok, out_tok, calls = future.result()
+            total_input_tokens += in_tok
+            total_output_tokens += out_tok
+            api_calls += calls
+
+            print(f"\n[batch {done}/{len(batches)}] {len(batch)} items")
+            for item, result in zip(batch, results):
+                print(f"  - {item['title'][:80]}")
+
+                if result is None:
+                    print("    [FAILED]")
+                    failed += 1
+                    continue
+
+                success += 1
+                print(f"    entities: {result.entities}")
+                print(f"    keywords: {result.keywords}")
+                print(f"    tickers: {result.tickers}")
+                print(f"    queries: {result.search_queries}")
+                pending.append((item['id'], result))
+
+            if not args.dry_run and len(pending) >= FLUSH_SIZE:
+                saved += save_preprocess_results(supabase, pending)
+                pending = []
+
+    if not args.dry_run:
+        saved += save_preprocess_results(supabase, pending)
+        print(f"\nSaved {saved} results to wsj_items")
 
     print("\n" + "=" * 60)
     print(f"Done: {success} succeeded, {failed} failed out of {len(items)}")
@@ -215,9 +465,10 @@ def main():
             total_input_tokens,
             total_output_tokens,
             model,
-            calls=success,
+            calls=api_calls,
         )
         print(f"Estimated total: ${cost:.4f}")
+    print_llm_cache_stats()
 
 
 if __name__ == '__main__':
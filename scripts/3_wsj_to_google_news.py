@@ -11,12 +11,22 @@ Usage:
 
 Options:
     --limit N         Process only N items (default: all)
-    --delay-item S    Delay between items in seconds (default: 2.0)
-    --delay-query S   Delay between queries in seconds (default: 1.0)
+    --concurrency N   WSJ items searched concurrently (default: 8)
+    --max-rps R       Global news.google.com request rate (default: 4/s)
+    --min-candidates N  Skip remaining queries once N candidates are found (default: 0 = run all)
+    --min-title-sim S   Count only candidates whose title overlaps the WSJ headline >= S (0-1)
+    --cache-ttl H     Query result cache lifetime in hours (default: 12, 0 = off)
+    --no-cache        Bypass the query result cache for this run
     --input PATH      Specify custom JSONL input file
+    --stream          Rank (4_) and resolve (5_) each item as soon as it is searched;
+                      also writes wsj_ranked_results.jsonl (--update-db saves resolves)
 """
+import argparse
+import asyncio
 import hashlib
+import importlib.util
 import json
+import random
 import re
 import sys
 import time
@@ -25,6 +35,7 @@ from datetime import timedelta
 from email.utils import parsedate_to_datetime
 from functools import lru_cache
 from pathlib import Path
+from typing import Awaitable, Callable
 from urllib.parse import quote_plus, urlparse
 
 import httpx
@@ -35,11 +46,29 @@ load_dotenv(Path(__file__).parent.parent / '.env.local')
 
 # Import shared domain utilities
 sys.path.insert(0, str(Path(__file__).parent))
+from domain_utils import BlockedDomainIndex
 from domain_utils import load_blocked_domains as _load_blocked_domains_from_db
+from lib.llm_cache import SQLiteBackend
+from lib.google_news_resolver import BatchExecuteBatcher, resolve_google_news_url_async
+from lib.rate_limit import AsyncTokenBucket, HostLimiter
+from lib.rss_stream import iter_rss_items
 
 # Google News RSS search URL
 GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
 
+# Concurrent item searches and global news.google.com request rate
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RPS = 4.0
+
+# Stream mode: max items waiting between search → rank → resolve stages
+DEFAULT_STREAM_QUEUE_SIZE = 4
+
+# HTTP 429/503 handling: jittered exponential backoff
+RETRY_STATUS = {429, 503}
+MAX_RETRIES = 4
+BACKOFF_BASE = 2.0   # seconds
+BACKOFF_MAX = 60.0   # seconds
+
 # Source name to domain mapping (for blocklist matching)
 SOURCE_NAME_TO_DOMAIN = {
     'the wall street journal': 'wsj.com',
@@ -55,6 +84,14 @@ SOURCE_NAME_TO_DOMAIN = {
     'nytimes': 'nytimes.com',
 }
 
+# Adaptive query mode: stop issuing an item's remaining queries once this many
+# unique, unblocked candidates are collected (0 = always run every query).
+# Off by default: early exit trades candidate recall for fewer requests, so it
+# is opt-in per run (e.g. --min-candidates 15) until recall has been measured.
+DEFAULT_MIN_CANDIDATES = 0
+# Title-word tokens shorter than this are ignored by title_similarity()
+MIN_TITLE_TOKEN_LEN = 3
+
 # Google News limits ~32 search operators per query.
 # Reserve 4 for date/other operators, use up to 28 for -site: exclusions.
 MAX_SITE_EXCLUSIONS = 28
@@ -64,6 +101,13 @@ MAX_SITE_EXCLUSIONS = 28
 # Saved to DB at end of run for -site: prioritization.
 _search_hit_counter: dict[str, int] = {}
 
+# On-disk query result cache (keyed on final Google News URL). Set by main();
+# None = disabled. Shares the SQLite TTL/LRU store used for LLM responses.
+SEARCH_CACHE_PATH = Path(__file__).parent / 'output' / 'google_news_cache.sqlite3'
+DEFAULT_SEARCH_CACHE_TTL_HOURS = 12.0
+SEARCH_CACHE_MAX_MB = 100
+_search_cache: SQLiteBackend | None = None
+
 
 def is_non_english_source(source_name: str) -> bool:
     """Check if source name contains non-Latin characters (likely non-English)."""
@@ -80,11 +124,6 @@ def is_non_english_source(source_name: str) -> bool:
     return False
 
 
-def safe_text(el) -> str:
-    """Safely extract text from XML element."""
-    return (el.text or "").strip() if el is not None else ""
-
-
 def normalize_domain(url: str) -> str:
     """Extract domain from URL, removing www. prefix."""
     try:
@@ -101,31 +140,19 @@ def dedupe_key(article: dict) -> str:
 
 
 @lru_cache(maxsize=1)
-def load_blocked_domains() -> frozenset[str]:
-    """Load blocked domains from DB (cached)."""
-    blocked = _load_blocked_domains_from_db()
+def load_blocked_domains() -> BlockedDomainIndex:
+    """Load blocked domains from DB into a suffix index (cached)."""
+    blocked = BlockedDomainIndex(_load_blocked_domains_from_db())
     print(f"  Loaded {len(blocked)} blocked domains from DB")
-    return frozenset(blocked)
+    return blocked
 
 
-def _is_domain_blocked(domain: str, blocked_domains: frozenset[str]) -> bool:
+def _is_domain_blocked(domain: str, blocked_domains: BlockedDomainIndex) -> bool:
     """Check if domain or any parent domain is in the blocked set.
 
     Handles subdomains: 'ca.finance.yahoo.com' matches 'yahoo.com'.
     """
-    if not domain:
-        return False
-    domain_lower = domain.lower()
-    # Exact match
-    if domain_lower in blocked_domains:
-        return True
-    # Subdomain match: walk up the domain hierarchy
-    parts = domain_lower.split('.')
-    for i in range(1, len(parts) - 1):
-        parent = '.'.join(parts[i:])
-        if parent in blocked_domains:
-            return True
-    return False
+    return blocked_domains.contains_domain(domain)
 
 
 def is_source_blocked(source_name: str, source_domain: str) -> bool:
@@ -194,6 +221,20 @@ def build_queries(
     return queries[:4]
 
 
+def _title_tokens(title: str) -> frozenset[str]:
+    # Google News titles end in " - Publisher"; drop it so it doesn't count as overlap
+    title = title.rsplit(' - ', 1)[0] if ' - ' in title else title
+    return frozenset(w for w in re.findall(r'[a-z0-9]+', title.lower()) if len(w) >= MIN_TITLE_TOKEN_LEN)
+
+
+def title_similarity(a: str, b: str) -> float:
+    """Cheap word-overlap score in [0, 1]: shared tokens / tokens in the shorter title."""
+    ta, tb = _title_tokens(a), _title_tokens(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / min(len(ta), len(tb))
+
+
 def parse_rss_date(date_str: str):
     """Parse RSS date format (RFC 2822 or ISO). Returns datetime or None."""
     if not date_str:
@@ -253,40 +294,75 @@ def load_wsj_jsonl(jsonl_path: str) -> list[dict]:
     return list(items_by_title.values())
 
 
-def search_google_news(query: str, client: httpx.Client) -> list[dict]:
-    """Search Google News RSS, extracting source URL for domain matching."""
+async def search_google_news(
+    query: str,
+    client: httpx.AsyncClient,
+    limiter: AsyncTokenBucket,
+    log: list[str] | None = None,
+) -> tuple[list[dict], bool]:
+    """Search Google News RSS, extracting source URL for domain matching.
+
+    Results are served from the on-disk query cache (keyed on the final
+    request URL) when a fresh entry exists; only successful searches are
+    cached. Every network request (including retries) waits on the shared
+    news.google.com limiter. HTTP 429/503 responses back off with jitter
+    (honoring Retry-After) and pause the limiter for all concurrent searches.
+
+    Returns:
+        (articles, cache_hit)
+    """
     url = GOOGLE_NEWS_RSS.format(query=quote_plus(query))
+    log = log if log is not None else []
+
+    if _search_cache is not None:
+        entry = _search_cache.get(url)
+        if entry is not None:
+            return entry['articles'], True
 
     try:
-        response = client.get(url, timeout=10.0)
-        response.raise_for_status()
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire()
+            response = await client.get(url, timeout=10.0)
+            if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                break
+            delay = _backoff_delay(attempt, response.headers.get('retry-after'))
+            limiter.pause(delay)
+            log.append(f"    HTTP {response.status_code} — backing off {delay:.1f}s (retry {attempt + 1}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
 
-        root = ET.fromstring(response.text)
+        response.raise_for_status()
 
         articles = []
-        for item in root.findall('.//item'):
-            source_el = item.find('source')
-            source_name = safe_text(source_el)
-            source_url = source_el.attrib.get("url", "") if source_el is not None else ""
-            source_domain = normalize_domain(source_url)
-
+        for item in iter_rss_items(response.content):
+            source_url = item.get('source_url', '')
             articles.append({
-                'title': safe_text(item.find('title')),
-                'link': safe_text(item.find('link')),
-                'source': source_name,
+                'title': item.get('title', ''),
+                'link': item.get('link', ''),
+                'source': item.get('source', ''),
                 'source_url': source_url,
-                'source_domain': source_domain,
-                'pubDate': safe_text(item.find('pubDate')),
+                'source_domain': normalize_domain(source_url),
+                'pubDate': item.get('pubDate', ''),
             })
 
-        return articles
+        if _search_cache is not None:
+            _search_cache.put(url, {'articles': articles})
+        return articles, False
 
     except ET.ParseError as e:
-        print(f"    XML Parse Error for query '{query[:50]}': {e}")
-        return []
+        log.append(f"    XML Parse Error for query '{query[:50]}': {e}")
+        return [], False
     except Exception as e:
-        print(f"    Error: {e}")
-        return []
+        log.append(f"    Error: {e}")
+        return [], False
+
+
+def _backoff_delay(attempt: int, retry_after: str | None) -> float:
+    """Exponential backoff with ±50% jitter; Retry-After (seconds) wins if larger."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.5)
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
 
 
 def add_date_filter(query: str, after_date=None) -> str:
@@ -332,38 +408,19 @@ def _dedupe_subdomains(domains: set[str]) -> set[str]:
 def save_search_hit_counts() -> int:
     """Flush accumulated search_hit_counter to wsj_domain_status.search_hit_count.
 
-    Increments the DB value by the session count (additive across runs).
-    Returns number of domains updated, or -1 on error.
+    Increments the DB value by the session count (additive across runs) in a
+    single atomic RPC call. Returns number of domains updated, or -1 on error.
     """
     if not _search_hit_counter:
         return 0
 
-    from domain_utils import get_supabase_client
+    from domain_utils import get_supabase_client, increment_search_hit_counts
     sb = get_supabase_client()
     if not sb:
         print("  Warning: No Supabase client — search_hit_counts not saved")
         return -1
 
-    updated = 0
-    for domain, count in _search_hit_counter.items():
-        try:
-            # Upsert: if domain exists, increment; if not, only update existing rows
-            row = sb.table('wsj_domain_status') \
-                .select('search_hit_count') \
-                .eq('domain', domain) \
-                .limit(1) \
-                .execute()
-            if row.data:
-                current = row.data[0].get('search_hit_count', 0) or 0
-                sb.table('wsj_domain_status') \
-                    .update({'search_hit_count': current + count}) \
-                    .eq('domain', domain) \
-                    .execute()
-                updated += 1
-        except Exception as e:
-            print(f"  Warning: Could not update search_hit_count for {domain}: {e}")
-
-    return updated
+    return increment_search_hit_counts(sb, _search_hit_counter)
 
 
 @lru_cache(maxsize=1)
@@ -416,28 +473,46 @@ def format_query_with_exclusions(query: str) -> str:
     return f"{query} {exclusions}"
 
 
-def search_multi_query(
+async def search_multi_query(
     queries: list[str],
-    client: httpx.Client,
+    client: httpx.AsyncClient,
+    limiter: AsyncTokenBucket,
     after_date=None,
-    delay_query: float = 1.0,
+    log: list[str] | None = None,
+    min_candidates: int = 0,
+    headline: str | None = None,
+    min_title_sim: float = 0.0,
 ) -> tuple[list[dict], dict]:
     """
     Search with multiple queries, union results, dedupe, and filter.
 
+    Queries for one item run in order (dedup is order-dependent); pacing
+    comes from the shared limiter rather than a fixed sleep. In adaptive
+    mode (min_candidates > 0) the remaining queries are skipped once enough
+    candidates are collected, so later queries only run when earlier ones
+    come back thin.
+
     Args:
         queries: List of search queries to try
         client: HTTP client for requests
+        limiter: Global news.google.com rate limiter
         after_date: WSJ publish date for date filtering
-        delay_query: Delay between queries in seconds
+        log: Lines appended here instead of printed (items finish out of order)
+        min_candidates: Stop after this many unique, unblocked candidates (0 = run all)
+        headline: WSJ title for the optional similarity check
+        min_title_sim: Only candidates with title_similarity >= this count
+            toward min_candidates (0 = count every candidate)
 
     Returns:
         tuple of (articles, instrumentation_dict)
     """
+    log = log if log is not None else []
     all_articles = []
     seen_keys = set()
+    relevant_count = 0
     instrumentation = {
         'queries_executed': [],
+        'queries_skipped': 0,
     }
 
     # Helper to add article with deduplication and date filtering
@@ -457,44 +532,253 @@ def search_multi_query(
         all_articles.append(article)
         return True
 
+    def is_relevant(article: dict) -> bool:
+        if not headline or min_title_sim <= 0:
+            return True
+        return title_similarity(headline, article.get('title', '')) >= min_title_sim
+
     for i, query in enumerate(queries):
+        if min_candidates and relevant_count >= min_candidates:
+            instrumentation['queries_skipped'] = len(queries) - i
+            log.append(f"      Skipped {len(queries) - i} queries ({relevant_count} candidates)")
+            break
+
         # Add exclusions
         query_with_excl = format_query_with_exclusions(query)
 
         filtered_query = add_date_filter(query_with_excl, after_date)
 
         t0 = time.perf_counter()
-        articles = search_google_news(filtered_query, client)
+        articles, cache_hit = await search_google_news(filtered_query, client, limiter, log)
         elapsed = time.perf_counter() - t0
 
-        added_count = sum(1 for a in articles if add_article(a))
+        added = [a for a in articles if add_article(a)]
+        added_count = len(added)
+        relevant_count += sum(1 for a in added if is_relevant(a))
 
         instrumentation['queries_executed'].append({
             'query': filtered_query,
             'results': len(articles),
             'added': added_count,
             'time': round(elapsed, 2),
+            'cache_hit': cache_hit,
         })
-        print(f"      Q{i+1}: +{added_count} new articles ({len(articles)} total)")
-
-        if i < len(queries) - 1:
-            time.sleep(delay_query)
+        cached_label = " [cached]" if cache_hit else ""
+        log.append(f"      Q{i+1}: +{added_count} new articles ({len(articles)} total){cached_label}")
 
     return all_articles, instrumentation
 
 
+async def search_wsj_item(
+    wsj: dict,
+    client: httpx.AsyncClient,
+    limiter: AsyncTokenBucket,
+    min_candidates: int = 0,
+    min_title_sim: float = 0.0,
+) -> tuple[dict, dict, list[str]]:
+    """Search one WSJ item. Returns (result, instrumentation_record, log_lines)."""
+    log = [f"WSJ: {wsj['title']}", f"    {wsj['description'][:100]}..."]
+
+    # Date filter: only articles from same day as WSJ publish date
+    wsj_date = parse_rss_date(wsj['pubDate'])
+
+    # Build search queries (prefer LLM-generated, fall back to title)
+    llm_queries = wsj.get('llm_search_queries') or None
+    queries = build_queries(wsj['title'], wsj['description'], llm_queries=llm_queries)
+    log.append(f"    Queries ({len(queries)}):")
+    for j, q in enumerate(queries):
+        log.append(f"      Q{j+1}: {q[:70]}{'...' if len(q) > 70 else ''}")
+
+    articles, instr = await search_multi_query(
+        queries, client, limiter, wsj_date, log,
+        min_candidates=min_candidates, headline=wsj['title'], min_title_sim=min_title_sim,
+    )
+    log.append(f"    Found: {len(articles)} articles")
+
+    # Show top 5
+    for j, art in enumerate(articles[:5]):
+        log.append(f"      [{j+1}] {art['source']}: {art['title'][:50]}...")
+
+    result = {
+        'wsj': wsj,
+        'queries': queries,
+        'google_news': articles,
+    }
+    instrumentation = {
+        'wsj_title': wsj['title'],
+        'instrumentation': instr,
+    }
+    return result, instrumentation, log
+
+
+async def search_all_items(
+    wsj_items: list[dict],
+    concurrency: int,
+    max_rps: float,
+    min_candidates: int = 0,
+    min_title_sim: float = 0.0,
+    on_result: Callable[[int, dict], Awaitable[None]] | None = None,
+) -> list[tuple[dict, dict, list[str]]]:
+    """Search all items concurrently under one news.google.com rate limiter.
+
+    on_result(index, result) is awaited as each item finishes, while it still
+    holds its concurrency slot, so a slow consumer (e.g. a full stream queue)
+    throttles new searches.
+
+    Returns per-item (result, instrumentation, log) in input order.
+    """
+    limiter = AsyncTokenBucket(rate=max_rps)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: list = [None] * len(wsj_items)
+
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def run(i: int, wsj: dict) -> None:
+            async with semaphore:
+                outcomes[i] = await search_wsj_item(wsj, client, limiter, min_candidates, min_title_sim)
+                result, _, log = outcomes[i]
+                print("=" * 80)
+                print(f"[{i+1}/{len(wsj_items)}] " + "\n".join(log))
+                if on_result is not None:
+                    await on_result(i, result)
+
+        await asyncio.gather(*(run(i, wsj) for i, wsj in enumerate(wsj_items)))
+
+    return outcomes
+
+
+# ============================================================
+# Streaming mode: search → embedding rank → resolve
+# ============================================================
+
+@lru_cache(maxsize=None)
+def _load_stage(filename: str):
+    """Import a numbered pipeline script (e.g. 4_embedding_rank.py) as a module."""
+    path = Path(__file__).parent / filename
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def stream_search_rank_resolve(
+    wsj_items: list[dict],
+    concurrency: int,
+    max_rps: float,
+    min_candidates: int,
+    min_title_sim: float,
+    queue_size: int = DEFAULT_STREAM_QUEUE_SIZE,
+    top_k: int = 40,
+    min_score: float = 0.55,
+    resolve_rate: float | None = None,
+) -> tuple[list, list[dict], dict]:
+    """Run search, 4_ ranking and 5_ resolving as concurrent stages.
+
+    Each item with candidates moves to ranking as soon as its search finishes,
+    and to resolving as soon as it is ranked. Bounded queues between stages
+    provide backpressure: when ranking or resolving falls behind, searches
+    wait instead of piling up results. Ranking (CPU) runs one item at a time
+    in a worker thread; resolving resolves each item's articles concurrently
+    through one HostLimiter and BatchExecuteBatcher for the whole run
+    (resolve_rate requests/second per host, default 5_'s DEFAULT_RATE).
+
+    Returns:
+        (search outcomes, ranked+resolved results in input order, resolve stats)
+    """
+    rank_stage = _load_stage('4_embedding_rank.py')
+    resolve_stage = _load_stage('5_resolve_ranked.py')
+
+    rank_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    resolve_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    ranked: dict[int, dict] = {}
+    resolve_stats = resolve_stage.new_resolve_stats()
+
+    async def enqueue(i: int, result: dict) -> None:
+        if result['google_news']:
+            await rank_q.put((i, result))
+
+    async def rank_worker() -> None:
+        while (job := await rank_q.get()) is not None:
+            i, result = job
+            ranked_result, log = await asyncio.to_thread(
+                rank_stage.rank_wsj_item, result, top_k, min_score
+            )
+            print("=" * 80)
+            print(f"[rank {i+1}/{len(wsj_items)}] " + "\n".join(log))
+            ranked[i] = ranked_result
+            await resolve_q.put((i, ranked_result))
+        await resolve_q.put(None)
+
+    async def resolve_worker() -> None:
+        limiter = HostLimiter(concurrency=resolve_stage.DEFAULT_CONCURRENCY,
+                              rate=resolve_rate or resolve_stage.DEFAULT_RATE)
+        limits = httpx.Limits(max_connections=resolve_stage.DEFAULT_CONCURRENCY * 2,
+                              max_keepalive_connections=resolve_stage.DEFAULT_CONCURRENCY)
+        in_flight: dict[str, asyncio.Task] = {}
+
+        async with httpx.AsyncClient(timeout=30.0, limits=limits) as http_client:
+            batcher = BatchExecuteBatcher(http_client, limiter, max_batch=resolve_stage.DEFAULT_BATCH_SIZE)
+
+            async def resolve_one(article: dict) -> str:
+                if article.get('resolve_status') == 'success':
+                    resolve_stats['skipped'] += 1
+                    return "Already resolved"
+                link = article.get('link', '')
+                if link not in in_flight:
+                    in_flight[link] = asyncio.ensure_future(
+                        resolve_google_news_url_async(link, http_client, limiter, batcher)
+                    )
+                result = await in_flight[link]
+                return resolve_stage.apply_resolve_result(article, result, resolve_stats)
+
+            while (job := await resolve_q.get()) is not None:
+                i, data = job
+                lines = await asyncio.gather(*(resolve_one(a) for a in data['ranked']))
+                log = [f"[resolve {i+1}/{len(wsj_items)}] WSJ: {data['wsj'].get('title', 'Unknown')[:60]}..."]
+                log += [f"  {a.get('source', 'Unknown')}... {line}" for a, line in zip(data['ranked'], lines)]
+                print("\n".join(log))
+
+    async def search_then_close() -> list:
+        try:
+            return await search_all_items(
+                wsj_items, concurrency, max_rps, min_candidates, min_title_sim, on_result=enqueue
+            )
+        finally:
+            await rank_q.put(None)
+
+    outcomes, _, _ = await asyncio.gather(search_then_close(), rank_worker(), resolve_worker())
+    return outcomes, [ranked[i] for i in sorted(ranked)], resolve_stats
+
+
 def main():
-    import argparse
     parser = argparse.ArgumentParser(description="WSJ → Google News search pipeline")
     parser.add_argument('--limit', type=int, default=None, help='Process only N items')
-    parser.add_argument('--delay-item', type=float, default=2.0, help='Delay between items (seconds)')
-    parser.add_argument('--delay-query', type=float, default=1.0, help='Delay between queries (seconds)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='WSJ items searched at once')
+    parser.add_argument('--max-rps', type=float, default=DEFAULT_MAX_RPS,
+                        help='Global request rate to news.google.com (requests/second)')
+    parser.add_argument('--min-candidates', type=int, default=DEFAULT_MIN_CANDIDATES,
+                        help='Skip remaining queries once this many candidates are found (0 = run all)')
+    parser.add_argument('--min-title-sim', type=float, default=0.0,
+                        help='Only count candidates whose title overlaps the WSJ headline this much (0-1)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_SEARCH_CACHE_TTL_HOURS,
+                        help='Query result cache lifetime in hours (0 = disable cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the query result cache')
+    parser.add_argument('--stream', action='store_true',
+                        help='Rank (4_) and resolve (5_) each item as soon as its search finishes')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_STREAM_QUEUE_SIZE,
+                        help='Stream mode: max items waiting between stages')
+    parser.add_argument('--top-k', type=int, default=40, help='Stream mode: max ranked results per item')
+    parser.add_argument('--min-score', type=float, default=0.55, help='Stream mode: minimum cosine similarity')
+    parser.add_argument('--resolve-rate', type=float, default=None,
+                        help='Stream mode: resolve request rate per host (requests/second, default: 5_ default)')
+    parser.add_argument('--update-db', action='store_true', help='Stream mode: save resolve results to Supabase')
+    parser.add_argument('--delay-item', type=float, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--delay-query', type=float, default=None, help=argparse.SUPPRESS)
     parser.add_argument('--input', type=Path, default=None, dest='custom_input', help='Custom JSONL input file')
     args = parser.parse_args()
 
     limit = args.limit
-    delay_item = args.delay_item
-    delay_query = args.delay_query
+    if args.delay_item is not None or args.delay_query is not None:
+        print("Note: --delay-item/--delay-query are deprecated; pacing uses --max-rps")
 
     # Determine input source
     if args.custom_input:
@@ -521,54 +805,36 @@ def main():
     if limit:
         wsj_items = wsj_items[:limit]
 
-    print(f"\nProcessing {len(wsj_items)} items | delay_item={delay_item}s | delay_query={delay_query}s\n")
-
-    results = []
-    all_instrumentation = []
-    searched_ids = []  # Track IDs for marking searched later
-
-    with httpx.Client() as client:
-        for i, wsj in enumerate(wsj_items):
-            print("=" * 80)
-            print(f"[{i+1}/{len(wsj_items)}] WSJ: {wsj['title']}")
-            print(f"    {wsj['description'][:100]}...")
-
-            # Date filter: only articles from same day as WSJ publish date
-            wsj_date = parse_rss_date(wsj['pubDate'])
-
-            # Build search queries (prefer LLM-generated, fall back to title)
-            llm_queries = wsj.get('llm_search_queries') or None
-            queries = build_queries(wsj['title'], wsj['description'], llm_queries=llm_queries)
-            print(f"    Queries ({len(queries)}):")
-            for j, q in enumerate(queries):
-                print(f"      Q{j+1}: {q[:70]}{'...' if len(q) > 70 else ''}")
-
-            # Search with all queries
-            articles, instr = search_multi_query(
-                queries, client, wsj_date, delay_query
-            )
-            print(f"    Found: {len(articles)} articles")
-
-            # Show top 5
-            for j, art in enumerate(articles[:5]):
-                print(f"      [{j+1}] {art['source']}: {art['title'][:50]}...")
-
-            results.append({
-                'wsj': wsj,
-                'queries': queries,
-                'google_news': articles,
-            })
-            all_instrumentation.append({
-                'wsj_title': wsj['title'],
-                'instrumentation': instr,
-            })
-
-            # Track ID for marking searched
-            if wsj.get('id'):
-                searched_ids.append(wsj['id'])
+    print(f"\nProcessing {len(wsj_items)} items | concurrency={args.concurrency} | max_rps={args.max_rps}\n")
+
+    global _search_cache
+    if not args.no_cache and args.cache_ttl > 0:
+        _search_cache = SQLiteBackend(
+            SEARCH_CACHE_PATH, args.cache_ttl * 3600, SEARCH_CACHE_MAX_MB * 1024 * 1024
+        )
+
+    # Warm DB-backed caches before the event loop starts (sync Supabase calls)
+    load_blocked_domains()
+    _load_blocked_with_hits()
+
+    ranked_results = None
+    if args.stream:
+        outcomes, ranked_results, resolve_stats = asyncio.run(stream_search_rank_resolve(
+            wsj_items, max(1, args.concurrency), args.max_rps,
+            max(0, args.min_candidates), args.min_title_sim,
+            queue_size=max(1, args.queue_size), top_k=args.top_k, min_score=args.min_score,
+            resolve_rate=args.resolve_rate,
+        ))
+    else:
+        outcomes = asyncio.run(search_all_items(
+            wsj_items, max(1, args.concurrency), args.max_rps,
+            max(0, args.min_candidates), args.min_title_sim,
+        ))
 
-            if i < len(wsj_items) - 1:
-                time.sleep(delay_item)
+    results = [result for result, _, _ in outcomes]
+    all_instrumentation = [instr for _, instr, _ in outcomes]
+    # Track IDs for marking searched later
+    searched_ids = [wsj['id'] for wsj in wsj_items if wsj.get('id')]
 
     # Filter results: keep only items with at least 1 article found
     results_with_articles = [r for r in results if len(r['google_news']) > 0]
@@ -624,6 +890,16 @@ def main():
         with open(ids_path, 'w') as f:
             json.dump({'ids': searched_ids, 'count': len(searched_ids)}, f, indent=2)
 
+    query_records = [q for instr in all_instrumentation for q in instr['instrumentation']['queries_executed']]
+    cache_hits = sum(1 for q in query_records if q.get('cache_hit'))
+    queries_skipped = sum(instr['instrumentation'].get('queries_skipped', 0) for instr in all_instrumentation)
+    if args.min_candidates > 0:
+        print(f"\nAdaptive queries: {len(query_records)} executed, {queries_skipped} skipped "
+              f"(min candidates: {args.min_candidates})")
+    if _search_cache is not None:
+        print(f"\nQuery cache: {cache_hits}/{len(query_records)} queries served from cache "
+              f"({len(query_records) - cache_hits} Google requests)")
+
     # Save search_hit_counts to DB for -site: prioritization
     hit_count_result = save_search_hit_counts()
     if hit_count_result >= 0:
@@ -631,10 +907,24 @@ def main():
     else:
         print(f"\nSearch hit counts: {len(_search_hit_counter)} domains tracked (DB save skipped)")
 
+    if ranked_results is not None:
+        rank_stage = _load_stage('4_embedding_rank.py')
+        resolve_stage = _load_stage('5_resolve_ranked.py')
+        rank_stage.print_rank_summary(total_articles, ranked_results)
+        ranked_jsonl, ranked_txt = rank_stage.save_ranked_results(ranked_results, output_dir)
+        resolve_stage.print_resolve_summary(
+            ranked_results, resolve_stats, sum(len(r['ranked']) for r in ranked_results)
+        )
+        if args.update_db:
+            resolve_stage.update_supabase(ranked_results)
+
     print("\nResults saved to:")
     print(f"  {jsonl_path}")
     print(f"  {txt_path}")
     print(f"  {instr_path}")
+    if ranked_results is not None:
+        print(f"  {ranked_jsonl}")
+        print(f"  {ranked_txt}")
     if searched_ids:
         print(f"  {ids_path}")
         print("\nTo mark items as searched in Supabase:")
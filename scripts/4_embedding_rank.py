@@ -2,7 +2,8 @@
 """
 Phase 2 · Step 1 · Embedding Rank — Embedding-based ranking for WSJ → Google News candidates.
 
-Uses sentence-transformers (BAAI/bge-base-en-v1.5) for semantic similarity.
+Uses sentence-transformers (BAAI/bge-base-en-v1.5) for semantic similarity
+(EMBEDDING_BACKEND=onnx|onnx-int8 selects a faster CPU backend, see lib/embedding_model.py).
 Ranks backup articles by cosine similarity to WSJ title + description.
 
 Usage:
@@ -11,24 +12,30 @@ Usage:
 import json
 import re
 import sys
+import time
 from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.embedding_cache import encode_cached, print_embedding_cache_stats
+from lib.embedding_model import DEFAULT_TOKEN_BUDGET, embedding_cache_id, load_embedding_model
+
+MODEL_NAME = 'BAAI/bge-base-en-v1.5'
 _model = None
 
+# Max texts per forward pass when encoding the whole run at once; batches are
+# also capped at ENCODE_TOKEN_BUDGET padded tokens (length-bucketed)
+ENCODE_BATCH_SIZE = 128
+ENCODE_TOKEN_BUDGET = DEFAULT_TOKEN_BUDGET
+
 
 def _get_model():
     """Lazy-load sentence-transformer model (first call only)."""
     global _model
     if _model is None:
-        from sentence_transformers import SentenceTransformer
         print("Loading embedding model...")
-        try:
-            _model = SentenceTransformer('BAAI/bge-base-en-v1.5', local_files_only=True)
-        except Exception:
-            print("  Local cache miss, downloading from Hub...")
-            _model = SentenceTransformer('BAAI/bge-base-en-v1.5')
+        _model = load_embedding_model(MODEL_NAME)
         print("Model loaded.\n")
     return _model
 
@@ -38,11 +45,43 @@ def normalize_title(title: str) -> str:
     return re.sub(r'\s*[-–]\s*[A-Za-z0-9][A-Za-z0-9 .&\']+$', '', title).strip()
 
 
+def candidate_text(candidate: dict) -> str:
+    """Text embedded for a candidate: normalized title + source name."""
+    return f"{normalize_title(candidate.get('title', ''))} {candidate.get('source', '')}"
+
+
+def query_text_for(wsj: dict) -> str:
+    """Text embedded for a WSJ item: title + description."""
+    return f"{wsj.get('title', '')} {wsj.get('description', '')}"
+
+
+class TextEmbeddings:
+    """Normalized embeddings for a set of texts, each unique string encoded once."""
+
+    def __init__(self, texts: list[str], batch_size: int = ENCODE_BATCH_SIZE,
+                 token_budget: int = ENCODE_TOKEN_BUDGET):
+        unique = list(dict.fromkeys(texts))
+        self._index = {text: i for i, text in enumerate(unique)}
+        self.vectors = (
+            encode_cached(_get_model(), unique, model_name=embedding_cache_id(MODEL_NAME),
+                          normalize_embeddings=True, batch_size=batch_size,
+                          token_budget=token_budget)
+            if unique else np.zeros((0, 0), dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, texts: list[str]) -> np.ndarray:
+        return self.vectors[[self._index[t] for t in texts]]
+
+
 def rank_candidates(
     query_text: str,
     candidates: list[dict],
     top_k: int = 10,
     min_score: float = 0.55,
+    embeddings: TextEmbeddings | None = None,
 ) -> list[tuple[dict, float]]:
     """
     Rank candidates by embedding cosine similarity.
@@ -52,6 +91,7 @@ def rank_candidates(
         candidates: List of article dicts
         top_k: Maximum results to return
         min_score: Minimum cosine similarity threshold
+        embeddings: Pre-encoded texts for the whole run (encodes on the fly if None)
 
     Returns:
         List of (article, score) tuples
@@ -59,110 +99,97 @@ def rank_candidates(
     if not candidates:
         return []
 
-    # Encode query
-    query_vec = _get_model().encode(query_text, normalize_embeddings=True)
+    doc_texts = [candidate_text(c) for c in candidates]
 
-    # Encode all candidates at once (batch for efficiency)
-    doc_texts = []
-    for c in candidates:
-        title = normalize_title(c.get('title', ''))
-        source = c.get('source', '')
-        doc_texts.append(f"{title} {source}")
+    if embeddings is None:
+        # Encode query and candidates in one batch
+        embeddings = TextEmbeddings([query_text] + doc_texts)
 
-    doc_vecs = _get_model().encode(doc_texts, normalize_embeddings=True)
+    query_vec = embeddings.lookup([query_text])[0]
+    doc_vecs = embeddings.lookup(doc_texts)
 
     # Compute cosine similarities (normalized vectors → dot product = cosine)
-    scores = np.dot(doc_vecs, query_vec)
-
-    # Pair with scores
-    scored = [(c, float(score)) for c, score in zip(candidates, scores)]
-
-    # Sort by score descending
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    # Filter by minimum score and top_k
-    return [(article, score) for article, score in scored[:top_k] if score >= min_score]
-
-
-def main():
-    import argparse
-    parser = argparse.ArgumentParser(description="Embedding-based ranking for WSJ → Google News candidates")
-    parser.add_argument('--top-k', type=int, default=40, help='Max results per WSJ item')
-    parser.add_argument('--min-score', type=float, default=0.55, help='Minimum cosine similarity')
-    args = parser.parse_args()
-
-    top_k = args.top_k
-    min_score = args.min_score
-
-    # Read candidates
-    input_path = Path(__file__).parent / 'output' / 'wsj_google_news_results.jsonl'
-    if not input_path.exists():
-        print(f"Error: Run wsj_to_google_news.py first to generate {input_path}")
-        sys.exit(1)
-
-    results = []
-    with open(input_path) as f:
-        for line in f:
-            results.append(json.loads(line))
+    scores = doc_vecs @ query_vec
+
+    # Sort by score descending, then filter by top_k and minimum score
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    return [(candidates[j], float(scores[j])) for j in order if scores[j] >= min_score]
+
+
+def encode_run(
+    results: list[dict],
+    batch_size: int = ENCODE_BATCH_SIZE,
+    token_budget: int = ENCODE_TOKEN_BUDGET,
+) -> TextEmbeddings:
+    """Encode every query and candidate text of a run in a few length-bucketed batches."""
+    texts = []
+    for r in results:
+        if r['google_news']:
+            texts.append(query_text_for(r['wsj']))
+            texts.extend(candidate_text(c) for c in r['google_news'])
+    return TextEmbeddings(texts, batch_size=batch_size, token_budget=token_budget)
+
+
+def rank_wsj_item(
+    r: dict,
+    top_k: int = 40,
+    min_score: float = 0.55,
+    embeddings: TextEmbeddings | None = None,
+) -> tuple[dict, list[str]]:
+    """
+    Rank one search result ({'wsj', 'google_news'}) for resolve_ranked.py.
 
-    print(f"Loaded {len(results)} WSJ items from {input_path.name}")
-    print(f"Ranking with top_k={top_k}, min_score={min_score}\n")
+    Pass embeddings from encode_run() to score against pre-encoded texts.
 
-    ranked_results = []
+    Returns:
+        tuple of ({'wsj', 'ranked'}, log_lines)
+    """
+    wsj = r['wsj']
+    candidates = r['google_news']
+    log = [f"WSJ: {wsj.get('title', 'N/A')}", f"    Candidates: {len(candidates)}"]
+
+    # Query = WSJ title + description
+    query_text = query_text_for(wsj)
+
+    # Rank with embeddings
+    ranked = rank_candidates(query_text, candidates, top_k=top_k, min_score=min_score, embeddings=embeddings)
+
+    top_score = ranked[0][1] if ranked else 0
+    log.append(f"    After Embedding (min_score={min_score}, top_score={top_score:.3f}): {len(ranked)}")
+    log.append("")
+
+    for j, (article, score) in enumerate(ranked):
+        if score >= 0.5:
+            marker = "+"
+        elif score >= 0.4:
+            marker = "o"
+        else:
+            marker = "-"
+        log.append(f"    {marker} [{j+1}/{len(ranked)}] score={score:.3f}")
+        log.append(f"       {article.get('source', 'N/A')}: {article.get('title', 'N/A')[:60]}...")
+
+    # Build output structure (compatible with resolve_ranked.py)
+    ranked_articles = []
+    for article, score in ranked:
+        ranked_articles.append({
+            'title': article.get('title', ''),
+            'source': article.get('source', ''),
+            'source_domain': article.get('source_domain', ''),
+            'link': article.get('link', ''),
+            'pubDate': article.get('pubDate', ''),
+            'embedding_score': round(score, 4),
+        })
 
-    for i, r in enumerate(results):
-        wsj = r['wsj']
-        candidates = r['google_news']
+    return {'wsj': wsj, 'ranked': ranked_articles}, log
 
-        print("=" * 80)
-        print(f"[{i+1}/{len(results)}] WSJ: {wsj.get('title', 'N/A')}")
-
-        print(f"    Candidates: {len(candidates)}")
-
-        # Query = WSJ title + description
-        query_text = f"{wsj.get('title', '')} {wsj.get('description', '')}"
-
-        # Rank with embeddings
-        ranked = rank_candidates(query_text, candidates, top_k=top_k, min_score=min_score)
-
-        top_score = ranked[0][1] if ranked else 0
-        print(f"    After Embedding (min_score={min_score}, top_score={top_score:.3f}): {len(ranked)}")
-        print()
-
-        for j, (article, score) in enumerate(ranked):
-            if score >= 0.5:
-                marker = "+"
-            elif score >= 0.4:
-                marker = "o"
-            else:
-                marker = "-"
-            print(f"    {marker} [{j+1}/{len(ranked)}] score={score:.3f}")
-            print(f"       {article.get('source', 'N/A')}: {article.get('title', 'N/A')[:60]}...")
-
-        # Build output structure (compatible with resolve_ranked.py)
-        ranked_articles = []
-        for article, score in ranked:
-            ranked_articles.append({
-                'title': article.get('title', ''),
-                'source': article.get('source', ''),
-                'source_domain': article.get('source_domain', ''),
-                'link': article.get('link', ''),
-                'pubDate': article.get('pubDate', ''),
-                'embedding_score': round(score, 4),
-            })
-
-        ranked_results.append({
-            'wsj': wsj,
-            'ranked': ranked_articles,
-        })
 
-    # Summary
+def print_rank_summary(total_candidates: int, ranked_results: list[dict]) -> None:
+    """Print candidate/ranked totals and the score distribution."""
     print()
     print("=" * 80)
     print("SUMMARY")
     print("=" * 80)
 
-    total_candidates = sum(len(r['google_news']) for r in results)
     total_ranked = sum(len(r['ranked']) for r in ranked_results)
 
     print(f"Total candidates: {total_candidates}")
@@ -182,9 +209,11 @@ def main():
     print("  + (>=0.5) : High similarity")
     print("  o (>=0.4) : Medium similarity")
     print("  - (<0.4)  : Low similarity")
+    print_embedding_cache_stats()
 
-    # Save results
-    output_dir = Path(__file__).parent / 'output'
+
+def save_ranked_results(ranked_results: list[dict], output_dir: Path) -> tuple[Path, Path]:
+    """Write wsj_ranked_results.jsonl (+ .txt for reading). Returns both paths."""
     jsonl_path = output_dir / 'wsj_ranked_results.jsonl'
     with open(jsonl_path, 'w') as f:
         for r in ranked_results:
@@ -201,6 +230,55 @@ def main():
                 f.write(f"    {art.get('link', 'N/A')}\n")
             f.write("\n")
 
+    return jsonl_path, txt_path
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Embedding-based ranking for WSJ → Google News candidates")
+    parser.add_argument('--top-k', type=int, default=40, help='Max results per WSJ item')
+    parser.add_argument('--min-score', type=float, default=0.55, help='Minimum cosine similarity')
+    parser.add_argument('--batch-size', type=int, default=ENCODE_BATCH_SIZE, help='Max texts per encode batch')
+    parser.add_argument('--token-budget', type=int, default=ENCODE_TOKEN_BUDGET,
+                        help='Max padded tokens per encode batch')
+    args = parser.parse_args()
+
+    top_k = args.top_k
+    min_score = args.min_score
+
+    # Read candidates
+    input_path = Path(__file__).parent / 'output' / 'wsj_google_news_results.jsonl'
+    if not input_path.exists():
+        print(f"Error: Run wsj_to_google_news.py first to generate {input_path}")
+        sys.exit(1)
+
+    results = []
+    with open(input_path) as f:
+        for line in f:
+            results.append(json.loads(line))
+
+    print(f"Loaded {len(results)} WSJ items from {input_path.name}")
+    print(f"Ranking with top_k={top_k}, min_score={min_score}\n")
+
+    # Encode all queries and candidates up front (deduplicated, large batches)
+    t0 = time.perf_counter()
+    embeddings = encode_run(results, batch_size=args.batch_size, token_budget=args.token_budget)
+    total_texts = sum(len(r['google_news']) + 1 for r in results if r['google_news'])
+    print(f"Encoded {len(embeddings)} unique texts ({total_texts} total) in {time.perf_counter() - t0:.1f}s\n")
+
+    ranked_results = []
+
+    for i, r in enumerate(results):
+        ranked_result, log = rank_wsj_item(r, top_k=top_k, min_score=min_score, embeddings=embeddings)
+        print("=" * 80)
+        print(f"[{i+1}/{len(results)}] " + "\n".join(log))
+        ranked_results.append(ranked_result)
+
+    print_rank_summary(sum(len(r['google_news']) for r in results), ranked_results)
+
+    # Save results
+    jsonl_path, txt_path = save_ranked_results(ranked_results, Path(__file__).parent / 'output')
+
     print("\nResults saved to:")
     print(f"  {jsonl_path}")
     print(f"  {txt_path}")
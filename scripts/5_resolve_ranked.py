@@ -5,14 +5,21 @@ Phase 2 · Step 2 · URL Resolve — Resolve Google News URLs for embedding-rank
 Adds resolved_url, resolve_status, resolve_reason_code, resolve_strategy_used
 fields to each article in wsj_ranked_results.jsonl.
 
+Passthrough and base64-decodable links resolve immediately; batchexecute and
+canonical fetches run concurrently on one pooled client, limited per host
+(--concurrency in flight, --rate requests/second). Batchexecute calls for
+concurrent article IDs share multi-ID POSTs (--batch-size). Article IDs
+resolved on an earlier run come from the persistent resolve cache
+(lib/resolve_cache.py).
+
 Usage:
-    python scripts/resolve_ranked.py [--delay N] [--update-db]
+    python scripts/resolve_ranked.py [--concurrency N] [--rate R] [--no-cache] [--update-db]
 """
+import asyncio
 import json
 import os
 import sys
 import tempfile
-import time
 from pathlib import Path
 
 import httpx
@@ -20,13 +27,21 @@ import httpx
 # Import resolver
 sys.path.insert(0, str(Path(__file__).parent))
 from lib.google_news_resolver import (
-    resolve_google_news_url,
+    resolve_google_news_url_async,
+    BatchExecuteBatcher,
     extract_domain,
     ResolveResult,
     ReasonCode,
 )
+from lib.rate_limit import HostLimiter
+from lib.resolve_cache import print_resolve_cache_stats
 from domain_utils import get_supabase_client
 
+DEFAULT_CONCURRENCY = 8   # in-flight requests per host
+DEFAULT_RATE = 4.0        # requests/second per host
+DEFAULT_BATCH_SIZE = 20   # article IDs per batchexecute POST
+UPSERT_CHUNK_SIZE = 500   # wsj_crawl_results rows per upsert request
+
 
 def atomic_write_jsonl(path: Path, data: list) -> None:
     """Write JSONL atomically using tmp file + rename."""
@@ -46,178 +61,241 @@ def atomic_write_jsonl(path: Path, data: list) -> None:
         raise
 
 
-def update_supabase(all_data: list) -> None:
-    """Save resolve results to Supabase.
+def crawl_result_record(wsj: dict, article: dict) -> dict | None:
+    """wsj_crawl_results row for a resolved (or failed) article, None if unresolved.
 
     - Successful resolutions: crawl_status='pending' (ready for crawl)
     - Failed resolutions: crawl_status='resolve_failed' (tracked for domain blocking)
+    """
+    resolve_status = article.get('resolve_status')
+
+    if resolve_status == 'success':
+        return {
+            'wsj_item_id': wsj.get('id'),
+            'wsj_title': wsj.get('title'),
+            'wsj_link': wsj.get('link'),
+            'source': article.get('source'),
+            'title': article.get('title'),
+            'resolved_url': article.get('resolved_url'),
+            'resolved_domain': article.get('resolved_domain'),
+            'embedding_score': article.get('embedding_score'),
+            'crawl_status': 'pending',
+            'crawl_error': None,  # same keys as resolve_failed rows (bulk upserts need uniform columns)
+        }
+
+    if resolve_status in ('failed', 'skipped'):
+        original_url = article.get('link', '')
+        return {
+            'wsj_item_id': wsj.get('id'),
+            'wsj_title': wsj.get('title'),
+            'wsj_link': wsj.get('link'),
+            'source': article.get('source'),
+            'title': article.get('title'),
+            'resolved_url': original_url,
+            'resolved_domain': extract_domain(original_url),
+            'embedding_score': article.get('embedding_score'),
+            'crawl_status': 'resolve_failed',
+            'crawl_error': article.get('resolve_reason_code', 'UNKNOWN'),
+        }
+
+    return None
+
+
+def insert_crawl_result(supabase, record: dict) -> str:
+    """Insert one wsj_crawl_results row, keeping any existing record.
+
+    Returns 'saved', 'skipped' (duplicate) or 'error'.
+    """
+    try:
+        supabase.table('wsj_crawl_results').insert(record).execute()
+        return 'saved'
+    except Exception as e:
+        if 'duplicate' in str(e).lower() or '23505' in str(e):
+            return 'skipped'
+        if record.get('crawl_status') == 'pending':
+            print(f"  Error saving {record.get('resolved_url')}: {e}")
+        else:
+            print(f"  Error saving resolve failure: {e}")
+        return 'error'
+
+
+def update_supabase(all_data: list) -> None:
+    """Save resolve results to Supabase (see crawl_result_record).
 
-    Uses INSERT with ignore_duplicates to preserve existing records.
+    All rows are built up front and written in chunked
+    upsert(on_conflict='resolved_url', ignore_duplicates=True) calls, so
+    existing records are kept. The response only holds rows actually
+    inserted; the rest of each chunk counts as skipped. A chunk that fails
+    falls back to insert_crawl_result() row by row.
     """
     supabase = get_supabase_client()
     if not supabase:
         print("\nSkipping Supabase update (missing credentials)")
         return
 
-    print("\nSaving resolve results to Supabase...")
-    saved_success = 0
-    saved_failed = 0
+    records = []
+    seen_urls: set = set()
     skipped = 0
-
     for data in all_data:
         wsj = data.get('wsj', {})
-        ranked = data.get('ranked', [])
-
-        for article in ranked:
-            resolve_status = article.get('resolve_status')
-
-            if resolve_status == 'success':
-                record = {
-                    'wsj_item_id': wsj.get('id'),
-                    'wsj_title': wsj.get('title'),
-                    'wsj_link': wsj.get('link'),
-                    'source': article.get('source'),
-                    'title': article.get('title'),
-                    'resolved_url': article.get('resolved_url'),
-                    'resolved_domain': article.get('resolved_domain'),
-                    'embedding_score': article.get('embedding_score'),
-                    'crawl_status': 'pending',
-                }
-                try:
-                    supabase.table('wsj_crawl_results').insert(record).execute()
-                    saved_success += 1
-                except Exception as e:
-                    if 'duplicate' in str(e).lower() or '23505' in str(e):
-                        skipped += 1
-                    else:
-                        print(f"  Error saving {article.get('resolved_url')}: {e}")
-
-            elif resolve_status in ('failed', 'skipped'):
-                original_url = article.get('link', '')
-                record = {
-                    'wsj_item_id': wsj.get('id'),
-                    'wsj_title': wsj.get('title'),
-                    'wsj_link': wsj.get('link'),
-                    'source': article.get('source'),
-                    'title': article.get('title'),
-                    'resolved_url': original_url,
-                    'resolved_domain': extract_domain(original_url),
-                    'embedding_score': article.get('embedding_score'),
-                    'crawl_status': 'resolve_failed',
-                    'crawl_error': article.get('resolve_reason_code', 'UNKNOWN'),
-                }
-                try:
-                    supabase.table('wsj_crawl_results').insert(record).execute()
-                    saved_failed += 1
-                except Exception as e:
-                    if 'duplicate' in str(e).lower() or '23505' in str(e):
-                        skipped += 1
-                    else:
-                        print(f"  Error saving resolve failure: {e}")
-
-    print(f"  Saved: {saved_success} pending, {saved_failed} resolve_failed (skipped {skipped} existing)")
-
-
-def main():
-    import argparse
-    parser = argparse.ArgumentParser(description="Resolve Google News URLs for embedding-ranked results")
-    parser.add_argument('--delay', type=float, default=3.0, help='Delay between requests in seconds')
-    parser.add_argument('--update-db', action='store_true', help='Update Supabase after resolution')
-    args = parser.parse_args()
-
-    # Load ranked results
-    input_path = Path(__file__).parent / "output" / "wsj_ranked_results.jsonl"
-    if not input_path.exists():
-        print(f"Error: Run embedding_rank.py first to generate {input_path}")
-        sys.exit(1)
-
-    all_data = []
-    total_articles = 0
-    with open(input_path) as f:
-        for line in f:
-            data = json.loads(line)
-            all_data.append(data)
-            total_articles += len(data.get("ranked", []))
-
-    print(f"Loaded {len(all_data)} WSJ items with {total_articles} ranked articles")
-    print(f"Delay between requests: {args.delay}s")
-    print("=" * 80)
-
-    stats = {
+        for article in data.get('ranked', []):
+            record = crawl_result_record(wsj, article)
+            if record is None:
+                continue
+            # Same URL twice in one upsert: keep the first, like the DB would
+            if record['resolved_url'] in seen_urls:
+                skipped += 1
+                continue
+            seen_urls.add(record['resolved_url'])
+            records.append(record)
+
+    print(f"\nSaving {len(records)} resolve results to Supabase...")
+    saved = {'pending': 0, 'resolve_failed': 0}
+
+    for i in range(0, len(records), UPSERT_CHUNK_SIZE):
+        chunk = records[i:i + UPSERT_CHUNK_SIZE]
+        try:
+            response = supabase.table('wsj_crawl_results') \
+                .upsert(chunk, on_conflict='resolved_url', ignore_duplicates=True) \
+                .execute()
+            rows = response.data or []
+            for row in rows:
+                status = row.get('crawl_status')
+                saved[status] = saved.get(status, 0) + 1
+            skipped += len(chunk) - len(rows)
+        except Exception as e:
+            print(f"  [WARN] Bulk upsert failed ({e}), retrying {len(chunk)} rows individually")
+            for record in chunk:
+                outcome = insert_crawl_result(supabase, record)
+                if outcome == 'saved':
+                    saved[record['crawl_status']] += 1
+                elif outcome == 'skipped':
+                    skipped += 1
+
+    print(f"  Saved: {saved['pending']} pending, {saved['resolve_failed']} resolve_failed "
+          f"(skipped {skipped} existing)")
+
+
+def new_resolve_stats() -> dict:
+    """Counters filled in by apply_resolve_result() and read by print_resolve_summary()."""
+    return {
         "resolved": 0,
         "failed": 0,
         "skipped": 0,
         "passthrough": 0,
+        "cache_hits": 0,
+        "reason_counts": {},
+        "strategy_counts": {},
     }
-    reason_counts: dict[str, int] = {}
-    strategy_counts: dict[str, int] = {}
-
-    with httpx.Client(timeout=30.0) as http_client:
-        article_num = 0
-        for wsj_idx, data in enumerate(all_data):
-            wsj_title = data.get("wsj", {}).get("title", "Unknown")
-            articles = data.get("ranked", [])
-
-            print(f"\n[{wsj_idx+1}/{len(all_data)}] WSJ: {wsj_title[:60]}...")
-
-            for article in articles:
-                article_num += 1
-                google_url = article.get("link", "")
-                source = article.get("source", "Unknown")
-
-                # Skip if already resolved successfully
-                if article.get("resolve_status") == "success":
-                    print(f"  [{article_num}/{total_articles}] {source}: Already resolved")
-                    stats["skipped"] += 1
-                    continue
-
-                print(f"  [{article_num}/{total_articles}] {source}...", end=" ", flush=True)
-
-                result: ResolveResult = resolve_google_news_url(google_url, http_client)
-
-                if result.success:
-                    article["resolved_url"] = result.resolved_url
-                    article["resolved_domain"] = extract_domain(result.resolved_url)
-                    article["resolve_status"] = "success"
-                    article["resolve_reason_code"] = result.reason_code.value
-                    article["resolve_strategy_used"] = result.strategy_used.value
-
-                    article.pop("resolve_error", None)
-
-                    domain_display = article["resolved_domain"] or "unknown"
-                    print(f"✓ {domain_display} ({result.strategy_used.value})")
-
-                    if result.reason_code == ReasonCode.PASSTHROUGH:
-                        stats["passthrough"] += 1
-                    else:
-                        stats["resolved"] += 1
-                else:
-                    article["resolved_url"] = None
-                    article["resolved_domain"] = None
-                    article["resolve_status"] = "fail"
-                    article["resolve_reason_code"] = result.reason_code.value
-                    article["resolve_strategy_used"] = result.strategy_used.value
-
-                    if result.error_detail:
-                        article["resolve_error"] = result.error_detail[:100]
-
-                    error_short = result.reason_code.value
-                    if result.http_status:
-                        error_short = f"{error_short} (HTTP {result.http_status})"
-                    print(f"✗ {error_short}")
-                    stats["failed"] += 1
-
-                reason_counts[result.reason_code.value] = reason_counts.get(result.reason_code.value, 0) + 1
-                strategy_counts[result.strategy_used.value] = strategy_counts.get(result.strategy_used.value, 0) + 1
-
-                # Rate limit
-                if article_num < total_articles:
-                    time.sleep(args.delay)
 
-    # Write back atomically
-    atomic_write_jsonl(input_path, all_data)
 
-    # Summary
+def apply_resolve_result(article: dict, result: ResolveResult, stats: dict) -> str:
+    """
+    Write a resolve result onto the article in place and update stats.
+
+    Sets resolved_url, resolved_domain, resolve_status, resolve_reason_code,
+    resolve_strategy_used (and resolve_error on failure).
+
+    Returns:
+        Status line for the log
+    """
+    if result.success:
+        article["resolved_url"] = result.resolved_url
+        article["resolved_domain"] = extract_domain(result.resolved_url)
+        article["resolve_status"] = "success"
+        article["resolve_reason_code"] = result.reason_code.value
+        article["resolve_strategy_used"] = result.strategy_used.value
+
+        article.pop("resolve_error", None)
+
+        domain_display = article["resolved_domain"] or "unknown"
+        line = f"✓ {domain_display} ({result.strategy_used.value})"
+
+        if result.reason_code == ReasonCode.PASSTHROUGH:
+            stats["passthrough"] += 1
+        else:
+            stats["resolved"] += 1
+    else:
+        article["resolved_url"] = None
+        article["resolved_domain"] = None
+        article["resolve_status"] = "fail"
+        article["resolve_reason_code"] = result.reason_code.value
+        article["resolve_strategy_used"] = result.strategy_used.value
+
+        if result.error_detail:
+            article["resolve_error"] = result.error_detail[:100]
+
+        error_short = result.reason_code.value
+        if result.http_status:
+            error_short = f"{error_short} (HTTP {result.http_status})"
+        line = f"✗ {error_short}"
+        stats["failed"] += 1
+
+    reason_counts = stats["reason_counts"]
+    strategy_counts = stats["strategy_counts"]
+    reason_counts[result.reason_code.value] = reason_counts.get(result.reason_code.value, 0) + 1
+    strategy_counts[result.strategy_used.value] = strategy_counts.get(result.strategy_used.value, 0) + 1
+    if result.from_cache:
+        stats["cache_hits"] += 1
+        line += " [cached]"
+    return line
+
+
+async def resolve_all(
+    all_data: list,
+    stats: dict,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = DEFAULT_RATE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """Resolve every ranked article concurrently, in place.
+
+    Offline resolutions (passthrough, decode) complete without waiting; HTTP
+    strategies share one AsyncClient and a HostLimiter, and batchexecute
+    calls are packed up to batch_size IDs per POST (1 = one POST per ID). A
+    link repeated within the run is resolved once. Log lines are printed as
+    articles finish.
+    """
+    articles = [
+        (data.get("wsj", {}).get("title", "Unknown"), article)
+        for data in all_data
+        for article in data.get("ranked", [])
+    ]
+    total = len(articles)
+    done = 0
+    limiter = HostLimiter(concurrency=concurrency, rate=rate)
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
+    in_flight: dict[str, asyncio.Task] = {}
+
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as http_client:
+        batcher = BatchExecuteBatcher(http_client, limiter, max_batch=batch_size) if batch_size > 1 else None
+
+        async def run(wsj_title: str, article: dict) -> None:
+            nonlocal done
+            if article.get("resolve_status") == "success":
+                stats["skipped"] += 1
+                line = "Already resolved"
+            else:
+                link = article.get("link", "")
+                if link not in in_flight:
+                    in_flight[link] = asyncio.ensure_future(
+                        resolve_google_news_url_async(link, http_client, limiter, batcher)
+                    )
+                result = await in_flight[link]
+                line = apply_resolve_result(article, result, stats)
+            done += 1
+            print(f"  [{done}/{total}] {article.get('source', 'Unknown')} "
+                  f"({wsj_title[:40]}) {line}", flush=True)
+
+        await asyncio.gather(*(run(title, article) for title, article in articles))
+
+    if batcher is not None and batcher.ids:
+        print(f"\nBatchexecute: {batcher.ids} IDs in {batcher.posts} POSTs "
+              f"({batcher.fallbacks} single-ID fallbacks)")
+
+
+def print_resolve_summary(all_data: list, stats: dict, total_articles: int) -> None:
+    """Print resolve counts, reason codes, strategies and resolved domains."""
     print()
     print("=" * 80)
     print("SUMMARY")
@@ -227,12 +305,15 @@ def main():
     print(f"Passthrough (non-Google URLs): {stats['passthrough']}")
     print(f"Failed: {stats['failed']}")
     print(f"Skipped (already resolved): {stats['skipped']}")
+    print(f"From resolve cache: {stats['cache_hits']}")
 
+    reason_counts = stats["reason_counts"]
     if reason_counts:
         print("\nReason codes:")
         for code, count in sorted(reason_counts.items(), key=lambda x: -x[1]):
             print(f"  {code}: {count}")
 
+    strategy_counts = stats["strategy_counts"]
     if strategy_counts:
         print("\nStrategies used:")
         for strategy, count in sorted(strategy_counts.items(), key=lambda x: -x[1]):
@@ -250,6 +331,54 @@ def main():
         for domain, count in sorted(domain_counts.items(), key=lambda x: -x[1]):
             print(f"  {domain}: {count}")
 
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Resolve Google News URLs for embedding-ranked results")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Max in-flight requests per host')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help='Max requests per second per host')
+    parser.add_argument('--delay', type=float, default=None,
+                        help='Min seconds between requests per host (sets --rate to 1/delay)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Article IDs per batchexecute POST (1 = no batching)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the persistent resolve cache')
+    parser.add_argument('--update-db', action='store_true', help='Update Supabase after resolution')
+    args = parser.parse_args()
+
+    # Load ranked results
+    input_path = Path(__file__).parent / "output" / "wsj_ranked_results.jsonl"
+    if not input_path.exists():
+        print(f"Error: Run embedding_rank.py first to generate {input_path}")
+        sys.exit(1)
+
+    all_data = []
+    total_articles = 0
+    with open(input_path) as f:
+        for line in f:
+            data = json.loads(line)
+            all_data.append(data)
+            total_articles += len(data.get("ranked", []))
+
+    if args.no_cache:
+        os.environ['RESOLVE_CACHE_DISABLE'] = '1'
+
+    rate = 1.0 / args.delay if args.delay else args.rate
+    print(f"Loaded {len(all_data)} WSJ items with {total_articles} ranked articles")
+    print(f"Per-host limit: {args.concurrency} in flight, {rate:g} req/s")
+    print("=" * 80)
+
+    stats = new_resolve_stats()
+    asyncio.run(resolve_all(all_data, stats, concurrency=args.concurrency, rate=rate,
+                            batch_size=args.batch_size))
+
+    # Write back atomically
+    atomic_write_jsonl(input_path, all_data)
+
+    print_resolve_summary(all_data, stats, total_articles)
+    print_resolve_cache_stats()
+
     print(f"\nUpdated: {input_path}")
 
     if args.update_db:
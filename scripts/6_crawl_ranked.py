@@ -5,29 +5,48 @@ Phase 3 · Step 1 · Crawl — Crawl resolved URLs from embedding-ranked results
 Strategy: Crawl 1 article per WSJ item, with fallback to next if failed.
 Relevance check: Compares crawled content to WSJ title using sentence embeddings.
 
+--lazy-resolve reads unresolved candidates (4_ output, 5_ not run) and
+resolves each Google News link only when the crawl cursor is about to reach
+it (plus a --prefetch window), since most backups are never tried. Resolved
+candidates are inserted into wsj_crawl_results as 5_ would insert them.
+
+Browser crawls draw from one BrowserPool with --concurrent warm browsers,
+each recycled after --browser-pages pages, instead of launching Chromium
+per URL.
+
 Usage:
-    python scripts/crawl_ranked.py [--delay N] [--from-db] [--update-db] [--concurrent N]
+    python scripts/crawl_ranked.py [--delay N] [--from-db] [--update-db] [--concurrent N] [--browser-pages K]
+    python scripts/crawl_ranked.py --lazy-resolve [--prefetch N] [--update-db]
 """
 import asyncio
+import importlib.util
 import json
 import os
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 
+import httpx
 import numpy as np
 
 # Import the crawler and LLM analysis
 sys.path.insert(0, str(Path(__file__).parent))
-from lib.crawl_article import crawl_article, extract_og_image
+from lib.crawl_article import DEFAULT_PAGES_PER_BROWSER, BrowserPool, crawl_article, extract_og_image, run_blocking
 from lib.llm_analysis import (
     analyze_content,
     analyze_content_detailed,
     save_analysis_to_db,
     save_step2_to_db,
 )
-from domain_utils import load_blocked_domains, get_supabase_client, normalize_crawl_error
+from domain_utils import BlockedDomainIndex, load_blocked_domains, get_supabase_client, normalize_crawl_error
 from lib.cost_utils import print_cost_line
+from lib.embedding_cache import encode_cached, print_embedding_cache_stats
+from lib.embedding_model import embedding_cache_id, load_embedding_model
+from lib.llm_cache import print_llm_cache_stats
+from lib.google_news_resolver import BatchExecuteBatcher, resolve_google_news_url_async
+from lib.rate_limit import HostLimiter
+from lib.resolve_cache import print_resolve_cache_stats
 
 # Use stealth mode in CI (headless), undetected locally (better evasion)
 IS_CI = os.environ.get("CI") == "true" or os.environ.get("GITHUB_ACTIONS") == "true"
@@ -41,6 +60,7 @@ RELEVANCE_CHARS = 800       # Characters from crawled content to compare
 LLM_ENABLED = bool(os.getenv("GEMINI_API_KEY"))
 
 # Lazy-load embedding model for relevance check
+RELEVANCE_MODEL = 'BAAI/bge-base-en-v1.5'
 _relevance_model = None
 
 
@@ -48,13 +68,8 @@ def _get_relevance_model():
     """Lazy-load sentence-transformer model (first call only)."""
     global _relevance_model
     if _relevance_model is None:
-        from sentence_transformers import SentenceTransformer
         print("Loading embedding model for relevance check...")
-        try:
-            _relevance_model = SentenceTransformer('BAAI/bge-base-en-v1.5', local_files_only=True)
-        except Exception:
-            print("  Local cache miss, downloading from Hub...")
-            _relevance_model = SentenceTransformer('BAAI/bge-base-en-v1.5')
+        _relevance_model = load_embedding_model(RELEVANCE_MODEL)
         print("Model loaded.\n")
     return _relevance_model
 
@@ -84,6 +99,92 @@ async def domain_rate_limit(domain: str) -> None:
         _domain_last_request[domain] = time.monotonic()
 
 
+# ============================================================
+# Lazy (just-in-time) URL resolution
+# ============================================================
+
+DEFAULT_PREFETCH = 2  # candidates resolved ahead of the crawl cursor
+
+
+@lru_cache(maxsize=None)
+def _resolve_stage():
+    """5_resolve_ranked.py as a module (apply_resolve_result, crawl_result_record)."""
+    path = Path(__file__).parent / '5_resolve_ranked.py'
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class LazyResolver:
+    """Resolves Google News links just ahead of each item's crawl cursor.
+
+    prefetch() starts resolution tasks for the next candidates; resolve()
+    waits for the one about to be crawled, writes the resolve fields onto it
+    and inserts its wsj_crawl_results row. Prefetched candidates the cursor
+    never reaches are dropped by discard() (their outcome still lands in the
+    resolve cache).
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, supabase, window: int = DEFAULT_PREFETCH):
+        self.http_client = http_client
+        self.supabase = supabase
+        self.window = max(0, window)
+        stage = _resolve_stage()
+        self.limiter = HostLimiter(concurrency=stage.DEFAULT_CONCURRENCY, rate=stage.DEFAULT_RATE)
+        self.batcher = BatchExecuteBatcher(http_client, self.limiter, max_batch=stage.DEFAULT_BATCH_SIZE)
+        self.stats = stage.new_resolve_stats()
+        self.requested = 0
+        self.unused = 0
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    @staticmethod
+    def needs_resolve(article: dict) -> bool:
+        return not article.get("resolved_url") and bool(article.get("link"))
+
+    def prefetch(self, articles: list[dict]) -> None:
+        for article in articles:
+            if self.needs_resolve(article) and id(article) not in self._tasks:
+                self.requested += 1
+                self._tasks[id(article)] = asyncio.create_task(
+                    resolve_google_news_url_async(article["link"], self.http_client, self.limiter, self.batcher)
+                )
+
+    async def resolve(self, article: dict, wsj: dict, attempt_order: int, weighted: float) -> bool:
+        """Resolve article (if needed) and record it. True if it has a URL to crawl."""
+        if not self.needs_resolve(article):
+            return bool(article.get("resolved_url"))
+        self.prefetch([article])
+        result = await self._tasks.pop(id(article))
+        _resolve_stage().apply_resolve_result(article, result, self.stats)
+
+        if self.supabase:
+            record = _resolve_stage().crawl_result_record(wsj, article)
+            if record is not None:
+                record['attempt_order'] = attempt_order
+                record['weighted_score'] = round(weighted, 4)
+                await run_blocking(_resolve_stage().insert_crawl_result, self.supabase, record)
+        return article.get("resolve_status") == "success"
+
+    def discard(self, articles: list[dict]) -> None:
+        """Cancel prefetches for candidates that won't be crawled."""
+        for article in articles:
+            task = self._tasks.pop(id(article), None)
+            if task is not None:
+                task.cancel()
+                self.unused += 1
+
+    def print_summary(self, total_candidates: int) -> None:
+        s = self.stats
+        used = s["resolved"] + s["passthrough"] + s["failed"]
+        print(f"Lazy resolve: {used} of {total_candidates} candidates resolved "
+              f"({s['resolved']} resolved, {s['passthrough']} passthrough, {s['failed']} failed, "
+              f"{s['cache_hits']} from cache); {self.unused} prefetched but unused")
+        if self.batcher.ids:
+            print(f"  Batchexecute: {self.batcher.ids} IDs in {self.batcher.posts} POSTs")
+        print_resolve_cache_stats()
+
+
 def compute_relevance_score(wsj_text: str, crawled_text: str) -> float:
     """Compute cosine similarity between WSJ and crawled content.
 
@@ -101,8 +202,10 @@ def compute_relevance_score(wsj_text: str, crawled_text: str) -> float:
     crawled_truncated = crawled_text[:RELEVANCE_CHARS]
 
     # Encode both texts
-    embeddings = _get_relevance_model().encode(
+    embeddings = encode_cached(
+        _get_relevance_model(),
         [wsj_text, crawled_truncated],
+        model_name=embedding_cache_id(RELEVANCE_MODEL),
         normalize_embeddings=True
     )
 
@@ -282,11 +385,16 @@ async def process_wsj_item(
     delay: float,
     supabase,
     domain_stats: dict,
-    run_blocked: set,
+    run_blocked: BlockedDomainIndex,
     semaphore: asyncio.Semaphore,
+    browser_pool: BrowserPool | None = None,
+    lazy: LazyResolver | None = None,
 ) -> dict:
     """Process a single WSJ item: crawl candidates until one succeeds.
 
+    With lazy, unresolved candidates are ranked by their Google News source
+    domain and resolved just before they are tried.
+
     Returns dict with keys: success (bool), attempts (int),
     llm_input_tokens (int), llm_output_tokens (int), llm_calls (int).
     Shared state (run_blocked) is mutated in-place (safe in asyncio single-thread).
@@ -298,14 +406,17 @@ async def process_wsj_item(
         wsj_text = f"{wsj_title} {wsj_description}".strip()
         articles = data.get("ranked", [])
 
-        # Filter to articles with resolved URLs
-        crawlable = [a for a in articles if a.get("resolved_url")]
+        # Filter to articles with resolved URLs (or resolvable links in lazy mode)
+        crawlable = [
+            a for a in articles
+            if a.get("resolved_url") or (lazy is not None and lazy.needs_resolve(a))
+        ]
 
         # Sort by weighted score: 50% embedding + 25% wilson + 25% llm quality
         # Defaults for unknown/insufficient-data domains: wilson=0.4, llm=5.0
         def weighted_score(article):
             emb = article.get("embedding_score") or 0.5
-            domain = article.get("resolved_domain", "")
+            domain = article.get("resolved_domain") or article.get("source_domain", "")
             d = domain_stats.get(domain, {})
             raw_w = d.get("wilson_score")
             raw_l = d.get("avg_llm_score")
@@ -348,6 +459,13 @@ async def process_wsj_item(
         s2_output_tokens = 0
         s2_calls = 0
         for j, article in enumerate(crawlable):
+            if lazy is not None:
+                lazy.prefetch(crawlable[j:j + 1 + lazy.window])
+                if not await lazy.resolve(article, wsj, attempt_order=j + 1, weighted=weighted_score(article)):
+                    print(f"  Skipping [{j+1}/{len(crawlable)}]: {article.get('source', '')} "
+                          f"(resolve {article.get('resolve_reason_code', 'failed')})")
+                    continue
+
             url = article["resolved_url"]
             domain = article.get("resolved_domain", "")
             w_score = weighted_score(article)
@@ -370,7 +488,8 @@ async def process_wsj_item(
 
             try:
                 result = await asyncio.wait_for(
-                    crawl_article(url, mode=CRAWL_MODE, blocked_domains=run_blocked),
+                    crawl_article(url, mode=CRAWL_MODE, blocked_domains=run_blocked,
+                                  browser_pool=browser_pool),
                     timeout=90
                 )
 
@@ -480,9 +599,9 @@ async def process_wsj_item(
 
                     # Fallback: if no image from crawl, try remaining candidates for og:image
                     if not article.get("top_image"):
-                        remaining = crawlable[j + 1:]
+                        remaining = [c for c in crawlable[j + 1:] if c.get("resolved_url")]
                         for candidate in remaining[:5]:
-                            img = extract_og_image(candidate["resolved_url"])
+                            img = await run_blocking(extract_og_image, candidate["resolved_url"])
                             if img:
                                 article["top_image"] = img
                                 print(f"    → Image from {candidate.get('resolved_domain')}")
@@ -563,6 +682,9 @@ async def process_wsj_item(
             if j < len(crawlable) - 1:
                 await asyncio.sleep(delay)
 
+        if lazy is not None:
+            lazy.discard(crawlable)
+
         if not success:
             print("  → All candidates failed")
 
@@ -584,11 +706,20 @@ async def main():
     parser.add_argument('--delay', type=float, default=1.5, help='Delay between requests in seconds')
     parser.add_argument('--from-db', action='store_true', help='Load pending items from database (implies --update-db)')
     parser.add_argument('--update-db', action='store_true', help='Save crawl results to Supabase')
-    parser.add_argument('--concurrent', type=int, default=1, help='Max concurrent WSJ items')
+    parser.add_argument('--concurrent', type=int, default=1, help='Max concurrent WSJ items (also warm browsers)')
+    parser.add_argument('--browser-pages', type=int, default=DEFAULT_PAGES_PER_BROWSER,
+                        help='Pages per browser before it is recycled')
+    parser.add_argument('--lazy-resolve', action='store_true',
+                        help='Resolve Google News links just before crawling them (file mode, skips 5_)')
+    parser.add_argument('--prefetch', type=int, default=DEFAULT_PREFETCH,
+                        help='Candidates resolved ahead of the crawl cursor (with --lazy-resolve)')
     args = parser.parse_args()
 
     if args.from_db:
         args.update_db = True
+    if args.lazy_resolve and args.from_db:
+        print("Error: --lazy-resolve reads ranked results from file; it can't be combined with --from-db")
+        return
 
     delay = args.delay
     from_db = args.from_db
@@ -629,8 +760,8 @@ async def main():
     if blocked_domains:
         print(f"Loaded {len(blocked_domains)} blocked domains (will skip newspaper4k)")
 
-    # In-memory set for tracking domains that fail during this run
-    run_blocked = set(blocked_domains)
+    # In-memory index for tracking domains that fail during this run
+    run_blocked = BlockedDomainIndex(blocked_domains)
 
     # Load data from DB or file
     if from_db:
@@ -662,21 +793,29 @@ async def main():
     # Process items (parallel with semaphore, or sequential when concurrent=1)
     semaphore = asyncio.Semaphore(concurrent)
 
-    tasks = [
-        process_wsj_item(
-            idx=i,
-            total=len(all_data),
-            data=data,
-            delay=delay,
-            supabase=supabase,
-            domain_stats=domain_stats,
-            run_blocked=run_blocked,
-            semaphore=semaphore,
-        )
-        for i, data in enumerate(all_data)
-    ]
-
-    results = await asyncio.gather(*tasks)
+    async with httpx.AsyncClient(timeout=30.0) as resolve_client, \
+            BrowserPool(size=concurrent, max_pages=args.browser_pages) as browser_pool:
+        lazy = LazyResolver(resolve_client, supabase, window=args.prefetch) if args.lazy_resolve else None
+        if lazy is not None:
+            print(f"Lazy resolve: on (prefetch {lazy.window})")
+
+        tasks = [
+            process_wsj_item(
+                idx=i,
+                total=len(all_data),
+                data=data,
+                delay=delay,
+                supabase=supabase,
+                domain_stats=domain_stats,
+                run_blocked=run_blocked,
+                semaphore=semaphore,
+                browser_pool=browser_pool,
+                lazy=lazy,
+            )
+            for i, data in enumerate(all_data)
+        ]
+
+        results = await asyncio.gather(*tasks)
 
     wsj_success = sum(1 for r in results if r["success"])
     wsj_failed = sum(1 for r in results if not r["success"])
@@ -759,6 +898,11 @@ async def main():
             calls=total_s2_calls,
         )
         print(f"Estimated total: ${cost1 + cost2:.4f}")
+    print_llm_cache_stats()
+    print_embedding_cache_stats()
+    browser_pool.print_stats()
+    if lazy is not None:
+        lazy.print_summary(sum(len(d.get("ranked", [])) for d in all_data))
 
     if from_db:
         print("\nResults saved to database.")
@@ -37,6 +37,10 @@ from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 from supabase import create_client, Client
 
+from lib.embedding_cache import encode_cached, print_embedding_cache_stats
+from lib.embedding_model import DEFAULT_TOKEN_BUDGET, embedding_cache_id, load_embedding_model
+from lib.llm_cache import generate_content_cached, print_llm_cache_stats
+
 load_dotenv(Path(__file__).parent.parent / '.env.local')
 
 # ============================================================
@@ -45,7 +49,8 @@ load_dotenv(Path(__file__).parent.parent / '.env.local')
 
 EMBEDDING_MODEL = 'BAAI/bge-base-en-v1.5'
 EMBEDDING_DIM = 768
-BATCH_SIZE = 100
+BATCH_SIZE = 100                   # Rows per wsj_embeddings upsert
+EMBED_TOKEN_BUDGET = DEFAULT_TOKEN_BUDGET  # Padded tokens per encode batch (length-bucketed)
 
 # LLM Judge (Step A)
 CANDIDATE_THRESHOLD = 0.40         # Loose cosine pre-filter for LLM Judge candidates
@@ -89,18 +94,16 @@ def get_embedding_model() -> SentenceTransformer:
     global _model
     if _model is None:
         print(f"Loading embedding model: {EMBEDDING_MODEL}")
-        try:
-            _model = SentenceTransformer(EMBEDDING_MODEL, local_files_only=True)
-        except Exception:
-            print("  Local cache miss, downloading from Hub...")
-            _model = SentenceTransformer(EMBEDDING_MODEL)
+        _model = load_embedding_model(EMBEDDING_MODEL)
     return _model
 
 
 def embed_texts(texts: list[str]) -> np.ndarray:
-    """Embed a list of texts. Returns (N, 768) array."""
+    """Embed a list of texts in length-bucketed batches. Returns (N, 768) array."""
     model = get_embedding_model()
-    return model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+    return encode_cached(model, texts, model_name=embedding_cache_id(EMBEDDING_MODEL),
+                         normalize_embeddings=True, token_budget=EMBED_TOKEN_BUDGET,
+                         show_progress_bar=False)
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -126,7 +129,8 @@ def _call_gemini_json(prompt: str, model: str) -> Optional[dict]:
     client = genai.Client(api_key=api_key)
 
     try:
-        response = client.models.generate_content(
+        response = generate_content_cached(
+            client,
             model=model,
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -256,12 +260,14 @@ def embed_articles(supabase: Client, dry_run: bool = False) -> int:
             parts.append(summary)
         texts.append(' '.join(parts))
 
+    # Encode everything at once so batches are bucketed by length across the
+    # whole run (titles with titles, long summaries with long summaries)
+    all_embeddings = embed_texts(texts)
+
     total_saved = 0
     for i in range(0, len(articles), BATCH_SIZE):
         batch_articles = articles[i:i + BATCH_SIZE]
-        batch_texts = texts[i:i + BATCH_SIZE]
-
-        embeddings = embed_texts(batch_texts)
+        embeddings = all_embeddings[i:i + BATCH_SIZE]
 
         if dry_run:
             total_saved += len(batch_articles)
@@ -912,7 +918,8 @@ STRICT RULES:
 - Only create groups with 2+ articles"""
 
     try:
-        response = client.models.generate_content(
+        response = generate_content_cached(
+            client,
             model="gemini-2.5-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -1487,6 +1494,8 @@ def main():
         print(f"  [TIMING] parents: {time.time() - t0:.1f}s")
 
     print("\n" + "=" * 60)
+    print_llm_cache_stats()
+    print_embedding_cache_stats()
     print("Done.")
 
 
@@ -29,6 +29,7 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from lib.cost_utils import COST_PER_1M
+from lib.llm_cache import generate_content_cached, get_llm_cache
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -466,7 +467,8 @@ def _try_curation(gemini, model: str, config, curation_input: str, label: str):
     """Attempt curation with given model. Returns (raw_text, response) or (None, None)."""
 
     try:
-        resp = gemini.models.generate_content(
+        resp = generate_content_cached(
+            gemini,
             model=model,
             contents=curation_input,
             config=config,
@@ -1891,6 +1893,9 @@ def print_cost_summary(cost: CostTracker) -> None:
         log.info("EN TTS (Chirp 3 HD): %s chars", f"{cost.en_tts_chars:,}")
     if cost.ko_tts_chars:
         log.info("KO TTS (Chirp 3 HD): %s chars", f"{cost.ko_tts_chars:,}")
+    cache = get_llm_cache()
+    if cache and (cache.hits or cache.misses):
+        log.info("LLM cache: %d hits / %d misses", cache.hits, cache.misses)
     log.info("-" * 50)
     log.info("Estimated total: $%.4f", cost.total_usd())
     log.info("=" * 50)
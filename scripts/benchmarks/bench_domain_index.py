@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark · Blocked-domain checks — linear scans vs BlockedDomainIndex.
+
+Builds a synthetic blocked list (thousands of domains, with subdomain
+entries) and a lookup mix of blocked, subdomain-of-blocked, parent-of-blocked
+and clean domains, then times:
+  - substring scan   old domain_utils.is_blocked_domain (both directions)
+  - parent walk      old 3_wsj_to_google_news._is_domain_blocked on a frozenset
+  - index.overlaps / index.contains_domain   the suffix index replacing them
+
+Disagreements with the substring scan are reported: the index matches whole
+labels only, so e.g. a blocked 'ft.com' no longer blocks 'microsoft.com'.
+
+Usage:
+    python scripts/benchmarks/bench_domain_index.py
+    python scripts/benchmarks/bench_domain_index.py --blocked 20000 --lookups 50000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from domain_utils import BlockedDomainIndex
+
+TLDS = ['com', 'net', 'org', 'co.uk', 'io', 'news']
+
+
+def substring_scan(domain: str, blocked_domains: set[str]) -> bool:
+    """Previous domain_utils.is_blocked_domain."""
+    if not domain or not blocked_domains:
+        return False
+    domain_lower = domain.lower()
+    for blocked in blocked_domains:
+        blocked_lower = blocked.lower()
+        if blocked_lower in domain_lower or domain_lower in blocked_lower:
+            return True
+    return False
+
+
+def parent_walk(domain: str, blocked_domains: frozenset[str]) -> bool:
+    """Previous 3_wsj_to_google_news._is_domain_blocked."""
+    if not domain:
+        return False
+    domain_lower = domain.lower()
+    if domain_lower in blocked_domains:
+        return True
+    parts = domain_lower.split('.')
+    for i in range(1, len(parts) - 1):
+        if '.'.join(parts[i:]) in blocked_domains:
+            return True
+    return False
+
+
+def synthetic_blocked(n: int, rng: random.Random) -> list[str]:
+    out = []
+    for i in range(n):
+        base = f"site{i}.{rng.choice(TLDS)}"
+        out.append(base if i % 5 else f"{rng.choice(['news', 'finance', 'm'])}.{base}")
+    return out
+
+
+def synthetic_lookups(blocked: list[str], n: int, rng: random.Random) -> list[str]:
+    out = []
+    for i in range(n):
+        d = rng.choice(blocked)
+        kind = i % 4
+        if kind == 0:
+            out.append(d)                                  # exact
+        elif kind == 1:
+            out.append(f"www.{d}")                         # subdomain of blocked
+        elif kind == 2:
+            out.append(d.split('.', 1)[1] if d.count('.') > 1 else f"ca.{d}")
+        else:
+            out.append(f"clean{i}.{rng.choice(TLDS)}")     # not blocked
+    return out
+
+
+def timed(fn, lookups, blocked, repeat: int) -> tuple[float, list[bool]]:
+    best = float('inf')
+    results = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = [fn(d, blocked) for d in lookups]
+        best = min(best, time.perf_counter() - t0)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocked-domain lookups")
+    parser.add_argument('--blocked', type=int, default=5_000, help='Number of blocked domains')
+    parser.add_argument('--lookups', type=int, default=10_000, help='Domains checked per run')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs (best is reported)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    blocked = synthetic_blocked(args.blocked, rng)
+    lookups = synthetic_lookups(blocked, args.lookups, rng)
+
+    t0 = time.perf_counter()
+    index = BlockedDomainIndex(blocked)
+    build = time.perf_counter() - t0
+    print(f"{args.blocked:,} blocked domains, {args.lookups:,} lookups "
+          f"(index built in {build * 1000:.1f} ms)\n")
+
+    rows = [
+        ('substring scan', substring_scan, set(blocked)),
+        ('index.overlaps', lambda d, idx: idx.overlaps(d), index),
+        ('parent walk', parent_walk, frozenset(blocked)),
+        ('index.contains_domain', lambda d, idx: idx.contains_domain(d), index),
+    ]
+    print(f"{'method':<24} {'total s':>9} {'µs/lookup':>10} {'blocked':>8}")
+    print("-" * 55)
+    results = {}
+    for name, fn, data in rows:
+        elapsed, out = timed(fn, lookups, data, args.repeat)
+        results[name] = out
+        print(f"{name:<24} {elapsed:>9.3f} {elapsed / len(lookups) * 1e6:>10.2f} {sum(out):>8,}")
+
+    walk_diff = sum(a != b for a, b in zip(results['parent walk'], results['index.contains_domain']))
+    scan_diff = [d for d, a, b in zip(lookups, results['substring scan'], results['index.overlaps']) if a != b]
+    print(f"\nparent walk vs contains_domain: {walk_diff} disagreements")
+    print(f"substring scan vs overlaps: {len(scan_diff)} disagreements (label-boundary matches only)")
+    for d in scan_diff[:5]:
+        print(f"  e.g. {d}")
+
+
+if __name__ == "__main__":
+    main()
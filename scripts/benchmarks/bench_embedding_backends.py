@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark · Embedding backends — torch vs onnx vs onnx-int8 for bge-base.
+
+Encodes WSJ headlines/descriptions from scripts/data/wsj-tech-rss.xml
+(repeated to --sentences) on each backend in its own subprocess, and reports
+sentences/sec and peak RSS. Parity against the torch vectors is reported as
+the per-sentence cosine between backends (min / mean) and the largest change
+in a query↔candidate similarity score, which is what the rank and relevance
+thresholds actually see.
+
+Usage:
+    python scripts/benchmarks/bench_embedding_backends.py
+    python scripts/benchmarks/bench_embedding_backends.py --backends torch onnx-int8 --sentences 2000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.embedding_model import BACKENDS, load_local_embedding_model, loaded_backend
+from lib.rss_stream import iter_rss_items
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'data' / 'wsj-tech-rss.xml'
+MODEL_NAME = 'BAAI/bge-base-en-v1.5'
+
+
+def load_sentences(n: int) -> list[str]:
+    base = []
+    for item in iter_rss_items(FIXTURE.read_bytes()):
+        base.append(item.get('title', ''))
+        base.append(f"{item.get('title', '')} {item.get('description', '')}")
+    base = [s for s in base if s.strip()]
+    return [base[i % len(base)] for i in range(n)]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024  # bytes on macOS, KiB on Linux
+
+
+def run_worker(backend: str, sentences: int, batch_size: int, out_path: str) -> None:
+    """Child process: load one backend, encode, save vectors, print stats as JSON."""
+    texts = load_sentences(sentences)
+    t0 = time.perf_counter()
+    model = load_local_embedding_model(MODEL_NAME, backend=backend)
+    load_s = time.perf_counter() - t0
+
+    model.encode(texts[:batch_size], normalize_embeddings=True, batch_size=batch_size)  # warm-up
+
+    t0 = time.perf_counter()
+    vecs = model.encode(texts, normalize_embeddings=True, batch_size=batch_size, show_progress_bar=False)
+    elapsed = time.perf_counter() - t0
+
+    np.save(out_path, np.asarray(vecs, dtype=np.float32))
+    print(json.dumps({
+        'backend': loaded_backend(MODEL_NAME),
+        'load_s': load_s,
+        'sentences_per_s': len(texts) / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def parity(reference: np.ndarray, other: np.ndarray) -> dict:
+    per_sentence = np.sum(reference * other, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(other, axis=1)
+    )
+    # Score drift: similarity of every sentence to the first 50 "queries"
+    q = min(50, len(reference))
+    score_delta = np.abs(reference @ reference[:q].T - other @ other[:q].T)
+    return {
+        'cos_min': float(per_sentence.min()),
+        'cos_mean': float(per_sentence.mean()),
+        'score_delta_max': float(score_delta.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bge-base embedding backends")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--sentences', type=int, default=1000, help='Sentences encoded per backend')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--worker', choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.sentences, args.batch_size, args.out)
+        return
+
+    results = {}
+    vectors = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            out = str(Path(tmp) / f"{backend}.npy")
+            proc = subprocess.run(
+                [sys.executable, __file__, '--worker', backend, '--out', out,
+                 '--sentences', str(args.sentences), '--batch-size', str(args.batch_size)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}: failed\n{proc.stderr.strip()[-500:]}")
+                continue
+            stats = json.loads(proc.stdout.strip().splitlines()[-1])
+            if stats['backend'] != backend:
+                print(f"{backend}: unavailable, fell back to {stats['backend']} (skipped)")
+                continue
+            results[backend] = stats
+            vectors[backend] = np.load(out)
+
+    print(f"\n{args.sentences:,} sentences, batch size {args.batch_size}\n")
+    print(f"{'backend':<10} {'load s':>7} {'sent/s':>9} {'peak RSS MB':>12} "
+          f"{'cos min':>8} {'cos mean':>9} {'max Δscore':>11}")
+    print("-" * 72)
+    reference = vectors.get('torch')
+    for backend, stats in results.items():
+        if reference is not None and backend != 'torch':
+            p = parity(reference, vectors[backend])
+            drift = f"{p['cos_min']:>8.4f} {p['cos_mean']:>9.5f} {p['score_delta_max']:>11.4f}"
+        else:
+            drift = f"{'-':>8} {'-':>9} {'-':>11}"
+        print(f"{backend:<10} {stats['load_s']:>7.1f} {stats['sentences_per_s']:>9.1f} "
+              f"{stats['peak_rss_mb']:>12.0f} {drift}")
+    if reference is None:
+        print("\n(torch not run — no parity reference)")
+
+
+if __name__ == "__main__":
+    main()
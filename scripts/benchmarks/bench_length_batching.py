@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark · Embedding batching — fixed-size slices vs length-bucketed batches.
+
+Builds a 7_embed_and_thread-style mix from scripts/data/wsj-tech-rss.xml:
+bare titles, title + description, and title + description + a long
+summary (several descriptions joined, standing in for crawled summaries),
+shuffled as they come out of the DB. Then compares padded tokens (what the
+transformer actually computes over) for:
+  - fixed 100      BATCH_SIZE=100 slices in input order, padded to each slice's longest
+  - fixed 100/st   same slices, sorted + sub-batched at 32 inside each encode
+                   call (what sentence-transformers does on its own)
+  - bucketed       lib.embedding_model.plan_token_batches over the whole run
+
+With --encode, also times both paths on the real model and checks that the
+vectors match.
+
+Usage:
+    python scripts/benchmarks/bench_length_batching.py
+    python scripts/benchmarks/bench_length_batching.py --texts 5000 --token-budget 8192 --encode
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.embedding_model import (
+    DEFAULT_TOKEN_BUDGET, MAX_BUCKET_SIZE, encode_length_bucketed,
+    load_local_embedding_model, plan_token_batches, token_lengths,
+)
+from lib.rss_stream import iter_rss_items
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'data' / 'wsj-tech-rss.xml'
+MODEL_NAME = 'BAAI/bge-base-en-v1.5'
+FIXED_BATCH = 100       # 7_embed_and_thread BATCH_SIZE
+ST_BATCH = 32           # SentenceTransformer.encode default batch_size
+
+
+def load_texts(n: int, rng: random.Random) -> list[str]:
+    items = [(i.get('title', ''), i.get('description', '')) for i in iter_rss_items(FIXTURE.read_bytes())]
+    items = [(t, d) for t, d in items if t]
+    descriptions = [d for _, d in items if d]
+    texts = []
+    for k in range(n):
+        title, desc = items[k % len(items)]
+        kind = rng.random()
+        if kind < 0.3:
+            texts.append(title)
+        elif kind < 0.7:
+            texts.append(f"{title} {desc}")
+        else:
+            summary = ' '.join(rng.sample(descriptions, min(len(descriptions), rng.randint(3, 8))))
+            texts.append(f"{title} {desc} {summary}")
+    rng.shuffle(texts)
+    return texts
+
+
+def load_tokenizer(use_model: bool):
+    """Real tokenizer if the model files are cached locally, else None (word-count estimate)."""
+    if use_model:
+        return None
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(MODEL_NAME, local_files_only=True)
+    except Exception:
+        return None
+
+
+def padded_fixed(lengths: list[int], sort_within: bool) -> int:
+    total = 0
+    for i in range(0, len(lengths), FIXED_BATCH):
+        chunk = lengths[i:i + FIXED_BATCH]
+        if sort_within:
+            chunk = sorted(chunk, reverse=True)
+            total += sum(len(chunk[j:j + ST_BATCH]) * chunk[j] for j in range(0, len(chunk), ST_BATCH))
+        else:
+            total += len(chunk) * max(chunk)
+    return total
+
+
+def padded_bucketed(lengths: list[int], budget: int, max_batch: int) -> tuple[int, int]:
+    batches = plan_token_batches(lengths, budget, max_batch)
+    return sum(len(b) * lengths[b[0]] for b in batches), len(batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark length-bucketed embedding batches")
+    parser.add_argument('--texts', type=int, default=2000, help='Texts in the run')
+    parser.add_argument('--token-budget', type=int, default=DEFAULT_TOKEN_BUDGET)
+    parser.add_argument('--max-batch', type=int, default=MAX_BUCKET_SIZE)
+    parser.add_argument('--encode', action='store_true', help='Also time both paths on the real model')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts, random.Random(args.seed))
+    model = load_local_embedding_model(MODEL_NAME) if args.encode else None
+    tokenizer = model if model is not None else load_tokenizer(args.encode)
+    lengths = token_lengths(tokenizer, texts)
+    source = 'tokenizer' if tokenizer is not None else 'word-count estimate'
+
+    real = sum(lengths)
+    print(f"{len(texts):,} texts, {real:,} real tokens ({source}); "
+          f"lengths min/median/max {min(lengths)}/{int(np.median(lengths))}/{max(lengths)}\n")
+
+    bucketed, n_batches = padded_bucketed(lengths, args.token_budget, args.max_batch)
+    rows = [
+        (f'fixed {FIXED_BATCH}', padded_fixed(lengths, sort_within=False), -(-len(texts) // FIXED_BATCH)),
+        (f'fixed {FIXED_BATCH}/st', padded_fixed(lengths, sort_within=True), None),
+        (f'bucketed ({args.token_budget})', bucketed, n_batches),
+    ]
+    print(f"{'batching':<20} {'padded tokens':>14} {'padding %':>10} {'batches':>8}")
+    print("-" * 56)
+    for name, padded, batches in rows:
+        print(f"{name:<20} {padded:>14,} {(padded - real) / padded * 100:>9.1f}% "
+              f"{batches if batches is not None else '-':>8}")
+
+    if model is None:
+        return
+
+    model.encode(texts[:ST_BATCH], normalize_embeddings=True)  # warm-up
+    t0 = time.perf_counter()
+    fixed = np.concatenate([
+        np.asarray(model.encode(texts[i:i + FIXED_BATCH], normalize_embeddings=True, show_progress_bar=False))
+        for i in range(0, len(texts), FIXED_BATCH)
+    ])
+    t_fixed = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    bucket = encode_length_bucketed(model, texts, max_tokens=args.token_budget, max_batch=args.max_batch)
+    t_bucket = time.perf_counter() - t0
+
+    print(f"\nfixed {FIXED_BATCH}: {t_fixed:.1f}s ({len(texts) / t_fixed:.0f} texts/s)")
+    print(f"bucketed:  {t_bucket:.1f}s ({len(texts) / t_bucket:.0f} texts/s)  "
+          f"speedup {t_fixed / t_bucket:.2f}x")
+    print(f"max |Δ| between vectors: {np.abs(fixed - bucket).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark · RSS parsing — full-tree ET.fromstring vs streaming iter_rss_items.
+
+Replays scripts/data/wsj-tech-rss.xml plus synthetic 10k-item WSJ-style and
+Google-News-style feeds, and reports items/sec and peak traced memory for
+the old (fromstring + findall) and new (iterparse) parsers.
+
+Usage:
+    python scripts/benchmarks/bench_rss_parser.py
+    python scripts/benchmarks/bench_rss_parser.py --items 50000 --repeat 3
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.rss_stream import iter_rss_items
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'data' / 'wsj-tech-rss.xml'
+
+# Same list as 1_wsj_ingest.SKIP_URL_PATHS (module name starts with a digit)
+SKIP_URL_PATHS = frozenset([
+    '/lifestyle/', '/real-estate/', '/arts/', '/health/', '/style/',
+    '/livecoverage/', '/arts-culture/', '/buyside/', '/sports/', '/opinion/',
+])
+
+WSJ_SECTIONS = ['tech', 'finance', 'economy', 'politics', 'world', 'lifestyle', 'opinion']
+
+
+def _text(el) -> str:
+    return (el.text or "").strip() if el is not None else ""
+
+
+def parse_tree(xml: bytes, skip_url_paths=()) -> list[dict]:
+    """Previous implementation: build the whole tree, then walk it."""
+    root = ET.fromstring(xml)
+    ns = {'dc': 'http://purl.org/dc/elements/1.1/'}
+    out = []
+    for item in root.findall('.//item'):
+        link = _text(item.find('link'))
+        if any(p in link for p in skip_url_paths):
+            continue
+        source_el = item.find('source')
+        out.append({
+            'title': _text(item.find('title')),
+            'link': link,
+            'description': _text(item.find('description')),
+            'pubDate': _text(item.find('pubDate')),
+            'creator': _text(item.find('dc:creator', ns)),
+            'source': _text(source_el),
+            'source_url': source_el.attrib.get('url', '') if source_el is not None else '',
+        })
+    return out
+
+
+def parse_stream(xml: bytes, skip_url_paths=()) -> list[dict]:
+    return list(iter_rss_items(xml, skip_url_paths=skip_url_paths))
+
+
+def synthetic_wsj_feed(n: int) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:media="http://search.yahoo.com/mrss/" version="2.0"><channel>'
+        '<title>Synthetic - WSJ.com</title>'
+    ]
+    for i in range(n):
+        section = WSJ_SECTIONS[i % len(WSJ_SECTIONS)]
+        parts.append(
+            f'<item><guid isPermaLink="false">WP-WSJ-{i:010d}</guid>'
+            f'<title>Synthetic headline number {i} about markets and chips</title>'
+            f'<description>{escape("Description text " * 12)}{i}</description>'
+            f'<link>https://www.wsj.com/{section}/synthetic-article-{i:06d}?mod=rss</link>'
+            f'<pubDate>Mon, 12 Jan 2026 04:00:00 GMT</pubDate>'
+            f'<dc:creator>Author {i % 97}</dc:creator>'
+            f'<media:content url="https://images.wsj.net/im-{i}" medium="image">'
+            f'<media:credit>Credit {i}</media:credit></media:content></item>'
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode()
+
+
+def synthetic_google_news_feed(n: int) -> bytes:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Google News</title>']
+    for i in range(n):
+        parts.append(
+            f'<item><title>Synthetic result {i} - Publisher {i % 50}</title>'
+            f'<link>https://news.google.com/rss/articles/CBMi{i:012d}?oc=5</link>'
+            f'<guid isPermaLink="false">CBMi{i:012d}</guid>'
+            f'<pubDate>Mon, 12 Jan 2026 04:00:00 GMT</pubDate>'
+            f'<description>{escape("<a href=x>snippet</a> " * 4)}</description>'
+            f'<source url="https://www.publisher{i % 50}.com">Publisher {i % 50}</source></item>'
+        )
+    parts.append('</channel></rss>')
+    return ''.join(parts).encode()
+
+
+def measure(parser, xml: bytes, repeat: int, skip_url_paths) -> tuple[int, float, int]:
+    """Return (items, best items/sec, peak bytes)."""
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        count = len(parser(xml, skip_url_paths))
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    parser(xml, skip_url_paths)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, count / best if best else 0.0, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-tree vs streaming RSS parsing")
+    parser.add_argument('--items', type=int, default=10_000, help='Items per synthetic feed')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per parser (best is reported)')
+    args = parser.parse_args()
+
+    feeds = [
+        ('wsj-tech-rss.xml', FIXTURE.read_bytes(), SKIP_URL_PATHS),
+        (f'synthetic WSJ ({args.items:,})', synthetic_wsj_feed(args.items), SKIP_URL_PATHS),
+        (f'synthetic Google News ({args.items:,})', synthetic_google_news_feed(args.items), ()),
+    ]
+
+    print(f"{'feed':<32} {'parser':<8} {'items':>7} {'items/sec':>12} {'peak MB':>9}")
+    print("-" * 72)
+    for name, xml, skip in feeds:
+        results = {}
+        for label, fn in (('tree', parse_tree), ('stream', parse_stream)):
+            results[label] = measure(fn, xml, args.repeat, skip)
+            count, rate, peak = results[label]
+            print(f"{name:<32} {label:<8} {count:>7,} {rate:>12,.0f} {peak / 1e6:>9.2f}")
+        if results['tree'][0] != results['stream'][0]:
+            print(f"  WARNING: item count mismatch ({results['tree'][0]} vs {results['stream'][0]})")
+        print(f"  input {len(xml) / 1e6:.2f} MB, peak memory ratio "
+              f"{results['tree'][2] / max(results['stream'][2], 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ Used across multiple phases:
 
 Library exports (imported by other scripts):
 - get_supabase_client() / require_supabase_client() — DB client
-- load_blocked_domains() / is_blocked_domain() — domain filtering
+- load_blocked_domains() / BlockedDomainIndex / is_blocked_domain() — domain filtering
 - wilson_lower_bound() — auto-blocking score
 
 All blocked domains are managed in the wsj_domain_status table.
@@ -93,13 +93,83 @@ def load_blocked_domains(supabase=None) -> set[str]:
     return blocked
 
 
-def is_blocked_domain(domain: str, blocked_domains: set[str]) -> bool:
+class BlockedDomainIndex:
+    """
+    Label-suffix index over blocked domains, built once per run.
+
+    Every blocked entry is stored along with each of its label suffixes
+    ('ca.finance.yahoo.com' → 'finance.yahoo.com', 'yahoo.com', 'com'), so
+    both lookups cost one hash probe per label of the queried domain instead
+    of a scan over the whole blocked set. Matching is on whole labels:
+    'ft.com' blocks 'www.ft.com' but not 'microsoft.com'.
+
+    Supports add() so callers can block domains that fail mid-run, and
+    iterates/len()s like the set it replaces.
+    """
+
+    def __init__(self, domains=()):
+        self._entries: set[str] = set()
+        self._suffixes: set[str] = set()
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain: str) -> None:
+        domain = (domain or '').strip().lower()
+        if not domain or domain in self._entries:
+            return
+        self._entries.add(domain)
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            self._suffixes.add('.'.join(parts[i:]))
+
+    def contains_domain(self, domain: str) -> bool:
+        """True if domain, or a parent domain of at least two labels, is blocked.
+
+        'ca.finance.yahoo.com' matches a blocked 'yahoo.com'.
+        """
+        if not domain or not self._entries:
+            return False
+        domain = domain.lower()
+        if domain in self._entries:
+            return True
+        parts = domain.split('.')
+        for i in range(1, len(parts) - 1):
+            if '.'.join(parts[i:]) in self._entries:
+                return True
+        return False
+
+    def overlaps(self, domain: str) -> bool:
+        """True if domain is blocked, under a blocked parent, or a parent of a blocked entry.
+
+        'yahoo.com' overlaps a blocked 'finance.yahoo.com'.
+        """
+        if not domain or not self._entries:
+            return False
+        return self.contains_domain(domain) or domain.lower() in self._suffixes
+
+    def __contains__(self, domain: str) -> bool:
+        return (domain or '').lower() in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def is_blocked_domain(domain: str, blocked_domains: BlockedDomainIndex) -> bool:
     """
     Check if domain is in blocked list.
 
+    Matches whole labels in either direction: the domain is blocked if it
+    equals, is a subdomain of, or is a parent of a blocked entry. (The old
+    substring scan also matched across labels, e.g. 'ft.com' in
+    'microsoft.com'; see scripts/tests/test_domain_index.py.)
+
     Args:
         domain: Domain to check
-        blocked_domains: Set of blocked domains
+        blocked_domains: BlockedDomainIndex, built once per run
+            (BlockedDomainIndex(load_blocked_domains()))
 
     Returns:
         True if domain is blocked
@@ -107,13 +177,11 @@ def is_blocked_domain(domain: str, blocked_domains: set[str]) -> bool:
     if not domain or not blocked_domains:
         return False
 
-    domain_lower = domain.lower()
-    for blocked in blocked_domains:
-        blocked_lower = blocked.lower()
-        if blocked_lower in domain_lower or domain_lower in blocked_lower:
-            return True
-
-    return False
+    if not isinstance(blocked_domains, BlockedDomainIndex):
+        # Rebuilding the index per call would make every lookup O(blocked set)
+        raise TypeError("is_blocked_domain() needs a BlockedDomainIndex, "
+                        f"got {type(blocked_domains).__name__}")
+    return blocked_domains.overlaps(domain)
 
 
 # ============================================================
@@ -206,6 +274,62 @@ def mark_items_searched(supabase, ids: list[str], batch_size: int = 100) -> int:
     return total_updated
 
 
+def _is_missing_rpc(error: Exception) -> bool:
+    """True if PostgREST reports the function doesn't exist (PGRST202 / HTTP 404)."""
+    text = str(error)
+    code = str(getattr(error, 'code', '') or '')
+    return code in ('PGRST202', '404') or 'PGRST202' in text or 'Could not find the function' in text
+
+
+def increment_search_hit_counts(supabase, hits: dict[str, int]) -> int:
+    """
+    Add per-domain deltas to wsj_domain_status.search_hit_count.
+
+    Uses the increment_search_hit_counts RPC (one atomic UPDATE for the whole
+    map). Only when the function is missing (migration 016 not applied) does
+    it fall back to per-domain read-modify-write. Any other RPC error is
+    logged and nothing is retried: a timeout may arrive after the server
+    committed, and re-applying would count the hits twice.
+    Only domains already in the table are updated.
+
+    Returns:
+        Number of domains updated (0 on RPC error)
+    """
+    hits = {d: int(n) for d, n in hits.items() if d and n}
+    if not hits:
+        return 0
+
+    try:
+        response = supabase.rpc('increment_search_hit_counts', {'hits': hits}).execute()
+        return response.data if isinstance(response.data, int) else len(hits)
+    except Exception as e:
+        if not _is_missing_rpc(e):
+            print(f"  [WARN] increment_search_hit_counts RPC failed ({e}), search_hit_count not updated")
+            return 0
+        print(f"  [WARN] increment_search_hit_counts RPC not found (apply migration 016), "
+              f"updating {len(hits)} domains individually")
+
+    updated = 0
+    for domain, count in hits.items():
+        try:
+            row = supabase.table('wsj_domain_status') \
+                .select('search_hit_count') \
+                .eq('domain', domain) \
+                .limit(1) \
+                .execute()
+            if row.data:
+                current = row.data[0].get('search_hit_count', 0) or 0
+                supabase.table('wsj_domain_status') \
+                    .update({'search_hit_count': current + count}) \
+                    .eq('domain', domain) \
+                    .execute()
+                updated += 1
+        except Exception as e:
+            print(f"  Warning: Could not update search_hit_count for {domain}: {e}")
+
+    return updated
+
+
 def get_stats(supabase) -> dict:
     """Get WSJ items statistics."""
     total_response = supabase.table('wsj_items').select('id', count='exact').execute()
@@ -7,6 +7,9 @@ Features:
 - Google News URL resolution
 - newspaper4k: Fast HTTP fetch with author/date extraction
 - crawl4ai fetch (basic/stealth/undetected) for protected sites
+- BrowserPool: warm browsers reused across URLs and fallback passes
+- Blocking work (newspaper4k, title/og:image fetches, trafilatura) runs on a
+  bounded thread pool (run_blocking) so concurrent crawls don't stall
 - HTML-first extraction via trafilatura (with crawl4ai fallback)
 - Quality metrics + reason codes for debugging
 - Section cutting to remove noise
@@ -19,27 +22,35 @@ Modes: basic, stealth, undetected (default: undetected)
 As a module:
     from crawl_article import crawl_article
     result = await crawl_article("https://...")
+    async with BrowserPool(size=4) as pool:   # reuse browsers across many URLs
+        result = await crawl_article("https://...", browser_pool=pool)
     # result includes: extraction_method, authors, publish_date (when available)
 """
 import asyncio
+import functools
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
 import httpx
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 
-# Import shared modules
-sys.path.insert(0, str(Path(__file__).parent))          # lib/ (google_news_resolver)
-sys.path.insert(0, str(Path(__file__).parent.parent))   # scripts/ (domain_utils)
-from google_news_resolver import (
+# Import shared modules. The resolver is imported as lib.google_news_resolver,
+# the same module 5_/6_ use, so there is one resolve-cache singleton per process.
+sys.path.insert(0, str(Path(__file__).parent.parent))   # scripts/ (domain_utils, lib.*)
+from lib.google_news_resolver import (
     is_google_news_url,
     resolve_google_news_url as _resolve_google_news_url,
+    resolve_google_news_url_async as _resolve_google_news_url_async,
 )
 
+if TYPE_CHECKING:
+    from domain_utils import BlockedDomainIndex
+
 # Optional: trafilatura for better content extraction
 try:
     import trafilatura
@@ -396,21 +407,39 @@ def get_domain_config(url: str) -> dict | None:
     return None  # Unknown domain - will use fallback strategy
 
 
+# ============================================================================
+# Blocking Work
+# ============================================================================
+
+BLOCKING_WORKERS = 16   # threads for sync HTTP/parsing inside the async crawl
+
+_blocking_executor: ThreadPoolExecutor | None = None
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a sync call (newspaper4k, httpx.Client fetches, trafilatura) on the
+    bounded crawl thread pool so the event loop keeps serving other crawls."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="crawl-blocking")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(fn, *args, **kwargs))
+
+
 # ============================================================================
 # Newspaper4k Fast Extraction (Hybrid Approach - Phase 1)
 # ============================================================================
 
-def _try_newspaper4k(url: str, domain: str, blocked_domains: set[str] = None, min_length: int = 300) -> dict | None:
+def _try_newspaper4k(url: str, min_length: int = 300) -> dict | None:
     """
     Try fast extraction using newspaper4k.
 
     Returns dict with content if successful, None if failed.
     This is Phase 1 of the hybrid approach - fast HTTP fetch + extraction.
+    Blocking (run via run_blocking); crawl_article() skips it for blocked domains.
 
     Args:
         url: Article URL
-        domain: Domain string for checking blocked list
-        blocked_domains: Set of domains that require browser rendering (from DB)
         min_length: Minimum content length to consider successful
 
     Returns:
@@ -420,12 +449,6 @@ def _try_newspaper4k(url: str, domain: str, blocked_domains: set[str] = None, mi
     if not HAS_NEWSPAPER4K:
         return None
 
-    # Skip domains that require browser rendering (loaded from wsj_domain_status)
-    if blocked_domains:
-        from domain_utils import is_blocked_domain
-        if is_blocked_domain(domain, blocked_domains):
-            return None
-
     try:
         article = newspaper.article(url, timeout=15)
         article.parse()
@@ -463,12 +486,157 @@ def _try_newspaper4k(url: str, domain: str, blocked_domains: set[str] = None, mi
         return None
 
 
+# ============================================================================
+# Browser Pool
+# ============================================================================
+
+DEFAULT_POOL_SIZE = 1             # warm browsers per crawl mode
+DEFAULT_PAGES_PER_BROWSER = 50    # pages before a browser is recycled
+
+# crawl4ai reports a dead browser as a failed result rather than raising
+_BROWSER_GONE = re.compile(
+    r"has been closed|browser.{0,40}(closed|crashed|disconnected)|connection closed",
+    re.IGNORECASE,
+)
+
+
+def _new_crawler(mode: str) -> AsyncWebCrawler:
+    """Unstarted crawler (one Chromium) configured for a crawl mode."""
+    if mode == "basic":
+        return AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+
+    if mode == "stealth":
+        return AsyncWebCrawler(config=BrowserConfig(
+            headless=True,
+            verbose=False,
+            enable_stealth=True,
+        ))
+
+    # undetected (default): undetected browser adapter (most robust)
+    from crawl4ai import UndetectedAdapter
+    from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+
+    browser_config = BrowserConfig(
+        headless=False,  # Docs recommend False for undetected
+        verbose=True,
+    )
+    crawler_strategy = AsyncPlaywrightCrawlerStrategy(
+        browser_config=browser_config,
+        browser_adapter=UndetectedAdapter()
+    )
+    return AsyncWebCrawler(crawler_strategy=crawler_strategy, config=browser_config)
+
+
+@dataclass(eq=False)
+class _PooledBrowser:
+    crawler: AsyncWebCrawler
+    pages: int = 0
+    broken: bool = False
+
+
+class BrowserPool:
+    """Long-lived crawl4ai browsers, up to `size` per crawl mode.
+
+    Each crawl checks a browser out exclusively, and crawl4ai opens and closes
+    a fresh page per arun() (no session_id), so concurrent crawls never share
+    a page. Browsers start on first use and are replaced after max_pages pages
+    (bounds memory growth and cookie/paywall-meter carry-over) or when a crawl
+    raises, is cancelled, or reports the browser gone.
+
+    Usage:
+        async with BrowserPool(size=4) as pool:
+            result = await crawl_article(url, browser_pool=pool)
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_pages: int = DEFAULT_PAGES_PER_BROWSER):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._idle: dict[str, list[_PooledBrowser]] = {}
+        self._live: set[_PooledBrowser] = set()
+        self._closing: set[asyncio.Task] = set()
+        self.launches = 0
+        self.pages = 0
+        self.recycled = 0
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _launch(self, mode: str) -> _PooledBrowser:
+        browser = _PooledBrowser(_new_crawler(mode))
+        try:
+            await browser.crawler.start()
+        except BaseException:
+            await _close_quietly(browser.crawler)
+            raise
+        self._live.add(browser)
+        self.launches += 1
+        return browser
+
+    def _retire(self, browser: _PooledBrowser) -> None:
+        """Close a browser in the background so its slot frees immediately."""
+        self._live.discard(browser)
+        self.recycled += 1
+        task = asyncio.ensure_future(_close_quietly(browser.crawler))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def run(self, mode: str, url: str, config: CrawlerRunConfig):
+        """crawler.arun(url, config) on a pooled browser for this mode."""
+        slots = self._slots.setdefault(mode, asyncio.Semaphore(self.size))
+        async with slots:
+            idle = self._idle.setdefault(mode, [])
+            browser = idle.pop() if idle else await self._launch(mode)
+            try:
+                result = await browser.crawler.arun(url=url, config=config)
+                if not result.success and _BROWSER_GONE.search(result.error_message or ""):
+                    browser.broken = True
+                return result
+            except BaseException:
+                browser.broken = True
+                raise
+            finally:
+                browser.pages += 1
+                self.pages += 1
+                if browser.broken or browser.pages >= self.max_pages:
+                    self._retire(browser)
+                else:
+                    idle.append(browser)
+
+    async def close(self) -> None:
+        """Close every browser (idle or retiring)."""
+        live, self._live = list(self._live), set()
+        self._idle.clear()
+        await asyncio.gather(*(_close_quietly(b.crawler) for b in live), *list(self._closing))
+
+    def print_stats(self, label: str = "Browser pool") -> None:
+        """Print one pages/launches line (no-op when unused)."""
+        if self.pages:
+            print(f"{label}: {self.pages} pages on {self.launches} browser launches "
+                  f"({self.recycled} recycled)")
+
+
+async def _close_quietly(crawler: AsyncWebCrawler) -> None:
+    try:
+        await crawler.close()
+    except Exception as e:
+        print(f"  [WARN] Browser close failed: {e}")
+
+
+# ============================================================================
+# Article Crawl
+# ============================================================================
+
 async def crawl_article(
     url: str,
     mode: str = "undetected",
     use_domain_selector: bool = True,
     skip_blocked: bool = True,
-    blocked_domains: set[str] = None,
+    blocked_domains: "BlockedDomainIndex | None" = None,
+    browser_pool: BrowserPool | None = None,
 ) -> dict:
     """
     Crawl an article URL and extract content.
@@ -480,7 +648,8 @@ async def crawl_article(
         mode: "basic", "stealth", or "undetected"
         use_domain_selector: If True, use domain-specific CSS selectors when available
         skip_blocked: If True, skip domains known to be blocked
-        blocked_domains: Set of domains to skip newspaper4k (from wsj_domain_status)
+        blocked_domains: BlockedDomainIndex of domains to skip newspaper4k (from wsj_domain_status)
+        browser_pool: BrowserPool to draw browsers from (None = launch a browser for this call)
 
     Returns:
         dict with keys: success, status_code, title, markdown, markdown_length, domain, skipped, resolved_url
@@ -489,10 +658,10 @@ async def crawl_article(
     original_url = url
     resolved_url = None
 
-    # Auto-resolve Google News URLs (sync resolver, brief block is fine)
+    # Auto-resolve Google News URLs
     if is_google_news_url(url):
-        with httpx.Client(timeout=15) as client:
-            result = _resolve_google_news_url(url, client)
+        async with httpx.AsyncClient(timeout=15) as client:
+            result = await _resolve_google_news_url_async(url, client)
         if result.success:
             resolved_url = result.resolved_url
             url = resolved_url
@@ -530,7 +699,15 @@ async def crawl_article(
     # =========================================================================
     # HYBRID APPROACH: Try newspaper4k first (fast), fall back to browser
     # =========================================================================
-    np_result = _try_newspaper4k(url, domain, blocked_domains)
+    # Skip domains that require browser rendering (loaded from wsj_domain_status).
+    # Checked here on the event loop: callers mutate blocked_domains during a run.
+    np_blocked = False
+    if blocked_domains:
+        from domain_utils import is_blocked_domain
+        np_blocked = is_blocked_domain(domain, blocked_domains)
+    np_result = None
+    if HAS_NEWSPAPER4K and not np_blocked:
+        np_result = await run_blocking(_try_newspaper4k, url)
     if np_result:
         return {
             "success": True,
@@ -567,7 +744,7 @@ async def crawl_article(
         if "excluded_tags" in domain_config:
             crawler_kwargs["excluded_tags"] = domain_config["excluded_tags"]
 
-        result = await _do_crawl(url, crawler_kwargs, domain, mode)
+        result = await _do_crawl(url, crawler_kwargs, domain, mode, browser_pool)
     else:
         # Unknown domain: use 2-pass fallback strategy
         # Pass 1: Generic pruning (no CSS selector, just excluded tags)
@@ -575,7 +752,7 @@ async def crawl_article(
         pass1_kwargs["excluded_tags"] = DEFAULT_EXCLUDED_TAGS
         pass1_kwargs["remove_overlay_elements"] = True
 
-        result = await _do_crawl(url, pass1_kwargs, domain, mode)
+        result = await _do_crawl(url, pass1_kwargs, domain, mode, browser_pool)
 
         # If Pass 1 failed or too short, try Pass 2 with article selectors
         if result["markdown_length"] < 500 and result["success"]:
@@ -583,7 +760,7 @@ async def crawl_article(
             pass2_kwargs["css_selector"] = DEFAULT_CSS_SELECTOR
             pass2_kwargs["excluded_tags"] = DEFAULT_EXCLUDED_TAGS
 
-            result2 = await _do_crawl(url, pass2_kwargs, domain, mode)
+            result2 = await _do_crawl(url, pass2_kwargs, domain, mode, browser_pool)
             # Use Pass 2 only if it gives more content
             if result2["markdown_length"] > result["markdown_length"]:
                 result = result2
@@ -594,70 +771,53 @@ async def crawl_article(
     return result
 
 
-async def _do_crawl(url: str, crawler_kwargs: dict, domain: str, mode: str) -> dict:
+async def _do_crawl(url: str, crawler_kwargs: dict, domain: str, mode: str,
+                    browser_pool: BrowserPool | None = None) -> dict:
     """Execute crawl with given mode and kwargs."""
     if mode == "basic":
-        return await _crawl_basic(url, crawler_kwargs, domain)
+        return await _crawl_basic(url, crawler_kwargs, domain, browser_pool)
     elif mode == "stealth":
-        return await _crawl_stealth(url, crawler_kwargs, domain)
+        return await _crawl_stealth(url, crawler_kwargs, domain, browser_pool)
     else:  # undetected (default)
-        return await _crawl_undetected(url, crawler_kwargs, domain)
+        return await _crawl_undetected(url, crawler_kwargs, domain, browser_pool)
+
+
+async def _run_crawler(mode: str, url: str, crawler_config: CrawlerRunConfig,
+                       browser_pool: BrowserPool | None):
+    """arun() on a pooled browser, or on a one-off browser when no pool is given."""
+    if browser_pool is not None:
+        return await browser_pool.run(mode, url, crawler_config)
+    async with _new_crawler(mode) as crawler:
+        return await crawler.arun(url=url, config=crawler_config)
 
 
-async def _crawl_basic(url: str, crawler_kwargs: dict, domain: str) -> dict:
+async def _crawl_basic(url: str, crawler_kwargs: dict, domain: str,
+                       browser_pool: BrowserPool | None = None) -> dict:
     """Basic crawl without stealth features."""
-    browser_config = BrowserConfig(headless=True, verbose=False)
     crawler_config = CrawlerRunConfig(**crawler_kwargs)
+    result = await _run_crawler("basic", url, crawler_config, browser_pool)
+    return await run_blocking(_build_result, result, domain, url)
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        result = await crawler.arun(url=url, config=crawler_config)
-        return _build_result(result, domain, url)
 
-
-async def _crawl_stealth(url: str, crawler_kwargs: dict, domain: str) -> dict:
+async def _crawl_stealth(url: str, crawler_kwargs: dict, domain: str,
+                         browser_pool: BrowserPool | None = None) -> dict:
     """Crawl with stealth mode enabled."""
-    browser_config = BrowserConfig(
-        headless=True,
-        verbose=False,
-        enable_stealth=True,
-    )
-
     crawler_kwargs.update({
         "magic": True,
         "simulate_user": True,
         "delay_before_return_html": 2.0,
     })
     crawler_config = CrawlerRunConfig(**crawler_kwargs)
-
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        result = await crawler.arun(url=url, config=crawler_config)
-        return _build_result(result, domain, url)
+    result = await _run_crawler("stealth", url, crawler_config, browser_pool)
+    return await run_blocking(_build_result, result, domain, url)
 
 
-async def _crawl_undetected(url: str, crawler_kwargs: dict, domain: str) -> dict:
+async def _crawl_undetected(url: str, crawler_kwargs: dict, domain: str,
+                            browser_pool: BrowserPool | None = None) -> dict:
     """Crawl with undetected browser adapter (most robust)."""
-    from crawl4ai import UndetectedAdapter
-    from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
-
-    browser_config = BrowserConfig(
-        headless=False,  # Docs recommend False for undetected
-        verbose=True,
-    )
-
-    undetected_adapter = UndetectedAdapter()
-    crawler_strategy = AsyncPlaywrightCrawlerStrategy(
-        browser_config=browser_config,
-        browser_adapter=undetected_adapter
-    )
-
     crawler_config = CrawlerRunConfig(**crawler_kwargs)
-
-    async with AsyncWebCrawler(
-        crawler_strategy=crawler_strategy,
-        config=browser_config
-    ) as crawler:
-        result = await crawler.arun(url=url, config=crawler_config)
-        return _build_result(result, domain, url)
+    result = await _run_crawler("undetected", url, crawler_config, browser_pool)
+    return await run_blocking(_build_result, result, domain, url)
 
 
 def _extract_title(result) -> str | None:
@@ -734,7 +894,8 @@ def _fetch_title_from_url(url: str) -> str | None:
 
 
 def _build_result(result, domain: str, url: str = None) -> dict:
-    """Build standardized result dict from crawler result.
+    """Build standardized result dict from crawler result (blocking: may fetch
+    the title and validate og:image over HTTP; run via run_blocking).
 
     Extraction strategy:
     1. Try trafilatura on raw HTML (best quality)
@@ -1174,8 +1335,8 @@ async def main():
     is_known_domain = get_domain_config(url) is not None
 
     # Load blocked domains from DB
-    from domain_utils import load_blocked_domains, is_blocked_domain
-    db_blocked = load_blocked_domains()
+    from domain_utils import BlockedDomainIndex, load_blocked_domains, is_blocked_domain
+    db_blocked = BlockedDomainIndex(load_blocked_domains())
 
     # Check blocked status
     if is_blocked_domain(domain, db_blocked):
@@ -1190,7 +1351,9 @@ async def main():
     print(f"Domain: {domain} ({'configured' if is_known_domain else 'fallback'})")
     print("=" * 60)
 
-    result = await crawl_article(url, mode=mode, use_domain_selector=use_domain_selector, skip_blocked=skip_blocked, blocked_domains=db_blocked)
+    async with BrowserPool() as pool:
+        result = await crawl_article(url, mode=mode, use_domain_selector=use_domain_selector, skip_blocked=skip_blocked,
+                                     blocked_domains=db_blocked, browser_pool=pool)
 
     if result.get("skipped"):
         print(f"Skipped: {result.get('skip_reason', 'Domain blocked')}")
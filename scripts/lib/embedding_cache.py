@@ -0,0 +1,345 @@
+"""
+Persistent embedding cache shared by 4_embedding_rank, 6_crawl_ranked and
+7_embed_and_thread (all use BAAI/bge-base-en-v1.5).
+
+Key = sha1(model name, normalize flag, text). Vectors live in an append-only
+memory-mapped file (one fixed-size row per entry); a SQLite index maps each
+key to its row and tracks last access. When the file exceeds its size budget
+it is compacted: the most recently used rows are copied to a fresh file and
+the rest dropped. A lock file keeps lookups in other processes from reading
+slots across a compaction. Hit/miss counters are kept per process.
+
+Usage:
+    from lib.embedding_cache import encode_cached, print_embedding_cache_stats
+
+    vecs = encode_cached(model, texts, model_name='BAAI/bge-base-en-v1.5')
+    print_embedding_cache_stats()
+
+Environment:
+    EMBEDDING_CACHE_DISABLE=1   bypass the cache entirely
+    EMBEDDING_CACHE_DIR         directory (default: scripts/output/embedding_cache)
+    EMBEDDING_CACHE_DTYPE       float32 (default) or float16 (half the disk, ~1e-3 score drift)
+    EMBEDDING_CACHE_MAX_MB      vector file budget before compaction (default: 512)
+"""
+import fcntl
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'output' / 'embedding_cache'
+DEFAULT_DTYPE = 'float32'
+DEFAULT_MAX_MB = 512.0
+COMPACT_TO = 0.9      # keep this fraction of the budget after compaction
+SQL_CHUNK = 500       # keys per IN (...) lookup
+
+
+def _cache_key(model_name: str, normalize: bool, text: str) -> bytes:
+    return hashlib.sha1(f"{model_name}\0{int(normalize)}\0{text}".encode()).digest()
+
+
+# ============================================================
+# Cache store
+# ============================================================
+
+class EmbeddingCache:
+    """Memory-mapped vector file + SQLite key index for one model.
+
+    Safe across threads (one connection behind a lock) and processes (row
+    allocation and compaction happen inside SQLite write transactions; a
+    generation counter tells readers to remap after a compaction). WAL
+    readers aren't blocked by a compaction's transaction, so lookups hold a
+    shared flock on the lock file while mapping slots to rows and compaction
+    holds it exclusively.
+    """
+
+    def __init__(self, directory: Path, model_name: str, dtype: str = DEFAULT_DTYPE,
+                 max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.vectors_path = directory / f"{slug}.{self.dtype.name}.vec"
+        self.index_path = directory / f"{slug}.{self.dtype.name}.index.sqlite3"
+        self.lock_path = directory / f"{slug}.{self.dtype.name}.lock"
+
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False,
+                                     timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key BLOB PRIMARY KEY, slot INTEGER NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('next_slot', 0), ('generation', 0), ('dim', 0)")
+        self._map: Optional[np.memmap] = None
+        self._map_generation = -1
+
+    # ---- helpers (caller holds self._lock) ----
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock: shared for lookups, exclusive for compaction."""
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _meta(self) -> dict[str, int]:
+        return dict(self._conn.execute('SELECT name, value FROM meta').fetchall())
+
+    def _mapped(self, generation: int, dim: int, min_rows: int) -> Optional[np.memmap]:
+        """Current memory map, reopened after a compaction or when rows were appended."""
+        if (self._map is None or self._map_generation != generation
+                or self._map.shape[0] < min_rows or self._map.shape[1] != dim):
+            self._map = None
+            row_bytes = dim * self.dtype.itemsize
+            size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+            rows = size // row_bytes if row_bytes else 0
+            if rows:
+                self._map = np.memmap(self.vectors_path, dtype=self.dtype, mode='r', shape=(rows, dim))
+            self._map_generation = generation
+        return self._map
+
+    # ---- public API ----
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up keys. Returns {key: float32 vector} for the ones present."""
+        found: dict[bytes, np.ndarray] = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock, self._file_lock(exclusive=False):
+            self._conn.execute('BEGIN')
+            try:
+                meta = self._meta()
+                slots: dict[bytes, int] = {}
+                for i in range(0, len(keys), SQL_CHUNK):
+                    chunk = keys[i:i + SQL_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    slots.update(self._conn.execute(
+                        f'SELECT key, slot FROM entries WHERE key IN ({placeholders})', chunk
+                    ).fetchall())
+                if slots:
+                    vectors = self._mapped(meta['generation'], meta['dim'], max(slots.values()) + 1)
+                    if vectors is not None:
+                        for key, slot in slots.items():
+                            if slot < vectors.shape[0]:
+                                found[key] = np.array(vectors[slot], dtype=np.float32)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            if found:
+                # Separate write transaction: a WAL read snapshot that another
+                # process wrote past can't be upgraded (fails without waiting)
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._conn.executemany(
+                        'UPDATE entries SET last_access = ? WHERE key = ?',
+                        [(now, key) for key in found],
+                    )
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        """Append vectors for keys not already stored, then compact if over budget."""
+        if not keys:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        dim = vectors.shape[1]
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                meta = self._meta()
+                if meta['dim'] == 0:
+                    self._conn.execute("UPDATE meta SET value = ? WHERE name = 'dim'", (dim,))
+                elif meta['dim'] != dim:
+                    raise ValueError(f"vector dim {dim} != cached dim {meta['dim']}")
+
+                existing = set()
+                for i in range(0, len(keys), SQL_CHUNK):
+                    chunk = keys[i:i + SQL_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    existing.update(k for (k,) in self._conn.execute(
+                        f'SELECT key FROM entries WHERE key IN ({placeholders})', chunk
+                    ))
+                new_rows = [i for i, k in enumerate(keys) if k not in existing]
+                new_rows = list({keys[i]: i for i in new_rows}.values())  # dedupe keys
+
+                if new_rows:
+                    start = meta['next_slot']
+                    row_bytes = dim * self.dtype.itemsize
+                    fd = os.open(self.vectors_path, os.O_RDWR | os.O_CREAT, 0o644)
+                    try:
+                        os.pwrite(fd, vectors[new_rows].tobytes(), start * row_bytes)
+                    finally:
+                        os.close(fd)
+                    self._conn.executemany(
+                        'INSERT INTO entries (key, slot, last_access) VALUES (?, ?, ?)',
+                        [(keys[i], start + n, now) for n, i in enumerate(new_rows)],
+                    )
+                    self._conn.execute("UPDATE meta SET value = ? WHERE name = 'next_slot'",
+                                       (start + len(new_rows),))
+                    over_budget = (start + len(new_rows)) * row_bytes > self.max_bytes
+                else:
+                    over_budget = False
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        if over_budget:
+            self.compact()
+
+    def compact(self) -> int:
+        """Rewrite the vector file keeping the most recently used rows. Returns rows dropped."""
+        with self._lock, self._file_lock(exclusive=True):
+            self._conn.execute('BEGIN EXCLUSIVE')
+            try:
+                meta = self._meta()
+                dim = meta['dim']
+                row_bytes = dim * self.dtype.itemsize
+                if not row_bytes:
+                    self._conn.execute('COMMIT')
+                    return 0
+                keep_rows = max(1, int(self.max_bytes * COMPACT_TO) // row_bytes)
+                total = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+                keep = self._conn.execute(
+                    'SELECT key, slot FROM entries ORDER BY last_access DESC LIMIT ?', (keep_rows,)
+                ).fetchall()
+
+                vectors = self._mapped(meta['generation'], dim, meta['next_slot'])
+                if vectors is None:
+                    self._conn.execute('COMMIT')
+                    return 0
+                tmp_path = self.vectors_path.with_suffix('.vec.tmp')
+                with open(tmp_path, 'wb') as f:
+                    for _, slot in keep:
+                        f.write(vectors[slot].tobytes())
+                self._map = None
+                os.replace(tmp_path, self.vectors_path)
+
+                self._conn.execute('DELETE FROM entries')
+                self._conn.executemany(
+                    'INSERT INTO entries (key, slot, last_access) VALUES (?, ?, ?)',
+                    [(key, n, time.time()) for n, (key, _) in enumerate(keep)],
+                )
+                self._conn.execute("UPDATE meta SET value = ? WHERE name = 'next_slot'", (len(keep),))
+                self._conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return total - len(keep)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+
+# ============================================================
+# Process-wide access
+# ============================================================
+
+_caches: dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _disabled() -> bool:
+    return os.getenv('EMBEDDING_CACHE_DISABLE', '').lower() in ('1', 'true', 'yes')
+
+
+def get_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """Process-wide cache for a model from environment settings. None if disabled."""
+    if _disabled():
+        return None
+    with _caches_lock:
+        if model_name not in _caches:
+            directory = Path(os.getenv('EMBEDDING_CACHE_DIR') or DEFAULT_CACHE_DIR)
+            dtype = os.getenv('EMBEDDING_CACHE_DTYPE', DEFAULT_DTYPE)
+            max_mb = float(os.getenv('EMBEDDING_CACHE_MAX_MB', DEFAULT_MAX_MB))
+            try:
+                _caches[model_name] = EmbeddingCache(directory, model_name, dtype, int(max_mb * 1024 * 1024))
+            except Exception as e:
+                print(f"  [WARN] Embedding cache unavailable ({e}), continuing without it")
+                os.environ['EMBEDDING_CACHE_DISABLE'] = '1'
+                return None
+    return _caches[model_name]
+
+
+def encode_cached(model, texts: list[str], *, model_name: str,
+                  normalize_embeddings: bool = True, token_budget: Optional[int] = None,
+                  **encode_kwargs) -> np.ndarray:
+    """Drop-in for model.encode(texts, ...) backed by the embedding cache.
+
+    Only texts missing from the cache are encoded (each unique text once).
+    With token_budget, those are encoded in length-bucketed batches (see
+    lib.embedding_model.encode_length_bucketed). Returns a float32
+    (len(texts), dim) array in input order.
+    """
+    def encode(batch: list[str]):
+        if token_budget:
+            from lib.embedding_model import encode_length_bucketed
+            return encode_length_bucketed(model, batch, normalize_embeddings=normalize_embeddings,
+                                          max_tokens=token_budget, **encode_kwargs)
+        return model.encode(batch, normalize_embeddings=normalize_embeddings, **encode_kwargs)
+
+    cache = get_embedding_cache(model_name)
+    if cache is None or not texts:
+        return encode(texts)
+
+    keys = [_cache_key(model_name, normalize_embeddings, t) for t in texts]
+    try:
+        found = cache.get_many(list(dict.fromkeys(keys)))
+    except Exception as e:
+        print(f"  [WARN] Embedding cache read failed: {e}")
+        found = {}
+
+    missing = list({k: t for k, t in zip(keys, texts) if k not in found}.items())
+    if missing:
+        encoded = np.asarray(encode([t for _, t in missing]), dtype=np.float32)
+        miss_keys = [k for k, _ in missing]
+        found.update(zip(miss_keys, encoded))
+        try:
+            cache.put_many(miss_keys, encoded)
+        except Exception as e:
+            print(f"  [WARN] Embedding cache write failed: {e}")
+
+    return np.stack([found[k] for k in keys])
+
+
+def print_embedding_cache_stats(label: str = "Embedding cache") -> None:
+    """Print one hit/miss line per model (no-op when disabled or unused)."""
+    for model_name, cache in _caches.items():
+        s = cache.stats()
+        if s['hits'] or s['misses']:
+            print(f"{label} ({model_name}): {s['hits']} hits / {s['misses']} misses "
+                  f"({s['hit_rate']:.0%} hit rate)")
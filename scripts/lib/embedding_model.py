@@ -0,0 +1,229 @@
+"""
+Sentence-transformer loader with a selectable CPU inference backend.
+
+Shared by 4_embedding_rank (_get_model), 6_crawl_ranked (_get_relevance_model)
+and 7_embed_and_thread (get_embedding_model). When the local embedding server
+(lib/embedding_server.py) is running, those get a socket client instead of
+loading the model again.
+
+Backends (EMBEDDING_BACKEND):
+    torch       PyTorch (default)
+    onnx        exported ONNX graph on onnxruntime
+    onnx-int8   ONNX graph with dynamic int8 quantization (exported once into
+                scripts/output/onnx_models/, reused afterwards)
+
+ONNX backends need sentence-transformers>=3.2 and optimum[onnxruntime]; if
+either is missing the loader warns and falls back to torch.
+
+Vectors differ slightly between backends, so each backend gets its own
+embedding-cache namespace (embedding_cache_id).
+
+encode_length_bucketed() sizes batches by padded tokens rather than text
+count: texts are sorted by token length and packed up to a token budget, so
+a batch of headlines isn't padded out to the length of one long summary.
+
+Usage:
+    from lib.embedding_model import load_embedding_model, embedding_cache_id
+
+    model = load_embedding_model('BAAI/bge-base-en-v1.5')
+    vecs = encode_cached(model, texts, model_name=embedding_cache_id('BAAI/bge-base-en-v1.5'),
+                         token_budget=DEFAULT_TOKEN_BUDGET)
+
+Environment:
+    EMBEDDING_BACKEND           torch | onnx | onnx-int8 (default: torch)
+    EMBEDDING_ONNX_QCONFIG      int8 quantization target: avx2 | avx512 | avx512_vnni | arm64 (default: avx2)
+"""
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+DEFAULT_BACKEND = 'torch'
+DEFAULT_QCONFIG = 'avx2'
+ONNX_EXPORT_DIR = Path(__file__).parent.parent / 'output' / 'onnx_models'
+
+# Length-bucketed batching: padded tokens per forward pass (batch size × longest
+# input in the batch), and a cap on texts per batch for very short inputs
+DEFAULT_TOKEN_BUDGET = 16384
+MAX_BUCKET_SIZE = 256
+DEFAULT_MAX_SEQ_LENGTH = 512
+
+# model name → backend actually loaded (after any fallback)
+_loaded_backends: dict[str, str] = {}
+
+
+def configured_backend() -> str:
+    backend = os.getenv('EMBEDDING_BACKEND', DEFAULT_BACKEND).strip().lower()
+    if backend not in BACKENDS:
+        print(f"  [WARN] Unknown EMBEDDING_BACKEND={backend!r}, using {DEFAULT_BACKEND}")
+        return DEFAULT_BACKEND
+    return backend
+
+
+def loaded_backend(model_name: str) -> Optional[str]:
+    """Backend the model was actually loaded on (None if not loaded yet)."""
+    return _loaded_backends.get(model_name)
+
+
+def embedding_cache_id(model_name: str) -> str:
+    """Embedding-cache namespace for a model under its loaded (or configured) backend."""
+    backend = loaded_backend(model_name) or configured_backend()
+    if backend == 'torch':
+        return model_name
+    if backend == 'onnx-int8':
+        return f"{model_name}@onnx-int8-{os.getenv('EMBEDDING_ONNX_QCONFIG', DEFAULT_QCONFIG)}"
+    return f"{model_name}@{backend}"
+
+
+def _load_torch(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    try:
+        return SentenceTransformer(model_name, local_files_only=True)
+    except Exception:
+        print("  Local cache miss, downloading from Hub...")
+        return SentenceTransformer(model_name)
+
+
+def _load_onnx(model_name: str, **kwargs):
+    from sentence_transformers import SentenceTransformer
+    try:
+        return SentenceTransformer(model_name, backend='onnx', local_files_only=True, **kwargs)
+    except Exception:
+        print("  Local ONNX cache miss, downloading/exporting from Hub...")
+        return SentenceTransformer(model_name, backend='onnx', **kwargs)
+
+
+def _load_onnx_int8(model_name: str):
+    """Load the int8 graph, exporting and quantizing it on first use."""
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    qconfig = os.getenv('EMBEDDING_ONNX_QCONFIG', DEFAULT_QCONFIG)
+    export_dir = ONNX_EXPORT_DIR / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+    file_name = f"onnx/model_qint8_{qconfig}.onnx"
+
+    if not (export_dir / file_name).exists():
+        print(f"  Exporting int8 ONNX model ({qconfig}) to {export_dir}...")
+        model = _load_onnx(model_name)
+        model.save(str(export_dir))
+        export_dynamic_quantized_onnx_model(model, qconfig, str(export_dir))
+
+    return SentenceTransformer(str(export_dir), backend='onnx', model_kwargs={'file_name': file_name})
+
+
+def load_embedding_model(model_name: str, backend: Optional[str] = None):
+    """Model for encoding: the local embedding server if it is serving model_name,
+    otherwise a SentenceTransformer loaded in-process (see load_local_embedding_model).
+
+    The server's backend wins over EMBEDDING_BACKEND (cache ids follow it).
+    """
+    from lib.embedding_server import connect
+
+    remote = connect(model_name)
+    if remote is not None:
+        print(f"  Using embedding server ({remote.backend}) at {remote.path}")
+        _loaded_backends[model_name] = remote.backend
+        return remote
+    return load_local_embedding_model(model_name, backend)
+
+
+def load_local_embedding_model(model_name: str, backend: Optional[str] = None):
+    """Load a SentenceTransformer on the requested backend (default: EMBEDDING_BACKEND).
+
+    Falls back to torch when an ONNX backend can't be loaded.
+    """
+    backend = backend or configured_backend()
+    if backend != 'torch':
+        try:
+            model = _load_onnx_int8(model_name) if backend == 'onnx-int8' else _load_onnx(model_name)
+            _loaded_backends[model_name] = backend
+            return model
+        except Exception as e:
+            print(f"  [WARN] {backend} backend unavailable ({e}), falling back to torch")
+
+    model = _load_torch(model_name)
+    _loaded_backends[model_name] = 'torch'
+    return model
+
+
+# ============================================================
+# Length-bucketed batching
+# ============================================================
+
+def token_lengths(model, texts: list[str]) -> list[int]:
+    """Token count per text (with special tokens, capped at the model's max length).
+
+    Uses the model's (or a bare tokenizer's) tokenizer when there is one;
+    otherwise estimates from word count.
+    """
+    max_len = getattr(model, 'max_seq_length', None) or DEFAULT_MAX_SEQ_LENGTH
+    tokenizer = getattr(model, 'tokenizer', model if callable(model) else None)
+    if tokenizer is not None:
+        try:
+            ids = tokenizer(texts, add_special_tokens=True, truncation=False)['input_ids']
+            return [min(len(x), max_len) for x in ids]
+        except Exception:
+            pass
+    return [min(int(len(t.split()) * 1.3) + 2, max_len) for t in texts]
+
+
+def plan_token_batches(
+    lengths: list[int],
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    max_batch: int = MAX_BUCKET_SIZE,
+) -> list[list[int]]:
+    """Group indices longest-first into batches whose padded size fits max_tokens.
+
+    Padded size = len(batch) × longest member; since inputs are sorted, the
+    first index of each batch is its longest. A single input longer than the
+    budget still gets its own batch.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: list[list[int]] = []
+    current: list[int] = []
+    for i in order:
+        if current and ((len(current) + 1) * lengths[current[0]] > max_tokens
+                        or len(current) >= max_batch):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def encode_length_bucketed(
+    model,
+    texts: list[str],
+    *,
+    normalize_embeddings: bool = True,
+    max_tokens: int = DEFAULT_TOKEN_BUDGET,
+    max_batch: int = MAX_BUCKET_SIZE,
+    **encode_kwargs,
+) -> np.ndarray:
+    """model.encode() with batches sized by a token budget instead of a count.
+
+    Inputs are sorted by token length so each batch holds similar lengths
+    (little padding), encoded one batch per call, then returned in input order.
+    A batch_size kwarg is treated as max_batch.
+
+    Models without a tokenizer (the embedding-server client) are passed
+    through unchanged; the server buckets on its side.
+    """
+    if not texts or getattr(model, 'tokenizer', None) is None:
+        return model.encode(texts, normalize_embeddings=normalize_embeddings, **encode_kwargs)
+    max_batch = encode_kwargs.pop('batch_size', max_batch)
+    encode_kwargs.setdefault('show_progress_bar', False)
+
+    out: Optional[np.ndarray] = None
+    for batch in plan_token_batches(token_lengths(model, texts), max_tokens, max_batch):
+        vecs = np.asarray(model.encode(
+            [texts[i] for i in batch], normalize_embeddings=normalize_embeddings,
+            batch_size=len(batch), **encode_kwargs,
+        ), dtype=np.float32)
+        if out is None:
+            out = np.empty((len(texts), vecs.shape[1]), dtype=np.float32)
+        out[batch] = vecs
+    return out
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Local embedding daemon: loads the bge model once and serves encode requests
+over a Unix socket, so 4_, 6_ and 7_ don't each pay the model load.
+
+lib.embedding_model.load_embedding_model() connects automatically when the
+socket answers for the requested model and falls back to loading in-process
+when it doesn't (or if the daemon goes away mid-run).
+
+Requests from concurrent clients are micro-batched: the daemon waits up to
+--max-wait-ms for more texts (or until --max-batch texts are queued) and
+encodes them together, in length-bucketed forward passes of at most
+--max-batch texts.
+
+Wire format (both directions): 4-byte big-endian length + JSON header;
+encode responses are followed by the raw float32 matrix.
+
+Usage:
+    python scripts/lib/embedding_server.py                     # serve (foreground)
+    python scripts/lib/embedding_server.py --status            # ping a running daemon
+    python scripts/lib/embedding_server.py --idle-timeout 3600 # exit after 1h without requests
+
+Environment:
+    EMBEDDING_SERVER_SOCKET     socket path (default: $TMPDIR/araverus-embedding.sock)
+    EMBEDDING_SERVER_DISABLE=1  clients never connect
+    EMBEDDING_BACKEND           backend the daemon loads (see lib/embedding_model.py)
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / 'araverus-embedding.sock'
+DEFAULT_MODEL = 'BAAI/bge-base-en-v1.5'
+DEFAULT_MAX_BATCH = 128
+DEFAULT_MAX_WAIT_MS = 10
+CONNECT_TIMEOUT = 1.0  # seconds; encode responses have no timeout
+CLIENT_CHUNK = 2048    # texts per request from one client call
+
+_HEADER = struct.Struct('>I')
+
+
+def socket_path() -> Path:
+    return Path(os.getenv('EMBEDDING_SERVER_SOCKET') or DEFAULT_SOCKET)
+
+
+# ============================================================
+# Client
+# ============================================================
+
+def _send_msg(sock: socket.socket, header: dict, payload: bytes = b'') -> None:
+    data = json.dumps(header).encode()
+    sock.sendall(_HEADER.pack(len(data)) + data + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("embedding server closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv_msg(sock: socket.socket) -> dict:
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, length))
+
+
+def _request(path: Path, header: dict, timeout: Optional[float] = None) -> tuple[dict, bytes]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(timeout)
+        _send_msg(sock, header)
+        reply = _recv_msg(sock)
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error', 'embedding server error'))
+        payload = b''
+        if 'shape' in reply:
+            rows, dim = reply['shape']
+            payload = _recv_exact(sock, rows * dim * 4)
+        return reply, payload
+
+
+def server_info(path: Optional[Path] = None) -> Optional[dict]:
+    """Ping the daemon. Returns {model, backend, dim, ...} or None if not running."""
+    path = path or socket_path()
+    if not path.exists():
+        return None
+    try:
+        reply, _ = _request(path, {'op': 'info'}, timeout=CONNECT_TIMEOUT)
+        return reply
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+class RemoteEmbeddingModel:
+    """Duck-types SentenceTransformer.encode() over the daemon socket.
+
+    If the daemon stops answering, loads the model in-process (once) and
+    continues locally.
+    """
+
+    def __init__(self, model_name: str, path: Path, backend: str):
+        self.model_name = model_name
+        self.path = path
+        self.backend = backend
+        self._local = None
+        self._local_lock = threading.Lock()
+
+    def _fallback(self, error: Exception):
+        with self._local_lock:
+            if self._local is None:
+                print(f"  [WARN] Embedding server unavailable ({error}), loading model in-process")
+                from lib.embedding_model import load_local_embedding_model
+                self._local = load_local_embedding_model(self.model_name, self.backend)
+        return self._local
+
+    def encode(self, sentences, normalize_embeddings: bool = False, batch_size: int = 32, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if self._local is not None:
+            return self._local.encode(sentences, normalize_embeddings=normalize_embeddings,
+                                      batch_size=batch_size, **kwargs)
+        try:
+            parts = []
+            for i in range(0, len(texts), CLIENT_CHUNK):
+                reply, payload = _request(self.path, {
+                    'op': 'encode',
+                    'model': self.model_name,
+                    'texts': texts[i:i + CLIENT_CHUNK],
+                    'normalize': bool(normalize_embeddings),
+                })
+                parts.append(np.frombuffer(payload, dtype=np.float32).reshape(reply['shape']))
+        except (OSError, ValueError, RuntimeError) as e:
+            return self._fallback(e).encode(sentences, normalize_embeddings=normalize_embeddings,
+                                            batch_size=batch_size, **kwargs)
+        vecs = np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        return vecs[0] if single else vecs
+
+
+def connect(model_name: str) -> Optional[RemoteEmbeddingModel]:
+    """Client for model_name if a daemon is serving it, else None."""
+    if os.getenv('EMBEDDING_SERVER_DISABLE', '').lower() in ('1', 'true', 'yes'):
+        return None
+    path = socket_path()
+    info = server_info(path)
+    if not info or info.get('model') != model_name:
+        return None
+    return RemoteEmbeddingModel(model_name, path, info.get('backend', 'torch'))
+
+
+# ============================================================
+# Server
+# ============================================================
+
+class _Batcher:
+    """Collects encode requests and runs them through the model in micro-batches."""
+
+    def __init__(self, model, max_batch: int, max_wait: float):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.last_request = time.monotonic()
+
+    async def submit(self, texts: list[str], normalize: bool) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, normalize, future))
+        self.requests += 1
+        self.texts += len(texts)
+        self.last_request = time.monotonic()
+        return await future
+
+    async def run(self) -> None:
+        from lib.embedding_model import encode_length_bucketed
+
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            queued = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while queued < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                queued += len(item[0])
+
+            for normalize in (True, False):
+                group = [p for p in pending if p[1] == normalize]
+                if not group:
+                    continue
+                texts = [t for g in group for t in g[0]]
+                try:
+                    vecs = await asyncio.to_thread(
+                        encode_length_bucketed, self.model, texts, normalize_embeddings=normalize,
+                        max_batch=self.max_batch,
+                    )
+                    vecs = np.asarray(vecs, dtype=np.float32)
+                except Exception as e:
+                    for _, _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self.batches += 1
+                start = 0
+                for g_texts, _, future in group:
+                    # A client that disconnected mid-batch has a cancelled future
+                    if not future.done():
+                        future.set_result(vecs[start:start + len(g_texts)])
+                    start += len(g_texts)
+
+
+async def _serve(path: Path, model_name: str, backend: str, max_batch: int,
+                 max_wait_ms: float, idle_timeout: float) -> None:
+    from lib.embedding_model import load_local_embedding_model, loaded_backend
+
+    print(f"Loading {model_name} ({backend})...")
+    model = load_local_embedding_model(model_name, backend)
+    backend = loaded_backend(model_name) or backend
+    dim = int(np.asarray(model.encode(['warm-up'], normalize_embeddings=True)).shape[1])
+    batcher = _Batcher(model, max_batch, max_wait_ms / 1000)
+    started = time.time()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                except asyncio.IncompleteReadError:
+                    break
+                request = json.loads(await reader.readexactly(length))
+                op = request.get('op')
+                if op == 'info':
+                    reply, payload = {
+                        'ok': True, 'model': model_name, 'backend': backend, 'dim': dim,
+                        'pid': os.getpid(), 'uptime_s': round(time.time() - started),
+                        'requests': batcher.requests, 'texts': batcher.texts, 'batches': batcher.batches,
+                    }, b''
+                elif op == 'encode' and request.get('model') == model_name:
+                    try:
+                        vecs = await batcher.submit(request.get('texts') or [], bool(request.get('normalize')))
+                        reply, payload = {'ok': True, 'shape': list(vecs.shape)}, vecs.tobytes()
+                    except Exception as e:
+                        reply, payload = {'ok': False, 'error': str(e)}, b''
+                else:
+                    reply, payload = {'ok': False, 'error': f"unsupported request for {model_name}"}, b''
+                data = json.dumps(reply).encode()
+                writer.write(_HEADER.pack(len(data)) + data + payload)
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            writer.close()
+
+    if path.exists():
+        if server_info(path):
+            print(f"Error: an embedding server is already running on {path}")
+            sys.exit(1)
+        path.unlink()  # stale socket from a crashed daemon
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    server = await asyncio.start_unix_server(handle, path=str(path))
+    batch_task = asyncio.create_task(batcher.run())
+    print(f"Embedding server ready on {path} (dim={dim}, max_batch={max_batch}, max_wait={max_wait_ms}ms)")
+    try:
+        async with server:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), 5)
+                except asyncio.TimeoutError:
+                    pass
+                if idle_timeout and time.monotonic() - batcher.last_request > idle_timeout:
+                    print(f"Idle for {idle_timeout:.0f}s, shutting down")
+                    break
+    finally:
+        batch_task.cancel()
+        if path.exists():
+            path.unlink()
+        print(f"Served {batcher.requests} requests / {batcher.texts} texts in {batcher.batches} batches")
+
+
+def main():
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from lib.embedding_model import configured_backend
+
+    parser = argparse.ArgumentParser(description="Local embedding model server (Unix socket)")
+    parser.add_argument('--socket', type=Path, default=None, help='Socket path (default: EMBEDDING_SERVER_SOCKET)')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help='Texts per forward pass')
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help='How long to wait for more requests before encoding')
+    parser.add_argument('--idle-timeout', type=float, default=0, help='Exit after N idle seconds (0 = never)')
+    parser.add_argument('--status', action='store_true', help='Ping a running server and exit')
+    args = parser.parse_args()
+
+    path = args.socket or socket_path()
+    if args.status:
+        info = server_info(path)
+        if not info:
+            print(f"No embedding server on {path}")
+            sys.exit(1)
+        print(json.dumps(info, indent=2))
+        return
+
+    asyncio.run(_serve(path, args.model, configured_backend(), max(1, args.max_batch),
+                       args.max_wait_ms, args.idle_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,17 @@ Multi-strategy approach:
 2. batchexecute API (new AU_yqL format)
 3. HTML canonical fallback
 
+Outcomes of 2-3 are kept in a persistent article-ID cache (lib/resolve_cache.py).
+
 Returns structured results with reason codes for debugging.
+
+resolve_google_news_url() is synchronous; resolve_google_news_url_async()
+runs the HTTP strategies on a pooled httpx.AsyncClient under a per-host
+HostLimiter (lib/rate_limit.py), while passthrough/decode cost nothing. A
+BatchExecuteBatcher packs concurrent batchexecute calls into one POST.
 """
 
+import asyncio
 import base64
 import json
 import re
@@ -20,6 +28,13 @@ from urllib.parse import urlparse, quote
 
 import httpx
 
+try:
+    from lib.rate_limit import HostLimiter
+    from lib.resolve_cache import get_resolve_cache
+except ImportError:  # imported as a top-level module (lib/ on sys.path)
+    from rate_limit import HostLimiter
+    from resolve_cache import get_resolve_cache
+
 # User agent for requests
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
@@ -84,6 +99,7 @@ class ResolveResult:
     elapsed_ms: int = 0
     final_url: str | None = None
     error_detail: str | None = None
+    from_cache: bool = False
 
     def to_dict(self) -> dict:
         return {
@@ -95,6 +111,7 @@ class ResolveResult:
             "elapsed_ms": self.elapsed_ms,
             "final_url": self.final_url,
             "error_detail": self.error_detail,
+            "from_cache": self.from_cache,
         }
 
 
@@ -189,40 +206,51 @@ def extract_article_id(google_url: str) -> str | None:
     return match.group(1) if match else None
 
 
-def fetch_decoded_batch_execute(
-    article_id: str,
-    client: httpx.Client
-) -> tuple[str | None, ReasonCode, int | None]:
-    """
-    Decode Google News URL using the batchexecute API.
-    Returns (url, reason_code, http_status).
-    """
-    # Step 1: Fetch article page to get signature and timestamp
-    article_url = f"https://news.google.com/articles/{article_id}"
-
-    try:
-        response = client.get(
-            article_url,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "text/html,application/xhtml+xml",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        )
-    except httpx.TimeoutException:
-        return None, ReasonCode.TIMEOUT, None
-    except httpx.RequestError:
-        return None, ReasonCode.NETWORK_ERROR, None
-
-    if response.status_code == 403:
-        return None, ReasonCode.HTTP_403, 403
-    if response.status_code == 429:
-        return None, ReasonCode.HTTP_429, 429
-    if response.status_code >= 500:
-        return None, ReasonCode.HTTP_5XX, response.status_code
-    if response.status_code >= 400:
-        return None, ReasonCode.HTTP_4XX, response.status_code
+# ============================================================
+# HTTP strategies — request building / response parsing shared by
+# the sync and async fetchers
+# ============================================================
+
+BATCH_EXECUTE_URL = "https://news.google.com/_/DotsSplashUi/data/batchexecute?rpcids=Fbv4je"
+HTTP_TIMEOUT = 15.0
+RATE_LIMIT_PAUSE = 30.0  # seconds a host is paused after HTTP 429 (async resolver)
+
+ARTICLE_PAGE_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml",
+}
+BATCH_EXECUTE_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+    "Referer": "https://news.google.com/",
+    "User-Agent": USER_AGENT,
+}
+CANONICAL_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+
+def _http_error(status: int) -> ReasonCode | None:
+    """Reason code for an HTTP error status (None if not an error)."""
+    if status == 403:
+        return ReasonCode.HTTP_403
+    if status == 429:
+        return ReasonCode.HTTP_429
+    if status >= 500:
+        return ReasonCode.HTTP_5XX
+    if status >= 400:
+        return ReasonCode.HTTP_4XX
+    return None
+
+
+def _parse_article_page(
+    response: httpx.Response
+) -> tuple[tuple[str, str] | None, ReasonCode, int | None]:
+    """Batchexecute step 1: ((signature, timestamp), reason_code, http_status)."""
+    error = _http_error(response.status_code)
+    if error:
+        return None, error, response.status_code
     if response.status_code != 200:
         return None, ReasonCode.BATCH_EXEC_FAIL, response.status_code
 
@@ -235,54 +263,101 @@ def fetch_decoded_batch_execute(
     if not sig_match or not ts_match:
         return None, ReasonCode.SIG_TS_MISSING, 200
 
-    signature = sig_match.group(1)
-    timestamp = ts_match.group(1)
+    return (sig_match.group(1), ts_match.group(1)), ReasonCode.SUCCESS, 200
 
-    # Step 2: Call batchexecute with signature and timestamp
+
+def _garturlreq(article_id: str, signature: str, timestamp: str) -> str:
+    """Arguments of one Fbv4je (garturlreq) RPC call, JSON-encoded."""
+    return json.dumps([
+        "garturlreq",
+        [
+            ["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1, None, None, None, None, None, 0, 1],
+            "X",
+            "X",
+            1,
+            [1, 1, 1],
+            1,
+            1,
+            None,
+            0,
+            0,
+            None,
+            0,
+        ],
+        article_id,
+        int(timestamp),
+        signature,
+    ])
+
+
+def _batch_execute_body(article_id: str, signature: str, timestamp: str) -> str:
+    """Batchexecute step 2: form body for the garturlreq call."""
     payload = json.dumps([
         [
             [
                 "Fbv4je",
-                json.dumps([
-                    "garturlreq",
-                    [
-                        ["X", "X", ["X", "X"], None, None, 1, 1, "US:en", None, 1, None, None, None, None, None, 0, 1],
-                        "X",
-                        "X",
-                        1,
-                        [1, 1, 1],
-                        1,
-                        1,
-                        None,
-                        0,
-                        0,
-                        None,
-                        0,
-                    ],
-                    article_id,
-                    int(timestamp),
-                    signature,
-                ]),
+                _garturlreq(article_id, signature, timestamp),
             ],
         ],
     ])
+    return f"f.req={quote(payload)}"
 
-    try:
-        response = client.post(
-            "https://news.google.com/_/DotsSplashUi/data/batchexecute?rpcids=Fbv4je",
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
-                "Referer": "https://news.google.com/",
-                "User-Agent": USER_AGENT,
-            },
-            content=f"f.req={quote(payload)}",
-            timeout=15.0,
-        )
-    except httpx.TimeoutException:
-        return None, ReasonCode.TIMEOUT, None
-    except httpx.RequestError:
-        return None, ReasonCode.NETWORK_ERROR, None
 
+def _batch_execute_multi_body(items: list[tuple[str, str, str]]) -> str:
+    """Form body packing several garturlreq calls into one POST.
+
+    items are (article_id, signature, timestamp); call i is tagged str(i + 1),
+    which batchexecute echoes back in the matching wrb.fr envelope.
+    """
+    payload = json.dumps([
+        [
+            ["Fbv4je", _garturlreq(*item), None, str(i + 1)]
+            for i, item in enumerate(items)
+        ],
+    ])
+    return f"f.req={quote(payload)}"
+
+
+def _parse_batch_execute_multi(text: str, count: int) -> dict[int, str]:
+    """Map call index → resolved URL from a multi-call batchexecute response.
+
+    The body is ")]}'" followed by length-prefixed JSON chunks of wrb.fr
+    envelopes: ["wrb.fr", "Fbv4je", "<garturlres JSON>", null, null, null, "<tag>"].
+    Envelopes without a usable tag are matched by position.
+    """
+    results: dict[int, str] = {}
+    position = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith('['):
+            continue
+        try:
+            envelopes = json.loads(line)
+        except ValueError:
+            continue
+        for env in envelopes:
+            if not (isinstance(env, list) and len(env) > 2 and env[:2] == ["wrb.fr", "Fbv4je"]):
+                continue
+            index = position
+            position += 1
+            tag = env[6] if len(env) > 6 else None
+            if isinstance(tag, str) and tag.isdigit():
+                index = int(tag) - 1
+            try:
+                inner = json.loads(env[2]) if isinstance(env[2], str) else None
+            except ValueError:
+                continue
+            if (isinstance(inner, list) and len(inner) > 1 and inner[0] == "garturlres"
+                    and isinstance(inner[1], str) and inner[1].startswith("http")
+                    and 0 <= index < count):
+                results[index] = inner[1]
+    return results
+
+
+def _parse_batch_execute_response(
+    response: httpx.Response
+) -> tuple[str | None, ReasonCode, int | None]:
+    """Batchexecute step 2: (url, reason_code, http_status)."""
     if response.status_code != 200:
         return None, ReasonCode.BATCH_EXEC_FAIL, response.status_code
 
@@ -305,38 +380,13 @@ def fetch_decoded_batch_execute(
     return None, ReasonCode.BATCH_PARSE_FAIL, 200
 
 
-def fetch_canonical_from_html(
-    google_url: str,
-    client: httpx.Client
+def _parse_canonical_response(
+    response: httpx.Response
 ) -> tuple[str | None, ReasonCode, int | None]:
-    """
-    Fallback: Parse canonical URL from HTML page.
-    Returns (url, reason_code, http_status).
-    """
-    try:
-        response = client.get(
-            google_url,
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        )
-    except httpx.TimeoutException:
-        return None, ReasonCode.TIMEOUT, None
-    except httpx.RequestError:
-        return None, ReasonCode.NETWORK_ERROR, None
-
-    if response.status_code == 403:
-        return None, ReasonCode.HTTP_403, 403
-    if response.status_code == 429:
-        return None, ReasonCode.HTTP_429, 429
-    if response.status_code >= 500:
-        return None, ReasonCode.HTTP_5XX, response.status_code
-    if response.status_code >= 400:
-        return None, ReasonCode.HTTP_4XX, response.status_code
+    """Canonical fallback: (url, reason_code, http_status) from the fetched page."""
+    error = _http_error(response.status_code)
+    if error:
+        return None, error, response.status_code
 
     # If we got redirected to a non-Google URL, that's our answer
     final_url = str(response.url)
@@ -364,20 +414,316 @@ def fetch_canonical_from_html(
     return None, ReasonCode.CANONICAL_NOT_FOUND, response.status_code
 
 
-def resolve_google_news_url(
-    url: str,
+def fetch_decoded_batch_execute(
+    article_id: str,
     client: httpx.Client
-) -> ResolveResult:
+) -> tuple[str | None, ReasonCode, int | None]:
     """
-    Resolve a Google News URL to get the canonical URL.
+    Decode Google News URL using the batchexecute API.
+    Returns (url, reason_code, http_status).
+    """
+    # Step 1: Fetch article page to get signature and timestamp
+    try:
+        response = client.get(
+            f"https://news.google.com/articles/{article_id}",
+            headers=ARTICLE_PAGE_HEADERS,
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
 
-    Multi-strategy approach:
-    1. Passthrough for non-Google-News URLs
-    2. Try direct base64 decode (old format, no HTTP needed)
-    3. For new format (AU_yqL), use Google's batchexecute API
-    4. Fallback: GET HTML and parse canonical/og:url
+    sig_ts, reason, status = _parse_article_page(response)
+    if not sig_ts:
+        return None, reason, status
 
-    Returns structured ResolveResult with success, url, reason_code, strategy, timing.
+    # Step 2: Call batchexecute with signature and timestamp
+    try:
+        response = client.post(
+            BATCH_EXECUTE_URL,
+            headers=BATCH_EXECUTE_HEADERS,
+            content=_batch_execute_body(article_id, *sig_ts),
+            timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
+
+    return _parse_batch_execute_response(response)
+
+
+def fetch_canonical_from_html(
+    google_url: str,
+    client: httpx.Client
+) -> tuple[str | None, ReasonCode, int | None]:
+    """
+    Fallback: Parse canonical URL from HTML page.
+    Returns (url, reason_code, http_status).
+    """
+    try:
+        response = client.get(
+            google_url,
+            headers=CANONICAL_HEADERS,
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
+
+    return _parse_canonical_response(response)
+
+
+# ============================================================
+# Async HTTP strategies (pooled AsyncClient + per-host limiter)
+# ============================================================
+
+async def _limited_request(
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None,
+    method: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response:
+    """Send one request under the host's concurrency/rate limit; back off on 429."""
+    if limiter is None:
+        return await client.request(method, url, **kwargs)
+    async with limiter.limit(url):
+        response = await client.request(method, url, **kwargs)
+    if response.status_code == 429:
+        limiter.pause(url, RATE_LIMIT_PAUSE)
+    return response
+
+
+async def _post_batch_execute(
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None,
+    article_id: str,
+    signature: str,
+    timestamp: str,
+) -> tuple[str | None, ReasonCode, int | None]:
+    """Single-ID batchexecute POST. Returns (url, reason_code, http_status)."""
+    try:
+        response = await _limited_request(
+            client, limiter, "POST", BATCH_EXECUTE_URL,
+            headers=BATCH_EXECUTE_HEADERS, content=_batch_execute_body(article_id, signature, timestamp),
+            timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
+
+    return _parse_batch_execute_response(response)
+
+
+class BatchExecuteBatcher:
+    """Packs concurrent garturlreq calls into multi-ID batchexecute POSTs.
+
+    Coroutines that already have an article's signature/timestamp submit it
+    and await the URL. The batcher waits up to max_wait for more (or until
+    max_batch are queued), sends them in one POST and maps each garturlres
+    back by its call tag. IDs missing from a 200 response (all of them, if it
+    can't be parsed) fall back to the single-ID POST. Any other failure
+    settles the whole batch with its reason (HTTP_429 / HTTP_5XX / TIMEOUT /
+    NETWORK_ERROR are transient and never cached) without re-sending.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: HostLimiter | None = None,
+        max_batch: int = 20,
+        max_wait: float = 0.05,
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.posts = 0
+        self.ids = 0
+        self.fallbacks = 0
+        self._pending: list[tuple[str, str, str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._send_tasks: set[asyncio.Task] = set()
+
+    async def resolve(
+        self, article_id: str, signature: str, timestamp: str
+    ) -> tuple[str | None, ReasonCode, int | None]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((article_id, signature, timestamp, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._flush_task = None
+        self._start_flush()
+
+    def _start_flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # The loop only keeps weak references to tasks; hold them until done
+            task = asyncio.create_task(self._send(batch))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+    async def _send(self, batch: list[tuple[str, str, str, asyncio.Future]]) -> None:
+        self.posts += 1
+        self.ids += len(batch)
+        try:
+            if len(batch) == 1:
+                article_id, signature, timestamp, future = batch[0]
+                await self._settle(future, _post_batch_execute(
+                    self.client, self.limiter, article_id, signature, timestamp
+                ))
+                return
+
+            try:
+                response = await _limited_request(
+                    self.client, self.limiter, "POST", BATCH_EXECUTE_URL,
+                    headers=BATCH_EXECUTE_HEADERS,
+                    content=_batch_execute_multi_body([(a, sg, ts) for a, sg, ts, _ in batch]),
+                    timeout=HTTP_TIMEOUT,
+                )
+            except httpx.TimeoutException:
+                failure = (None, ReasonCode.TIMEOUT, None)
+            except httpx.RequestError:
+                failure = (None, ReasonCode.NETWORK_ERROR, None)
+            else:
+                status = response.status_code
+                failure = None
+                if status != 200:
+                    # No per-ID retry: that would multiply requests to a host that
+                    # is throttling or failing (429/5xx are transient, never cached)
+                    reason = _http_error(status) if status == 429 or status >= 500 else ReasonCode.BATCH_EXEC_FAIL
+                    failure = (None, reason, status)
+            if failure is not None:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(failure)
+                return
+
+            # 200: IDs missing from the response fall back to the single-ID POST
+            resolved = _parse_batch_execute_multi(response.text, len(batch))
+            fallbacks = []
+            for i, (article_id, signature, timestamp, future) in enumerate(batch):
+                if i in resolved:
+                    if not future.done():
+                        future.set_result((resolved[i], ReasonCode.SUCCESS, 200))
+                    continue
+                self.fallbacks += 1
+                self.posts += 1
+                fallbacks.append(self._settle(future, _post_batch_execute(
+                    self.client, self.limiter, article_id, signature, timestamp
+                )))
+            await asyncio.gather(*fallbacks)
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    @staticmethod
+    async def _settle(future: asyncio.Future, request) -> None:
+        try:
+            result = await request
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+
+async def fetch_decoded_batch_execute_async(
+    article_id: str,
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None = None,
+    batcher: BatchExecuteBatcher | None = None,
+) -> tuple[str | None, ReasonCode, int | None]:
+    """Async fetch_decoded_batch_execute(). Returns (url, reason_code, http_status).
+
+    With a batcher, the POST is shared with other concurrent article IDs.
+    """
+    try:
+        response = await _limited_request(
+            client, limiter, "GET", f"https://news.google.com/articles/{article_id}",
+            headers=ARTICLE_PAGE_HEADERS, follow_redirects=True, timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
+
+    sig_ts, reason, status = _parse_article_page(response)
+    if not sig_ts:
+        return None, reason, status
+
+    if batcher is not None:
+        return await batcher.resolve(article_id, *sig_ts)
+    return await _post_batch_execute(client, limiter, article_id, *sig_ts)
+
+
+async def fetch_canonical_from_html_async(
+    google_url: str,
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None = None,
+) -> tuple[str | None, ReasonCode, int | None]:
+    """Async fetch_canonical_from_html(). Returns (url, reason_code, http_status)."""
+    try:
+        response = await _limited_request(
+            client, limiter, "GET", google_url,
+            headers=CANONICAL_HEADERS, follow_redirects=True, timeout=HTTP_TIMEOUT,
+        )
+    except httpx.TimeoutException:
+        return None, ReasonCode.TIMEOUT, None
+    except httpx.RequestError:
+        return None, ReasonCode.NETWORK_ERROR, None
+
+    return _parse_canonical_response(response)
+
+
+# ============================================================
+# Resolution
+# ============================================================
+
+def _elapsed_ms(start_time: float) -> int:
+    return int((time.perf_counter() - start_time) * 1000)
+
+
+def _resolved(url: str, strategy: Strategy, start_time: float,
+              http_status: int | None = None) -> ResolveResult:
+    return ResolveResult(
+        success=True,
+        resolved_url=url,
+        reason_code=ReasonCode.SUCCESS,
+        strategy_used=strategy,
+        http_status=http_status,
+        elapsed_ms=_elapsed_ms(start_time),
+        final_url=url,
+    )
+
+
+def resolve_offline(url: str) -> ResolveResult | None:
+    """
+    Resolve without any HTTP request, if possible.
+
+    Handles corrupted URLs, passthrough (non-Google-News URLs) and the old
+    base64 format. Returns None when an HTTP strategy is needed.
     """
     start_time = time.perf_counter()
 
@@ -389,7 +735,7 @@ def resolve_google_news_url(
             resolved_url=None,
             reason_code=ReasonCode.URL_CORRUPTED,
             strategy_used=Strategy.NONE,
-            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+            elapsed_ms=_elapsed_ms(start_time),
             error_detail="URL contains whitespace or newline",
         )
 
@@ -401,77 +747,185 @@ def resolve_google_news_url(
             resolved_url=clean_url,
             reason_code=ReasonCode.PASSTHROUGH,
             strategy_used=Strategy.PASSTHROUGH,
-            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+            elapsed_ms=_elapsed_ms(start_time),
             final_url=clean_url,
         )
 
     # Strategy 1: Try direct decode (works for old format)
-    decoded_url, decode_reason = decode_google_news_url(clean_url)
+    decoded_url, _ = decode_google_news_url(clean_url)
     if decoded_url and "news.google.com" not in decoded_url:
-        return ResolveResult(
-            success=True,
-            resolved_url=decoded_url,
-            reason_code=ReasonCode.SUCCESS,
-            strategy_used=Strategy.DECODE,
-            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
-            final_url=decoded_url,
+        return _resolved(decoded_url, Strategy.DECODE, start_time)
+
+    return None
+
+
+def _all_failed(
+    canonical_reason: ReasonCode,
+    canonical_status: int | None,
+    last_reason: ReasonCode,
+    last_status: int | None,
+    start_time: float,
+) -> ResolveResult:
+    """All strategies failed - return most relevant failure reason."""
+    final_reason = canonical_reason if canonical_reason != ReasonCode.SUCCESS else last_reason
+    final_status = canonical_status or last_status
+
+    return ResolveResult(
+        success=False,
+        resolved_url=None,
+        reason_code=final_reason,
+        strategy_used=Strategy.NONE,
+        http_status=final_status,
+        elapsed_ms=_elapsed_ms(start_time),
+        error_detail=f"All strategies failed. Last: {final_reason.value}",
+    )
+
+
+def _from_cache(article_id: str | None, start_time: float) -> ResolveResult | None:
+    """Cached outcome for article_id as a ResolveResult (None on miss / cache off)."""
+    cache = get_resolve_cache() if article_id else None
+    entry = cache.get(article_id) if cache else None
+    if entry is None:
+        return None
+    reason = ReasonCode(entry['reason_code'])
+    return ResolveResult(
+        success=entry['success'],
+        resolved_url=entry['resolved_url'],
+        reason_code=reason,
+        strategy_used=Strategy(entry['strategy_used']),
+        http_status=entry.get('http_status'),
+        elapsed_ms=_elapsed_ms(start_time),
+        final_url=entry['resolved_url'],
+        error_detail=None if entry['success'] else f"Cached failure: {reason.value}",
+        from_cache=True,
+    )
+
+
+def _to_cache(article_id: str | None, result: ResolveResult) -> ResolveResult:
+    cache = get_resolve_cache() if article_id else None
+    if cache is not None:
+        cache.put(
+            article_id,
+            success=result.success,
+            resolved_url=result.resolved_url,
+            reason_code=result.reason_code.value,
+            strategy_used=result.strategy_used.value,
+            http_status=result.http_status,
         )
+    return result
 
+
+def _resolve_http(clean_url: str, client: httpx.Client, start_time: float) -> ResolveResult:
+    """Strategies 2-3 (batchexecute, canonical) over a sync client."""
     # Strategy 2: For new format, use batchexecute API
+    last_status = None
     if needs_batch_execute(clean_url):
         article_id = extract_article_id(clean_url)
         if article_id:
-            batch_url, batch_reason, batch_status = fetch_decoded_batch_execute(
-                article_id, client
-            )
+            batch_url, last_reason, last_status = fetch_decoded_batch_execute(article_id, client)
             if batch_url and "news.google.com" not in batch_url:
-                return ResolveResult(
-                    success=True,
-                    resolved_url=batch_url,
-                    reason_code=ReasonCode.SUCCESS,
-                    strategy_used=Strategy.BATCHEXECUTE,
-                    http_status=batch_status,
-                    elapsed_ms=int((time.perf_counter() - start_time) * 1000),
-                    final_url=batch_url,
-                )
-            # Store batchexecute failure reason for later
-            last_reason = batch_reason
-            last_status = batch_status
+                return _resolved(batch_url, Strategy.BATCHEXECUTE, start_time, last_status)
         else:
             last_reason = ReasonCode.GN_URL_INVALID
-            last_status = None
     else:
-        last_reason = decode_reason
-        last_status = None
+        last_reason = decode_google_news_url(clean_url)[1]
 
     # Strategy 3: Fallback - GET HTML and parse canonical URL
-    canonical_url, canonical_reason, canonical_status = fetch_canonical_from_html(
-        clean_url, client
-    )
+    canonical_url, canonical_reason, canonical_status = fetch_canonical_from_html(clean_url, client)
     if canonical_url:
-        return ResolveResult(
-            success=True,
-            resolved_url=canonical_url,
-            reason_code=ReasonCode.SUCCESS,
-            strategy_used=Strategy.CANONICAL,
-            http_status=canonical_status,
-            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
-            final_url=canonical_url,
-        )
+        return _resolved(canonical_url, Strategy.CANONICAL, start_time, canonical_status)
 
-    # All strategies failed - return most relevant failure reason
-    final_reason = canonical_reason if canonical_reason != ReasonCode.SUCCESS else last_reason
-    final_status = canonical_status or last_status
+    return _all_failed(canonical_reason, canonical_status, last_reason, last_status, start_time)
 
-    return ResolveResult(
-        success=False,
-        resolved_url=None,
-        reason_code=final_reason,
-        strategy_used=Strategy.NONE,
-        http_status=final_status,
-        elapsed_ms=int((time.perf_counter() - start_time) * 1000),
-        error_detail=f"All strategies failed. Last: {final_reason.value}",
+
+async def _resolve_http_async(
+    clean_url: str,
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None,
+    batcher: BatchExecuteBatcher | None,
+    start_time: float,
+) -> ResolveResult:
+    """Strategies 2-3 (batchexecute, canonical) over an async client."""
+    last_status = None
+    if needs_batch_execute(clean_url):
+        article_id = extract_article_id(clean_url)
+        if article_id:
+            batch_url, last_reason, last_status = await fetch_decoded_batch_execute_async(
+                article_id, client, limiter, batcher
+            )
+            if batch_url and "news.google.com" not in batch_url:
+                return _resolved(batch_url, Strategy.BATCHEXECUTE, start_time, last_status)
+        else:
+            last_reason = ReasonCode.GN_URL_INVALID
+    else:
+        last_reason = decode_google_news_url(clean_url)[1]
+
+    canonical_url, canonical_reason, canonical_status = await fetch_canonical_from_html_async(
+        clean_url, client, limiter
     )
+    if canonical_url:
+        return _resolved(canonical_url, Strategy.CANONICAL, start_time, canonical_status)
+
+    return _all_failed(canonical_reason, canonical_status, last_reason, last_status, start_time)
+
+
+def resolve_google_news_url(
+    url: str,
+    client: httpx.Client
+) -> ResolveResult:
+    """
+    Resolve a Google News URL to get the canonical URL.
+
+    Multi-strategy approach:
+    1. Passthrough for non-Google-News URLs
+    2. Try direct base64 decode (old format, no HTTP needed)
+    3. Persistent resolution cache, keyed by article ID (lib/resolve_cache.py)
+    4. For new format (AU_yqL), use Google's batchexecute API
+    5. Fallback: GET HTML and parse canonical/og:url
+
+    Returns structured ResolveResult with success, url, reason_code, strategy, timing.
+    """
+    start_time = time.perf_counter()
+
+    offline = resolve_offline(url)
+    if offline is not None:
+        return offline
+    clean_url = url.strip()
+
+    article_id = extract_article_id(clean_url)
+    cached = _from_cache(article_id, start_time)
+    if cached is not None:
+        return cached
+
+    return _to_cache(article_id, _resolve_http(clean_url, client, start_time))
+
+
+async def resolve_google_news_url_async(
+    url: str,
+    client: httpx.AsyncClient,
+    limiter: HostLimiter | None = None,
+    batcher: BatchExecuteBatcher | None = None,
+) -> ResolveResult:
+    """
+    Async resolve_google_news_url().
+
+    Passthrough, base64 decode and cache hits return immediately; only the
+    batchexecute and canonical strategies go through the client, under limiter.
+    With a batcher, batchexecute POSTs are shared across concurrent calls.
+    """
+    start_time = time.perf_counter()
+
+    offline = resolve_offline(url)
+    if offline is not None:
+        return offline
+    clean_url = url.strip()
+
+    article_id = extract_article_id(clean_url)
+    cached = _from_cache(article_id, start_time)
+    if cached is not None:
+        return cached
+
+    return _to_cache(article_id, await _resolve_http_async(clean_url, client, limiter, batcher, start_time))
 
 
 def extract_domain(url: str | None) -> str:
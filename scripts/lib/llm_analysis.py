@@ -22,8 +22,13 @@ Usage:
 import json
 import os
 import re
+import sys
+from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))   # scripts/ (lib.llm_cache)
+from lib.llm_cache import generate_content_cached
+
 _client = None
 
 
@@ -119,7 +124,8 @@ def _call_gemini(prompt: str, model: str) -> Optional[dict]:
     from google.genai import types
 
     try:
-        response = client.models.generate_content(
+        response = generate_content_cached(
+            client,
             model=model,
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -0,0 +1,309 @@
+"""
+Content-addressed cache for Gemini responses, shared by every LLM call site.
+
+Key = sha256(model, prompt, generation config). A re-run with an identical
+prompt (pipeline restart after a partial failure, --rejudge experiments)
+returns the stored response instead of paying for a new call.
+
+Backends are pluggable (get/put/purge/size); the default is a local SQLite
+file with TTL expiry and least-recently-used eviction once it exceeds a size
+budget. Hit/miss counters are kept per process.
+
+Usage:
+    from lib.llm_cache import generate_content_cached, print_llm_cache_stats
+
+    response = generate_content_cached(client, model=model, contents=prompt, config=config,
+                                       before_call=limiter.acquire)   # rate-limit misses only
+    response.text, response.usage_metadata   # same attributes on hits and misses
+    print_llm_cache_stats()
+
+A hit costs nothing, so its usage_metadata reports zero tokens (cost totals
+only count live calls); the original call's counts are in
+cached_usage_metadata.
+
+Environment:
+    LLM_CACHE_DISABLE=1     bypass the cache entirely
+    LLM_CACHE_PATH          SQLite file (default: scripts/output/llm_cache.sqlite3)
+    LLM_CACHE_TTL_DAYS      entry lifetime (default: 7)
+    LLM_CACHE_MAX_MB        size budget before LRU eviction (default: 200)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Optional, Protocol
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / 'output' / 'llm_cache.sqlite3'
+DEFAULT_TTL_DAYS = 7.0
+DEFAULT_MAX_MB = 200.0
+
+
+# ============================================================
+# Cached response (mimics the genai response attributes callers use)
+# ============================================================
+
+@dataclass
+class CachedResponse:
+    text: str
+    usage_metadata: Any                 # zero tokens: a hit is not billed
+    model_version: Optional[str] = None
+    candidates: list = field(default_factory=list)
+    cache_hit: bool = True
+    cached_usage_metadata: Any = None   # usage of the original (billed) call
+
+
+_ZERO_USAGE = {'prompt_token_count': 0, 'candidates_token_count': 0, 'thoughts_token_count': 0}
+
+
+def _usage_to_dict(usage) -> dict:
+    if usage is None:
+        return {}
+    return {
+        'prompt_token_count': getattr(usage, 'prompt_token_count', None),
+        'candidates_token_count': getattr(usage, 'candidates_token_count', None),
+        'thoughts_token_count': getattr(usage, 'thoughts_token_count', None),
+    }
+
+
+def _config_to_dict(config) -> Any:
+    """Stable, JSON-serializable form of a GenerateContentConfig (or dict)."""
+    if config is None:
+        return None
+    if hasattr(config, 'model_dump'):
+        return config.model_dump(mode='json', exclude_none=True)
+    if isinstance(config, dict):
+        return config
+    return repr(config)
+
+
+def cache_key(model: str, contents: Any, config: Any = None) -> str:
+    """sha256 over (model, prompt, generation config)."""
+    payload = json.dumps(
+        {'model': model, 'contents': contents, 'config': _config_to_dict(config)},
+        sort_keys=True, ensure_ascii=False, default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ============================================================
+# Backends
+# ============================================================
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[dict]: ...
+    def put(self, key: str, entry: dict) -> None: ...
+    def purge(self) -> int: ...
+
+
+class SQLiteBackend:
+    """Single-file SQLite store with TTL expiry and size-bounded LRU eviction.
+
+    Safe across threads (one connection behind a lock) and processes (WAL).
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float, max_bytes: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, entry TEXT NOT NULL, size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT entry, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, entry: dict) -> None:
+        data = json.dumps(entry, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, entry, size, created_at, last_access)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (key, data, len(data.encode()), now, now),
+            )
+            self._conn.commit()
+            self._evict_locked()
+
+    def purge(self) -> int:
+        """Drop expired entries, then LRU-evict down to the size budget."""
+        with self._lock:
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        removed = self._conn.execute('DELETE FROM responses WHERE created_at < ?', (cutoff,)).rowcount
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            # Evict oldest-accessed entries until 90% of budget (avoids evicting on every put)
+            target = total - int(self.max_bytes * 0.9)
+            freed = 0
+            victims = []
+            for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access'):
+                victims.append((key,))
+                freed += size
+                if freed >= target:
+                    break
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', victims)
+            removed += len(victims)
+        self._conn.commit()
+        return removed
+
+
+# ============================================================
+# Cache facade
+# ============================================================
+
+class LLMCache:
+    """Backend + hit/miss counters."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            print(f"  [WARN] LLM cache read failed: {e}")
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return CachedResponse(
+            text=entry['text'],
+            usage_metadata=SimpleNamespace(**_ZERO_USAGE),
+            model_version=entry.get('model_version'),
+            cached_usage_metadata=SimpleNamespace(**entry.get('usage', {})),
+        )
+
+    def put(self, key: str, response, model: str) -> None:
+        try:
+            self.backend.put(key, {
+                'text': response.text,
+                'usage': _usage_to_dict(response.usage_metadata),
+                'model_version': getattr(response, 'model_version', None) or model,
+            })
+        except Exception as e:
+            print(f"  [WARN] LLM cache write failed: {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache from environment settings. None if disabled."""
+    global _cache
+    if os.getenv('LLM_CACHE_DISABLE', '').lower() in ('1', 'true', 'yes'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            ttl_days = float(os.getenv('LLM_CACHE_TTL_DAYS', DEFAULT_TTL_DAYS))
+            max_mb = float(os.getenv('LLM_CACHE_MAX_MB', DEFAULT_MAX_MB))
+            path = Path(os.getenv('LLM_CACHE_PATH') or DEFAULT_CACHE_PATH)
+            try:
+                backend = SQLiteBackend(path, ttl_days * 86400, int(max_mb * 1024 * 1024))
+            except Exception as e:
+                print(f"  [WARN] LLM cache unavailable ({e}), continuing without it")
+                os.environ['LLM_CACHE_DISABLE'] = '1'
+                return None
+            _cache = LLMCache(backend)
+    return _cache
+
+
+def _is_cacheable(response, config) -> bool:
+    """Only keep non-empty responses; JSON-mode responses must parse as JSON."""
+    try:
+        text = response.text
+    except Exception:
+        return False
+    if not text:
+        return False
+    mime = getattr(config, 'response_mime_type', None)
+    if mime is None and isinstance(config, dict):
+        mime = config.get('response_mime_type')
+    if mime == 'application/json':
+        try:
+            json.loads(text)
+        except (json.JSONDecodeError, TypeError):
+            return False
+    return True
+
+
+def generate_content_cached(
+    client,
+    *,
+    model: str,
+    contents: Any,
+    config: Any = None,
+    before_call: Optional[Callable[[], Any]] = None,
+):
+    """Drop-in for client.models.generate_content() backed by the response cache.
+
+    Returns the live response on a miss and a CachedResponse on a hit. A hit
+    reports zero usage, so cost lines only count live calls; use
+    print_llm_cache_stats() to see how many calls were saved.
+
+    before_call runs just before a live request (never on a hit), e.g. a
+    rate limiter's acquire, so cache hits don't spend rate-limit tokens.
+    """
+    cache = get_llm_cache()
+    if cache is not None:
+        key = cache_key(model, contents, config)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if before_call is not None:
+        before_call()
+    response = client.models.generate_content(model=model, contents=contents, config=config)
+    if cache is not None and _is_cacheable(response, config):
+        cache.put(key, response, model)
+    return response
+
+
+def print_llm_cache_stats(label: str = "LLM cache") -> None:
+    """Print one hit/miss line (no-op when the cache is disabled or unused)."""
+    if _cache is None:
+        return
+    s = _cache.stats()
+    if s['hits'] or s['misses']:
+        print(f"{label}: {s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.0%} hit rate)")
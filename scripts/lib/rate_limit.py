@@ -0,0 +1,140 @@
+"""
+Token-bucket rate limiters shared by pipeline scripts.
+
+`rate` tokens refill per `per` seconds (default 1, i.e. `rate` is per
+second for every limiter here), with bursts up to `capacity` (defaults to
+one second's worth, min 1).
+
+- TokenBucket: thread-safe; worker threads call acquire() and block.
+- AsyncTokenBucket: asyncio; coroutines await acquire(). pause() pushes the
+  next grant out for every waiter (e.g. after an HTTP 429).
+- HostLimiter: asyncio; per-host in-flight cap plus an AsyncTokenBucket per
+  host, for fanning requests out over a pooled client.
+
+Usage:
+    from lib.rate_limit import TokenBucket, AsyncTokenBucket
+
+    bucket = TokenBucket(rate=120, per=60)   # 120 requests/minute
+    bucket.acquire()
+
+    limiter = AsyncTokenBucket(rate=4)       # 4 requests/second
+    await limiter.acquire()
+
+    hosts = HostLimiter(concurrency=8, rate=4)  # per host
+    async with hosts.limit(url):
+        response = await client.get(url)
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlparse
+
+
+class _Bucket:
+    """Token accounting shared by the sync and async buckets (caller holds the lock)."""
+
+    def __init__(self, rate: float, per: float, capacity: Optional[float]):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.fill_rate = rate / per  # tokens per second
+        self.capacity = capacity if capacity is not None else max(1.0, self.fill_rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+
+    def _take(self, tokens: float) -> float:
+        """Take tokens if available. Returns 0.0 on success, else seconds to wait."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.fill_rate
+
+    def pause(self, seconds: float) -> None:
+        """Grant nothing for `seconds` and drain any saved-up burst."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class TokenBucket(_Bucket):
+    """Classic token bucket with blocking acquire()."""
+
+    def __init__(self, rate: float, per: float = 1.0, capacity: Optional[float] = None):
+        super().__init__(rate, per, capacity)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available. Returns 0.0 on success, else seconds to wait."""
+        with self._lock:
+            return self._take(tokens)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available. Returns total seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class AsyncTokenBucket(_Bucket):
+    """Token bucket for asyncio code. Waiters are served in arrival order."""
+
+    def __init__(self, rate: float, per: float = 1.0, capacity: Optional[float] = None):
+        super().__init__(rate, per, capacity)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until tokens are available. Returns total seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                wait = self._take(tokens)
+                if wait <= 0:
+                    return waited
+                await asyncio.sleep(wait)
+                waited += wait
+
+
+class HostLimiter:
+    """Per-host concurrency cap and token bucket for asyncio HTTP fan-out.
+
+    Each host gets its own Semaphore(concurrency) and AsyncTokenBucket(rate),
+    created on first use; a request holds its host's semaphore while in flight.
+    """
+
+    def __init__(self, concurrency: int, rate: float, per: float = 1.0):
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.per = per
+        self._hosts: dict[str, tuple[asyncio.Semaphore, AsyncTokenBucket]] = {}
+
+    def _get(self, url: str) -> tuple[asyncio.Semaphore, AsyncTokenBucket]:
+        host = (urlparse(url).hostname or '').lower()
+        if host not in self._hosts:
+            self._hosts[host] = (asyncio.Semaphore(self.concurrency), AsyncTokenBucket(self.rate, self.per))
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """Hold a slot for url's host and wait for its next token."""
+        semaphore, bucket = self._get(url)
+        async with semaphore:
+            await bucket.acquire()
+            yield
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Back off url's host (e.g. after an HTTP 429)."""
+        self._get(url)[1].pause(seconds)
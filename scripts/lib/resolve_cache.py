@@ -0,0 +1,135 @@
+"""
+Persistent Google News article-ID → URL resolution cache.
+
+The same article IDs come back across days and across WSJ items, and each
+new-format ID costs two requests (article page for signature/timestamp, then
+the batchexecute POST). google_news_resolver checks this cache before any HTTP
+strategy and stores the outcome afterwards, keyed by extract_article_id().
+
+Successful resolutions live for RESOLVE_CACHE_TTL_DAYS. Deterministic
+failures (no signature, parse failure, no canonical, 4xx) are cached too, but
+only for RESOLVE_CACHE_FAILURE_TTL_HOURS; transient ones (timeouts, network
+errors, 403 bot blocks, 429, 5xx) are never cached. Storage is the llm_cache
+SQLiteBackend.
+
+Usage:
+    from lib.resolve_cache import get_resolve_cache, print_resolve_cache_stats
+
+    cache = get_resolve_cache()
+    entry = cache.get(article_id) if cache else None
+    print_resolve_cache_stats()
+
+Environment:
+    RESOLVE_CACHE_DISABLE=1              bypass the cache entirely
+    RESOLVE_CACHE_PATH                   SQLite file (default: scripts/output/resolve_cache.sqlite3)
+    RESOLVE_CACHE_TTL_DAYS               lifetime of resolved URLs (default: 30)
+    RESOLVE_CACHE_FAILURE_TTL_HOURS      lifetime of cached failures (default: 6)
+    RESOLVE_CACHE_MAX_MB                 size budget before LRU eviction (default: 50)
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from lib.llm_cache import SQLiteBackend
+except ImportError:  # imported as a top-level module (lib/ on sys.path)
+    from llm_cache import SQLiteBackend
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / 'output' / 'resolve_cache.sqlite3'
+DEFAULT_TTL_DAYS = 30.0
+DEFAULT_FAILURE_TTL_HOURS = 6.0
+DEFAULT_MAX_MB = 50.0
+
+# Failure reason codes that may succeed on a retry minutes later
+TRANSIENT_REASONS = frozenset({'TIMEOUT', 'NETWORK_ERROR', 'HTTP_403', 'HTTP_429', 'HTTP_5XX'})
+
+
+class ResolveCache:
+    """SQLite backend + failure TTL + hit/miss counters.
+
+    Entries: {success, resolved_url, reason_code, strategy_used, http_status,
+    resolved_at}.
+    """
+
+    def __init__(self, backend: SQLiteBackend, failure_ttl_seconds: float):
+        self.backend = backend
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, article_id: str) -> Optional[dict]:
+        try:
+            entry = self.backend.get(article_id)
+        except Exception as e:
+            print(f"  [WARN] Resolve cache read failed: {e}")
+            entry = None
+        if entry is not None and not entry.get('success'):
+            if time.time() - entry.get('resolved_at', 0) > self.failure_ttl_seconds:
+                entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, article_id: str, *, success: bool, resolved_url: Optional[str],
+            reason_code: str, strategy_used: str, http_status: Optional[int]) -> None:
+        if not success and reason_code in TRANSIENT_REASONS:
+            return
+        try:
+            self.backend.put(article_id, {
+                'success': success,
+                'resolved_url': resolved_url,
+                'reason_code': reason_code,
+                'strategy_used': strategy_used,
+                'http_status': http_status,
+                'resolved_at': time.time(),
+            })
+        except Exception as e:
+            print(f"  [WARN] Resolve cache write failed: {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_cache: Optional[ResolveCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_resolve_cache() -> Optional[ResolveCache]:
+    """Process-wide cache from environment settings. None if disabled."""
+    global _cache
+    if os.getenv('RESOLVE_CACHE_DISABLE', '').lower() in ('1', 'true', 'yes'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            ttl_days = float(os.getenv('RESOLVE_CACHE_TTL_DAYS', DEFAULT_TTL_DAYS))
+            failure_hours = float(os.getenv('RESOLVE_CACHE_FAILURE_TTL_HOURS', DEFAULT_FAILURE_TTL_HOURS))
+            max_mb = float(os.getenv('RESOLVE_CACHE_MAX_MB', DEFAULT_MAX_MB))
+            path = Path(os.getenv('RESOLVE_CACHE_PATH') or DEFAULT_CACHE_PATH)
+            try:
+                backend = SQLiteBackend(path, ttl_days * 86400, int(max_mb * 1024 * 1024))
+            except Exception as e:
+                print(f"  [WARN] Resolve cache unavailable ({e}), continuing without it")
+                os.environ['RESOLVE_CACHE_DISABLE'] = '1'
+                return None
+            _cache = ResolveCache(backend, failure_hours * 3600)
+    return _cache
+
+
+def print_resolve_cache_stats(label: str = "Resolve cache") -> None:
+    """Print one hit/miss line (no-op when the cache is disabled or unused)."""
+    if _cache is None:
+        return
+    s = _cache.stats()
+    if s['hits'] or s['misses']:
+        print(f"{label}: {s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.0%} hit rate)")
@@ -0,0 +1,81 @@
+"""
+Streaming RSS parser shared by 1_wsj_ingest.py and 3_wsj_to_google_news.py.
+
+Built on ElementTree.iterparse: yields one dict per <item> as soon as its
+closing tag is read, then clears and detaches the element so memory stays
+flat regardless of feed size. Items whose <link> contains a skipped URL path
+are dropped before the rest of the item is collected.
+
+Usage:
+    from lib.rss_stream import iter_rss_items
+
+    for item in iter_rss_items(response.content, skip_url_paths=SKIP_URL_PATHS):
+        item['title'], item['link'], item.get('creator'), item.get('source_url')
+"""
+import io
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, Union
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace: '{http://purl.org/dc/elements/1.1/}creator' → 'creator'."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_rss_items(
+    source: Union[str, bytes],
+    skip_url_paths: Iterable[str] = (),
+) -> Iterator[dict[str, str]]:
+    """Yield RSS <item> elements as flat dicts while parsing.
+
+    Keys are the local names of the item's direct children (title, link,
+    description, pubDate, creator, ...) mapped to their stripped text. The
+    first occurrence wins, matching Element.find(). A <source url="..."> child
+    also sets 'source_url'.
+
+    Args:
+        source: Raw RSS document (str or bytes).
+        skip_url_paths: Substrings that drop an item as soon as its <link> is read.
+
+    Raises:
+        ET.ParseError: On malformed XML. Items before the error have already been yielded.
+    """
+    stream = io.BytesIO(source) if isinstance(source, bytes) else io.StringIO(source)
+    skip_url_paths = tuple(skip_url_paths)
+
+    stack: list[ET.Element] = []
+    item_depth = -1
+    fields: dict[str, str] = {}
+    skipping = False
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if item_depth < 0 and _local_name(elem.tag) == 'item':
+                item_depth = len(stack)
+                fields = {}
+                skipping = False
+            continue
+
+        depth = len(stack)
+        stack.pop()
+
+        if item_depth < 0:
+            continue
+
+        if depth == item_depth + 1 and not skipping:
+            name = _local_name(elem.tag)
+            if name not in fields:
+                fields[name] = (elem.text or '').strip()
+                if name == 'source':
+                    fields['source_url'] = elem.attrib.get('url', '')
+                elif name == 'link' and any(p in fields['link'] for p in skip_url_paths):
+                    skipping = True
+        elif depth == item_depth:
+            if not skipping:
+                yield fields
+            item_depth = -1
+            # Release the finished item: clear its subtree and detach it from its parent
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
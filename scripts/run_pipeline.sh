@@ -56,18 +56,42 @@ echo ">>> Phase 1: Ingest + Search"
 $VENV "$SCRIPTS/1_wsj_ingest.py" || { echo "FATAL: Ingest failed"; exit 1; }
 $VENV "$SCRIPTS/2_wsj_preprocess.py" || echo "WARN: Preprocess had errors (continuing)"
 $VENV "$SCRIPTS/1_wsj_ingest.py" --export || { echo "FATAL: Export failed"; exit 1; }
-$VENV "$SCRIPTS/3_wsj_to_google_news.py" --delay-item 0.5 --delay-query 0.3 || echo "WARN: Google News search had errors (continuing)"
+$VENV "$SCRIPTS/3_wsj_to_google_news.py" --concurrency 8 --max-rps 4 || echo "WARN: Google News search had errors (continuing)"
+
+# ── Embedding server: load bge once for steps 4, 6 and 7 ──
+# Optional — scripts fall back to loading the model themselves if it isn't up.
+# Started just before the first step with embedding work; a server that
+# already answers --status is reused (and left running). The server itself
+# replaces a stale socket left by a crashed daemon.
+EMBED_PID=""
+trap '[[ -n "$EMBED_PID" ]] && kill "$EMBED_PID" 2>/dev/null || true' EXIT
+ensure_embedding_server() {
+    [[ -n "$EMBED_PID" || "${EMBEDDING_SERVER_DISABLE:-}" == "1" ]] && return 0
+    if $VENV "$SCRIPTS/lib/embedding_server.py" --status >/dev/null 2>&1; then
+        echo "Reusing running embedding server"
+        return 0
+    fi
+    $VENV "$SCRIPTS/lib/embedding_server.py" --idle-timeout 900 &
+    EMBED_PID=$!
+    for _ in $(seq 1 60); do
+        $VENV "$SCRIPTS/lib/embedding_server.py" --status >/dev/null 2>&1 && return 0
+        kill -0 "$EMBED_PID" 2>/dev/null || { echo "WARN: Embedding server exited (continuing without it)"; EMBED_PID=""; return 0; }
+        sleep 1
+    done
+}
 
 # ── Phase 2: Rank + Resolve ────────────────────────────
 echo ""
 echo ">>> Phase 2: Rank + Resolve"
+[[ -s "$SCRIPTS/output/wsj_google_news_results.jsonl" ]] && ensure_embedding_server
 $VENV "$SCRIPTS/4_embedding_rank.py" || { echo "ERROR: Embedding rank failed"; exit 1; }
-$VENV "$SCRIPTS/5_resolve_ranked.py" --delay 0.5 --update-db || { echo "ERROR: Resolve failed"; exit 1; }
+$VENV "$SCRIPTS/5_resolve_ranked.py" --update-db || { echo "ERROR: Resolve failed"; exit 1; }
 $VENV "$SCRIPTS/domain_utils.py" --mark-searched "$SCRIPTS/output/wsj_items.jsonl" || echo "WARN: mark-searched failed"
 
 # ── Phase 3: Crawl ─────────────────────────────────────
 echo ""
 echo ">>> Phase 3: Crawl"
+ensure_embedding_server
 $VENV "$SCRIPTS/6_crawl_ranked.py" --delay 1 --from-db || echo "WARN: Crawl had errors (continuing)"
 
 # ── Phase 4: Post-process ──────────────────────────────
@@ -79,8 +103,13 @@ $VENV "$SCRIPTS/domain_utils.py" --update-domain-status || echo "WARN: domain-st
 # ── Phase 4.5: Embed + Thread ────────────────────────
 echo ""
 echo ">>> Phase 4.5: Embed + Thread"
+ensure_embedding_server
 $VENV "$SCRIPTS/7_embed_and_thread.py" || echo "WARN: Embed/thread had errors (continuing)"
 
+# Embedding work is done; free the model's memory before the briefing step
+[[ -n "$EMBED_PID" ]] && kill "$EMBED_PID" 2>/dev/null || true
+EMBED_PID=""
+
 # ── Phase 5: Briefing ──────────────────────────────────
 echo ""
 echo ">>> Phase 5: Briefing"
@@ -0,0 +1,114 @@
+"""
+BlockedDomainIndex vs the implementations it replaced.
+
+Pins down where label matching agrees with the old substring scan
+(domain_utils.is_blocked_domain) and the old parent walk
+(3_wsj_to_google_news._is_domain_blocked), and the cases where it
+deliberately stops matching. The index never blocks a domain the old
+checks allowed.
+
+Usage:
+    python -m pytest scripts/tests/test_domain_index.py -q
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from domain_utils import BlockedDomainIndex, is_blocked_domain
+
+BLOCKED = ['ft.com', 'finance.yahoo.com', 'bloomberg.com', 'Reuters.com']
+
+
+def old_substring_scan(domain: str, blocked_domains) -> bool:
+    """Previous domain_utils.is_blocked_domain."""
+    if not domain or not blocked_domains:
+        return False
+    domain_lower = domain.lower()
+    for blocked in blocked_domains:
+        blocked_lower = blocked.lower()
+        if blocked_lower in domain_lower or domain_lower in blocked_lower:
+            return True
+    return False
+
+
+def old_parent_walk(domain: str, blocked_domains) -> bool:
+    """Previous 3_wsj_to_google_news._is_domain_blocked."""
+    if not domain:
+        return False
+    domain_lower = domain.lower()
+    if domain_lower in blocked_domains:
+        return True
+    parts = domain_lower.split('.')
+    for i in range(1, len(parts) - 1):
+        if '.'.join(parts[i:]) in blocked_domains:
+            return True
+    return False
+
+
+# (domain, old substring scan, is_blocked_domain now)
+OVERLAP_CASES = [
+    # Unchanged: exact, subdomain, parent of a blocked entry, case
+    ('ft.com', True, True),
+    ('www.ft.com', True, True),
+    ('ca.finance.yahoo.com', True, True),
+    ('yahoo.com', True, True),
+    ('BLOOMBERG.COM', True, True),
+    ('reuters.com', True, True),
+    ('cnbc.com', False, False),
+    ('', False, False),
+    # Changed: the substring scan matched across label boundaries
+    ('microsoft.com', True, False),
+    ('softft.com', True, False),
+    ('ance.yahoo.com', True, False),
+    ('bloomberg.com.evil.net', True, False),
+    ('oomberg.com', True, False),
+]
+
+# (domain, old parent walk, contains_domain now)
+CONTAINS_CASES = [
+    ('ft.com', True, True),
+    ('www.ft.com', True, True),
+    ('ca.finance.yahoo.com', True, True),
+    ('yahoo.com', False, False),
+    ('microsoft.com', False, False),
+    ('FINANCE.YAHOO.COM', True, True),
+    # Changed: blocked entries are lowercased when indexed
+    ('reuters.com', False, True),
+]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return BlockedDomainIndex(BLOCKED)
+
+
+@pytest.mark.parametrize('domain,old,new', OVERLAP_CASES)
+def test_is_blocked_domain_vs_substring_scan(index, domain, old, new):
+    assert old_substring_scan(domain, BLOCKED) is old
+    assert is_blocked_domain(domain, index) is new
+
+
+@pytest.mark.parametrize('domain,old,new', CONTAINS_CASES)
+def test_contains_domain_vs_parent_walk(index, domain, old, new):
+    assert old_parent_walk(domain, frozenset(BLOCKED)) is old
+    assert index.contains_domain(domain) is new
+
+
+@pytest.mark.parametrize('domain,_old,_new', OVERLAP_CASES)
+def test_index_never_broader_than_substring_scan(index, domain, _old, _new):
+    if is_blocked_domain(domain, index):
+        assert old_substring_scan(domain, BLOCKED)
+
+
+def test_add_mid_run():
+    run_blocked = BlockedDomainIndex(BLOCKED)
+    assert not is_blocked_domain('cnbc.com', run_blocked)
+    run_blocked.add('cnbc.com')
+    assert is_blocked_domain('www.cnbc.com', run_blocked)
+
+
+def test_plain_set_rejected():
+    with pytest.raises(TypeError):
+        is_blocked_domain('ft.com', set(BLOCKED))
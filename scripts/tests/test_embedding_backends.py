@@ -0,0 +1,76 @@
+"""
+ONNX / ONNX-int8 embeddings vs the torch reference for bge-base.
+
+Encodes WSJ headlines and descriptions from the RSS fixture on each backend
+and checks per-sentence cosine against torch, plus the largest change in a
+query↔candidate similarity score (what the rank and relevance thresholds
+see). Backends whose dependencies or model files aren't available here are
+skipped. benchmarks/bench_embedding_backends.py reports the same numbers
+alongside throughput.
+
+Usage:
+    python -m pytest scripts/tests/test_embedding_backends.py -q
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+pytest.importorskip('sentence_transformers')
+from lib.embedding_model import load_local_embedding_model, loaded_backend
+from lib.rss_stream import iter_rss_items
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'data' / 'wsj-tech-rss.xml'
+MODEL_NAME = 'BAAI/bge-base-en-v1.5'
+
+# backend: (min cosine vs torch, max query↔candidate score change)
+TOLERANCES = {
+    'onnx': (0.999, 0.005),
+    'onnx-int8': (0.97, 0.05),
+}
+
+
+def _sentences() -> list[str]:
+    texts = []
+    for item in iter_rss_items(FIXTURE.read_bytes()):
+        texts.append(item.get('title', ''))
+        texts.append(f"{item.get('title', '')} {item.get('description', '')}")
+    return [t for t in texts if t.strip()]
+
+
+def _encode(backend: str, texts: list[str]) -> np.ndarray:
+    try:
+        model = load_local_embedding_model(MODEL_NAME, backend=backend)
+    except Exception as e:
+        pytest.skip(f"{backend} model unavailable: {e}")
+    if loaded_backend(MODEL_NAME) != backend:
+        pytest.skip(f"{backend} backend unavailable (fell back to {loaded_backend(MODEL_NAME)})")
+    return np.asarray(model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+
+@pytest.fixture(scope='module')
+def texts():
+    return _sentences()
+
+
+@pytest.fixture(scope='module')
+def reference(texts):
+    return _encode('torch', texts)
+
+
+@pytest.mark.parametrize('backend', list(TOLERANCES))
+def test_backend_matches_torch(backend, texts, reference):
+    min_cos, max_score_delta = TOLERANCES[backend]
+    vecs = _encode(backend, texts)
+    assert vecs.shape == reference.shape
+
+    cos = np.sum(reference * vecs, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(vecs, axis=1)
+    )
+    assert cos.min() >= min_cos
+
+    q = min(50, len(reference))
+    score_delta = np.abs(reference @ reference[:q].T - vecs @ vecs[:q].T)
+    assert score_delta.max() <= max_score_delta
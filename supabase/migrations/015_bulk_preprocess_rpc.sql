@@ -0,0 +1,29 @@
+-- Migration 015: bulk write of pre-processing results
+-- 2_wsj_preprocess.py collects results from concurrent Gemini workers and
+-- flushes them in one call instead of one UPDATE round trip per item.
+-- Partial-column upserts can't be used here (wsj_items has NOT NULL columns).
+
+CREATE OR REPLACE FUNCTION bulk_save_preprocess(items JSONB)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE wsj_items i
+        SET extracted_entities = r.extracted_entities,
+            extracted_keywords = r.extracted_keywords,
+            extracted_tickers = r.extracted_tickers,
+            llm_search_queries = r.llm_search_queries,
+            preprocessed_at = r.preprocessed_at
+        FROM jsonb_to_recordset(items) AS r(
+            id UUID,
+            extracted_entities TEXT[],
+            extracted_keywords TEXT[],
+            extracted_tickers TEXT[],
+            llm_search_queries TEXT[],
+            preprocessed_at TIMESTAMPTZ
+        )
+        WHERE i.id = r.id
+        RETURNING 1
+    )
+    SELECT count(*)::INT FROM updated;
+$$;
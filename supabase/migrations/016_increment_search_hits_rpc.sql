@@ -0,0 +1,19 @@
+-- Migration 016: atomic batched search_hit_count increments
+-- 3_wsj_to_google_news.py flushes its per-run {domain: delta} counter in one
+-- call instead of a SELECT + UPDATE round trip per domain. The increment is
+-- applied in a single UPDATE, so overlapping runs cannot lose each other's
+-- counts. Only domains already present in wsj_domain_status are updated.
+
+CREATE OR REPLACE FUNCTION increment_search_hit_counts(hits JSONB)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE wsj_domain_status d
+        SET search_hit_count = COALESCE(d.search_hit_count, 0) + h.delta::INT
+        FROM jsonb_each_text(hits) AS h(domain, delta)
+        WHERE d.domain = h.domain
+        RETURNING 1
+    )
+    SELECT count(*)::INT FROM updated;
+$$;